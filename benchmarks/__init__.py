@@ -0,0 +1,5 @@
+"""Benchmarks for the hot paths of vn_address_converter.
+
+Run ``python -m benchmarks run -o results.json`` to measure and
+``python -m benchmarks compare base.json results.json`` to spot regressions.
+"""
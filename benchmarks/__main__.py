@@ -0,0 +1,95 @@
+"""``python -m benchmarks run`` / ``compare`` / ``corpus`` / ``prefork``."""
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+from .corpus import DISTRIBUTIONS, FORMATS, NoiseModel, generate, write_corpus
+from .compare import DEFAULT_THRESHOLD, compare, print_report
+from . import prefork
+from .suite import run
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmarks and write the results as JSON')
+    run_parser.add_argument('--output', '-o', default='-', help='Output file (default: stdout)')
+    run_parser.add_argument('--only', action='append', choices=('cold_start', 'hot_paths', 'memory', 'prefork'),
+                            help='Run only this benchmark (may be repeated)')
+    run_parser.add_argument('--quick', action='store_true', help='Small inputs, to check that the suite runs')
+
+    compare_parser = commands.add_parser('compare', help='Compare two result files')
+    compare_parser.add_argument('base', help='Results of the baseline')
+    compare_parser.add_argument('new', help='Results to check')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='Relative change counted as a regression (default: %(default)s)')
+
+    corpus_parser = commands.add_parser('corpus', help='Write a synthetic address corpus')
+    corpus_parser.add_argument('--rows', '-n', type=int, default=1_000_000, help='Number of rows (default: %(default)s)')
+    corpus_parser.add_argument('--seed', type=int, default=0, help='Random seed (default: %(default)s)')
+    corpus_parser.add_argument('--format', choices=FORMATS, default='csv', help='Output format (default: %(default)s)')
+    corpus_parser.add_argument('--output', '-o', default='-', help='Output file (default: stdout)')
+    corpus_parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform',
+                               help='How wards are sampled (default: %(default)s)')
+    corpus_parser.add_argument('--zipf-s', type=float, default=1.1, help='Exponent of the zipf distribution')
+    corpus_parser.add_argument('--province-weight', action='append', default=[], metavar='PROVINCE=WEIGHT',
+                               help='Extra sampling weight of an old province (may be repeated)')
+    defaults = NoiseModel()
+    for name in ('accent_strip', 'abbreviate', 'alias', 'typo', 'new_format', 'missing_street'):
+        corpus_parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=getattr(defaults, name),
+                                   help='Probability per row (default: %(default)s)')
+
+    prefork_parser = commands.add_parser('prefork', help='Measure per-worker PSS of forked workers under load')
+    prefork_parser.add_argument('--workers', '-w', type=int, default=8, help='Worker processes (default: %(default)s)')
+    prefork_parser.add_argument('--requests', '-n', type=int, default=20000,
+                                help='Addresses converted by each worker (default: %(default)s)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'prefork':
+        if not prefork.available():
+            parser.error('prefork needs os.fork and /proc/self/smaps_rollup (Linux)')
+        for mode, result in prefork.main(args.workers, args.requests).items():
+            print(f'{mode}: ' + ', '.join(f'{name} {value / 2 ** 20:.2f} MiB' for name, value in result.items()))
+        return 0
+    if args.command == 'corpus':
+        province_weights = {}
+        for item in args.province_weight:
+            province, _, weight = item.rpartition('=')
+            if not province:
+                parser.error(f'Expected PROVINCE=WEIGHT: {item}')
+            province_weights[province] = float(weight)
+        noise = NoiseModel(
+            accent_strip=args.accent_strip, abbreviate=args.abbreviate, alias=args.alias,
+            typo=args.typo, new_format=args.new_format, missing_street=args.missing_street,
+        )
+        rows = generate(args.rows, args.seed, args.distribution, noise, args.zipf_s, province_weights)
+        if args.output == '-':
+            write_corpus(rows, sys.stdout, args.format)
+        else:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                write_corpus(rows, f, args.format)
+        return 0
+    if args.command == 'run':
+        results = json.dumps(run(quick=args.quick, only=args.only), indent=2)
+        if args.output == '-':
+            print(results)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(results + '\n')
+        return 0
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+    rows = compare(base, new, args.threshold)
+    print_report(rows, base, new, sys.stdout)
+    # A non-zero exit fails a CI step when something regressed
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
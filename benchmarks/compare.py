@@ -0,0 +1,42 @@
+"""Compare two benchmark result files."""
+
+from typing import TextIO
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def compare(base: dict, new: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Return one row per metric present in both results.
+
+    ``change`` is the relative change from base to new, and ``regression`` is
+    set when the metric moved the wrong way by more than ``threshold``.
+    """
+    rows = []
+    for name, before in base['results'].items():
+        after = new['results'].get(name)
+        if after is None:
+            continue
+        change = (after['value'] - before['value']) / before['value'] if before['value'] else 0.0
+        worse = -change if before['better'] == 'higher' else change
+        rows.append({
+            'name': name,
+            'unit': before['unit'],
+            'base': before['value'],
+            'new': after['value'],
+            'change': change,
+            'regression': worse > threshold,
+        })
+    return rows
+
+
+def print_report(rows: list[dict], base: dict, new: dict, out: TextIO) -> None:
+    for label, result in (('base', base), ('new', new)):
+        machine = result.get('machine', {})
+        out.write(f"{label}: commit {machine.get('commit')}, Python {machine.get('python')}, "
+                  f"{machine.get('platform')}, {machine.get('cpu_count')} CPUs\n")
+    width = max((len(row['name']) for row in rows), default=10)
+    out.write(f"\n{'metric':<{width}}  {'base':>12}  {'new':>12}  {'change':>8}\n")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        out.write(f"{row['name']:<{width}}  {row['base']:>12,.2f}  {row['new']:>12,.2f}  "
+                  f"{row['change']:>+7.1%}{flag}\n")
@@ -0,0 +1,244 @@
+"""Deterministic synthetic address corpus for load tests and sizing.
+
+Rows are generated lazily from a seed: (province, district, ward) triples are
+sampled from the mapping with a configurable distribution, given a street
+address, and then put through noise transforms that mimic real input (missing
+accents, abbreviations, aliases, other separators, typos, addresses already
+in the new format). The same seed and settings always give the same rows, so
+10M-row benchmark inputs need not be stored; regenerate them instead.
+
+Each row carries the expected conversion, so the corpus doubles as an
+accuracy check.
+"""
+
+import bisect
+import csv
+import itertools
+import json
+import random
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, TextIO
+
+from vn_address_converter.converter import MANUAL_ALIASES_PATH, WARD_MAPPING_PATH
+
+DISTRIBUTIONS = ('uniform', 'province', 'zipf')
+FORMATS = ('csv', 'ndjson')
+FIELDS = ('id', 'address', 'province', 'district', 'ward', 'new_ward', 'new_province', 'noise')
+
+_STREET_NAMES = (
+    'Lê Lợi', 'Nguyễn Huệ', 'Trần Hưng Đạo', 'Điện Biên Phủ', 'Lý Thường Kiệt', 'Hai Bà Trưng',
+    'Nguyễn Trãi', 'Trần Phú', 'Quang Trung', 'Lê Duẩn', 'Hùng Vương', 'Phan Đình Phùng',
+    'Nguyễn Văn Cừ', 'Cách Mạng Tháng Tám', 'Võ Văn Kiệt', 'Lê Văn Sỹ', 'Phạm Văn Đồng', 'Bạch Đằng',
+)
+# Abbreviated forms of each prefix, most common first
+_ABBREVIATIONS = (
+    ('Thành phố ', ('TP. ', 'TP.', 'TP ', 'Tp ')),
+    ('Thị xã ', ('TX. ', 'TX.')),
+    ('Thị trấn ', ('TT. ', 'TT.')),
+    ('Phường ', ('P. ', 'P.', 'P ')),
+    ('Quận ', ('Q. ', 'Q.', 'Q ')),
+    ('Huyện ', ('H. ', 'H.')),
+    ('Tỉnh ', ('', 'T. ')),
+    ('Xã ', ('X. ', 'X.')),
+)
+_SEPARATORS = ((', ', 70), (',', 10), ('; ', 6), (' - ', 6), (' | ', 3), ('\n', 5))
+
+
+@dataclass
+class NoiseModel:
+    """Probability of each noise transform, applied independently per row.
+
+    ``separators`` weights the component separators. ``new_format`` rows are
+    written as the new (ward, province) address and expected unchanged.
+    """
+    accent_strip: float = 0.15
+    abbreviate: float = 0.20
+    alias: float = 0.10
+    typo: float = 0.03
+    new_format: float = 0.05
+    missing_street: float = 0.10
+    separators: tuple = _SEPARATORS
+
+
+@dataclass
+class _Entry:
+    province: str
+    district: str
+    ward: str
+    new_ward: str
+    new_province: str
+    aliases: dict = field(default_factory=dict)
+
+
+def strip_accents(text: str) -> str:
+    nfd = unicodedata.normalize('NFD', text)
+    return ''.join(c for c in nfd if unicodedata.category(c) != 'Mn').replace('đ', 'd').replace('Đ', 'D')
+
+
+def abbreviate(name: str, form: int = 0) -> str:
+    """Replace the administrative prefix of ``name`` with its ``form``-th abbreviation."""
+    for prefix, shorts in _ABBREVIATIONS:
+        if name.startswith(prefix):
+            return shorts[form % len(shorts)] + name[len(prefix):]
+    return name
+
+
+def _typo(text: str, rng: random.Random) -> str:
+    """Swap, drop or double one letter, leaving the first character alone."""
+    positions = [i for i, c in enumerate(text) if c.isalpha() and i > 0]
+    if not positions:
+        return text
+    i = rng.choice(positions)
+    op = rng.randrange(3)
+    if op == 0 and i + 1 < len(text):
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if op == 1:
+        return text[:i] + text[i + 1:]
+    return text[:i] + text[i] + text[i:]
+
+
+def load_entries() -> list[_Entry]:
+    """Return every old ward of the mapping with its conversion and manual aliases, in file order."""
+    with open(WARD_MAPPING_PATH, encoding='utf-8') as f:
+        mapping = json.load(f)
+    with open(MANUAL_ALIASES_PATH, encoding='utf-8') as f:
+        manual = json.load(f)
+
+    entries = []
+    for province, districts in mapping.items():
+        if province == 'null':
+            # Placeholder row of the source data, not a real old address
+            continue
+        for district, wards in districts.items():
+            for ward, target in wards.items():
+                entries.append(_Entry(
+                    province, district, ward, target['new_ward_name'], target['new_provine_name'],
+                    {
+                        'province': manual['provinces'].get(province, []),
+                        'district': manual['districts'].get(province, {}).get(district, []),
+                        'ward': manual['wards'].get(province, {}).get(district, {}).get(ward, []),
+                    },
+                ))
+    return entries
+
+
+def _cum_weights(entries: list[_Entry], distribution: str, zipf_s: float,
+                 province_weights: Optional[dict[str, float]], seed: int) -> list[float]:
+    if distribution == 'uniform':
+        weights = [1.0] * len(entries)
+    elif distribution == 'province':
+        # Every province equally likely, then every ward of the province
+        sizes: dict[str, int] = {}
+        for entry in entries:
+            sizes[entry.province] = sizes.get(entry.province, 0) + 1
+        weights = [1.0 / sizes[entry.province] for entry in entries]
+    elif distribution == 'zipf':
+        # A few very frequent wards and a long tail; ranks are a seeded shuffle
+        ranks = list(range(1, len(entries) + 1))
+        random.Random(f'zipf:{seed}').shuffle(ranks)
+        weights = [rank ** -zipf_s for rank in ranks]
+    else:
+        raise ValueError(f'Unknown distribution: {distribution}')
+
+    if province_weights:
+        weights = [w * province_weights.get(entry.province, 1.0) for w, entry in zip(weights, entries)]
+    return list(itertools.accumulate(weights))
+
+
+def generate(n: int, seed: int = 0, distribution: str = 'uniform', noise: Optional[NoiseModel] = None,
+             zipf_s: float = 1.1, province_weights: Optional[dict[str, float]] = None) -> Iterator[dict]:
+    """Yield ``n`` corpus rows, one dict with the ``FIELDS`` keys per row.
+
+    Args:
+        n: Number of rows
+        seed: Seed of the generator; the same seed gives the same rows
+        distribution: How triples are sampled: ``uniform`` over wards,
+            ``province`` (uniform over provinces, then wards) or ``zipf``
+        noise: Noise transform probabilities (defaults to ``NoiseModel()``)
+        zipf_s: Exponent of the ``zipf`` distribution
+        province_weights: Extra weight per old province name, multiplied in
+    """
+    noise = noise or NoiseModel()
+    entries = load_entries()
+    cum_weights = _cum_weights(entries, distribution, zipf_s, province_weights, seed)
+    total = cum_weights[-1]
+    last = len(entries) - 1
+    separators = [sep for sep, _ in noise.separators]
+    separator_weights = list(itertools.accumulate(weight for _, weight in noise.separators))
+    rng = random.Random(seed)
+    random_ = rng.random
+
+    for row_id in range(n):
+        entry = entries[min(bisect.bisect(cum_weights, random_() * total), last)]
+        applied = []
+
+        if random_() < noise.new_format:
+            components = [entry.new_ward, entry.new_province]
+            expected_ward, expected_province = entry.new_ward, entry.new_province
+            district = ''
+            applied.append('new_format')
+        else:
+            components = [entry.ward, entry.district, entry.province]
+            expected_ward, expected_province = entry.new_ward, entry.new_province
+            district = entry.district
+            if random_() < noise.alias:
+                for i, level in enumerate(('ward', 'district', 'province')):
+                    if entry.aliases[level]:
+                        components[i] = rng.choice(entry.aliases[level])
+                        applied.append('alias')
+                        break
+
+        if random_() < noise.abbreviate:
+            form = rng.randrange(4)
+            components = [abbreviate(component, form) for component in components]
+            applied.append('abbreviate')
+        if random_() < noise.accent_strip:
+            components = [strip_accents(component) for component in components]
+            applied.append('accent_strip')
+        if random_() < noise.typo:
+            i = rng.randrange(len(components))
+            components[i] = _typo(components[i], rng)
+            applied.append('typo')
+
+        if random_() >= noise.missing_street:
+            number = rng.randrange(1, 1000)
+            street = f'{number}{rng.choice(("", "", "", "A", "B", "/" + str(rng.randrange(1, 60))))} {rng.choice(_STREET_NAMES)}'
+            if 'accent_strip' in applied:
+                street = strip_accents(street)
+            components.insert(0, street)
+        separator = separators[bisect.bisect(separator_weights, random_() * separator_weights[-1])]
+
+        yield {
+            'id': row_id,
+            'address': separator.join(components),
+            'province': entry.province if district else '',
+            'district': district,
+            'ward': entry.ward if district else '',
+            'new_ward': expected_ward,
+            'new_province': expected_province,
+            'noise': ';'.join(applied),
+        }
+
+
+def write_corpus(rows: Iterator[dict], out: TextIO, fmt: str = 'csv', chunk_size: int = 10000) -> int:
+    """Write rows to ``out`` as CSV (with a header) or NDJSON, ``chunk_size`` rows at a time.
+
+    Returns:
+        int: Number of rows written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    written = 0
+    if fmt == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return written
+        if fmt == 'csv':
+            writer.writerows([row[name] for name in FIELDS] for row in chunk)
+        else:
+            out.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in chunk))
+        written += len(chunk)
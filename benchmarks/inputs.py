@@ -0,0 +1,53 @@
+"""Deterministic benchmark inputs, one list of address strings per input class."""
+
+import json
+import random
+
+from vn_address_converter.converter import WARD_MAPPING_PATH
+
+from .corpus import abbreviate, strip_accents
+
+# Input classes: exact mapping names, names without accents, abbreviated
+# prefixes (P., Q., TP.), and addresses whose ward or district is unknown
+KINDS = ('clean', 'accent_stripped', 'abbreviated', 'failing')
+
+_STREETS = ('12 Lê Lợi', '720A Điện Biên Phủ', '45/3 Nguyễn Trãi', 'Số 8 ngõ 15 Trần Phú', '')
+
+
+def load_triples() -> list[tuple[str, str, str]]:
+    """Return every old (province, district, ward) in the mapping, in file order."""
+    with open(WARD_MAPPING_PATH, encoding='utf-8') as f:
+        mapping = json.load(f)
+    return [
+        (province, district, ward)
+        for province, districts in mapping.items()
+        for district, wards in districts.items()
+        for ward in wards
+    ]
+
+
+def make_inputs(kind: str, n: int, seed: int = 0) -> list[str]:
+    """Return ``n`` address strings of the given input class.
+
+    Triples are sampled uniformly from the mapping with a fixed seed, so the
+    same arguments always give the same list.
+    """
+    if kind not in KINDS:
+        raise ValueError(f'Unknown input kind: {kind}')
+    rng = random.Random(f'{kind}:{seed}')
+    triples = load_triples()
+    inputs = []
+    for _ in range(n):
+        province, district, ward = rng.choice(triples)
+        if kind == 'accent_stripped':
+            province, district, ward = strip_accents(province), strip_accents(district), strip_accents(ward)
+        elif kind == 'abbreviated':
+            province, district, ward = abbreviate(province), abbreviate(district), abbreviate(ward)
+        elif kind == 'failing':
+            if rng.random() < 0.5:
+                ward = f'Phường Không Tồn Tại {rng.randrange(1000)}'
+            else:
+                district = f'Quận Không Tồn Tại {rng.randrange(1000)}'
+        street = rng.choice(_STREETS)
+        inputs.append(', '.join(part for part in (street, ward, district, province) if part))
+    return inputs
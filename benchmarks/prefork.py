@@ -0,0 +1,133 @@
+"""Per-worker memory of a prefork server, before and after a load test.
+
+The parent loads the index the way a ``gunicorn --preload`` master would,
+then forks workers that each convert the same inputs. Every worker reads
+its proportional set size (PSS: private pages plus its share of the shared
+ones) and its private dirty pages from ``/proc/self/smaps_rollup`` before
+and after the load. If the workers only read what the parent built, the PSS
+of each worker stays flat; pages copied on write show up as growth.
+
+Linux only.
+"""
+
+import gc
+import json
+import os
+from typing import Optional
+
+from .inputs import KINDS, make_inputs
+
+SMAPS_ROLLUP = '/proc/self/smaps_rollup'
+_FIELDS = {'Pss:': 'pss', 'Private_Dirty:': 'private_dirty', 'Shared_Clean:': 'shared_clean'}
+
+
+def available() -> bool:
+    return hasattr(os, 'fork') and os.path.exists(SMAPS_ROLLUP)
+
+
+def read_memory() -> dict[str, int]:
+    """Return the PSS, private dirty and shared clean memory of this process, in bytes."""
+    memory = {}
+    with open(SMAPS_ROLLUP, encoding='ascii') as f:
+        for line in f:
+            field, _, rest = line.partition(' ')
+            name = _FIELDS.get(field)
+            if name is not None:
+                memory[name] = int(rest.split()[0]) * 1024
+    return memory
+
+
+def _worker(lines: str, write_fd: int) -> None:
+    import vn_address_converter as vn
+
+    # Requests arrive in the worker, so their strings are the worker's own
+    inputs = lines.split('\n')
+    # The caches grow by design; measure what the lookups themselves copy
+    vn.configure_cache(parse_size=0, convert_size=0)
+    readings = [read_memory()]
+    for _ in range(2):
+        for address in inputs:
+            vn.parse_and_convert(address)
+        # A long-running worker eventually runs a full collection, which
+        # walks every object it can reach
+        gc.collect()
+        readings.append(read_memory())
+    with os.fdopen(write_fd, 'w') as f:
+        json.dump(readings, f)
+
+
+def measure(workers: int = 4, n: int = 20000, prefork: bool = True, seed: int = 0) -> dict:
+    """Fork ``workers`` workers over a loaded index and report their memory.
+
+    Call it in a fresh interpreter: the index must not be loaded yet.
+
+    Args:
+        workers: Number of worker processes
+        n: Addresses converted by each worker, spread over every input class
+        prefork: Load with ``prepare_for_fork()``; otherwise only ``warmup()``
+        seed: Seed of the inputs
+
+    Returns:
+        dict: Mean per-worker PSS before the load (``pss_before``) and after it
+        (``pss_after``), the growth of PSS and of private dirty memory over the
+        load (``pss_growth``, ``private_dirty_growth``) and the private dirty
+        growth over a second pass over the same inputs
+        (``private_dirty_steady_growth``), in bytes
+    """
+    import vn_address_converter as vn
+
+    lines = '\n'.join(address for kind in KINDS for address in make_inputs(kind, n // len(KINDS), seed))
+    if prefork:
+        vn.prepare_for_fork()
+    else:
+        vn.warmup()
+
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                os.close(read_fd)
+                _worker(lines, write_fd)
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    reports = []
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as f:
+            data = f.read()
+        _, status = os.waitpid(pid, 0)
+        if status or not data:
+            raise RuntimeError(f'Worker {pid} failed')
+        reports.append(json.loads(data))
+
+    def mean(reading: int, field: str) -> float:
+        return sum(report[reading][field] for report in reports) / len(reports)
+
+    return {
+        'pss_before': mean(0, 'pss'),
+        'pss_after': mean(1, 'pss'),
+        'pss_growth': mean(1, 'pss') - mean(0, 'pss'),
+        'private_dirty_growth': mean(1, 'private_dirty') - mean(0, 'private_dirty'),
+        'private_dirty_steady_growth': mean(2, 'private_dirty') - mean(1, 'private_dirty'),
+    }
+
+
+def main(workers: int, n: int, prefork: Optional[bool] = None) -> dict:
+    """Measure with and without ``prepare_for_fork()``, each in a fresh interpreter."""
+    from .suite import _run_python
+
+    modes = (True, False) if prefork is None else (prefork,)
+    return {
+        ('prefork' if mode else 'warmup'): _run_python(
+            'import json\nfrom benchmarks.prefork import measure\n'
+            f'print(json.dumps(measure(workers={workers}, n={n}, prefork={mode})))'
+        )
+        for mode in modes
+    }
@@ -0,0 +1,223 @@
+"""Measurements of cold start, throughput, latency and memory.
+
+Every measurement returns a flat dict of metrics. Each metric is a dict with
+its ``value``, ``unit`` and which direction is ``better`` (``higher`` or
+``lower``), so results can be compared without knowing what was measured.
+Cold start and memory are measured in fresh subprocesses, since the index
+is loaded once per process.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Optional
+
+from . import prefork
+from .inputs import KINDS, make_inputs
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def metric(value: float, unit: str, better: str) -> dict:
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def machine_info() -> dict:
+    """Describe the interpreter, the host and the code being measured."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def _run_python(code: str) -> dict:
+    """Run ``code`` in a fresh interpreter and return the JSON it prints last."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    env.pop('VN_ADDRESS_CONVERTER_PRELOAD', None)
+    out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+_COLD_START = '''
+import json, time
+started = time.perf_counter()
+import vn_address_converter as vn
+imported = time.perf_counter()
+vn.convert_to_new_address(vn.parse_address("720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Thành phố Hồ Chí Minh"))
+first = time.perf_counter()
+vn.convert_to_new_address(vn.parse_address("Xã Long Xá, Huyện Hưng Nguyên, Tỉnh Nghệ An"))
+other_province = time.perf_counter()
+print(json.dumps({"import": imported - started, "first_call": first - imported,
+                  "first_call_other_province": other_province - first}))
+'''
+
+_MEMORY = '''
+import json, resource, sys, tracemalloc
+tracemalloc.start()
+import vn_address_converter as vn
+vn.warmup()
+current, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss *= 1 if sys.platform == "darwin" else 1024
+print(json.dumps({"tracemalloc_peak": peak, "tracemalloc_current": current, "max_rss": rss,
+                  "index_bytes": vn.memory_usage()["index_bytes"]}))
+'''
+
+
+def _median(values: list[float]) -> float:
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def bench_cold_start(repeat: int = 5) -> dict:
+    """Import time and first-call latency in fresh interpreters (median of ``repeat`` runs)."""
+    runs = [_run_python(_COLD_START) for _ in range(repeat)]
+    return {
+        f'cold_start.{name}_ms': metric(_median([run[name] for run in runs]) * 1000, 'ms', 'lower')
+        for name in ('import', 'first_call', 'first_call_other_province')
+    }
+
+
+def bench_memory() -> dict:
+    """Python heap peak (tracemalloc) and resident size after loading the whole index."""
+    result = _run_python(_MEMORY)
+    return {
+        'memory.tracemalloc_peak_mib': metric(result['tracemalloc_peak'] / 2 ** 20, 'MiB', 'lower'),
+        'memory.tracemalloc_current_mib': metric(result['tracemalloc_current'] / 2 ** 20, 'MiB', 'lower'),
+        'memory.max_rss_mib': metric(result['max_rss'] / 2 ** 20, 'MiB', 'lower'),
+        'memory.index_mib': metric(result['index_bytes'] / 2 ** 20, 'MiB', 'lower'),
+    }
+
+
+def bench_prefork(workers: int = 4, n: int = 20000) -> dict:
+    """Per-worker memory growth over a load test, with and without ``prepare_for_fork()``."""
+    if not prefork.available():
+        return {}
+    results = {}
+    for mode, result in prefork.main(workers, n).items():
+        for name in ('pss_before', 'pss_growth', 'private_dirty_growth'):
+            results[f'prefork.{mode}.{name}_mib'] = metric(result[name] / 2 ** 20, 'MiB', 'lower')
+    return results
+
+
+def _throughput(func: Callable, args: list, min_time: float, reset: Optional[Callable] = None) -> float:
+    """Calls per second of ``func`` over ``args``, repeating the pass for at least ``min_time``.
+
+    ``reset`` is called before each pass, outside of the timing.
+    """
+    calls = 0
+    elapsed = 0.0
+    while True:
+        if reset is not None:
+            reset()
+        started = time.perf_counter()
+        for arg in args:
+            try:
+                func(arg)
+            except Exception:
+                pass
+        calls += len(args)
+        elapsed += time.perf_counter() - started
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def _percentile(sorted_values: list[int], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def bench_hot_paths(n: int = 5000, min_time: float = 1.0) -> dict:
+    """Throughput and p50/p99 latency per input class, with the caches disabled.
+
+    The caches are disabled so that every call does the parsing and the
+    lookups; cached throughput mostly measures dict lookups. The memos of
+    lookup forms and component kinds are cleared before each throughput pass
+    and before each latency call for the same reason, so repeated passes over
+    the same inputs do not turn into memo hits.
+    """
+    import vn_address_converter as vn
+    from vn_address_converter import converter, parser
+    from vn_address_converter.cache import PARSE_CACHE, CONVERT_CACHE
+
+    def clear_memos() -> None:
+        converter._LOOKUP_FORMS.clear()
+        parser._KIND_MEMO.clear()
+
+    vn.warmup()
+    sizes = (PARSE_CACHE.info().maxsize, CONVERT_CACHE.info().maxsize)
+    vn.configure_cache(parse_size=0, convert_size=0)
+    results = {}
+    try:
+        for kind in KINDS:
+            strings = make_inputs(kind, n)
+            addresses = []
+            for string in strings:
+                try:
+                    addresses.append(vn.parse_address(string))
+                except ValueError:
+                    pass
+
+            for name, func, args in (
+                ('parse_address', vn.parse_address, strings),
+                ('convert_to_new_address', vn.convert_to_new_address, addresses),
+                ('parse_and_convert', vn.parse_and_convert, strings),
+            ):
+                results[f'{name}.{kind}.throughput'] = metric(
+                    _throughput(func, args, min_time, clear_memos), 'calls/s', 'higher')
+
+            # Per-call latency of the combined path
+            latencies = []
+            clock = time.perf_counter_ns
+            for string in strings:
+                clear_memos()
+                started = clock()
+                vn.parse_and_convert(string)
+                latencies.append(clock() - started)
+            latencies.sort()
+            results[f'parse_and_convert.{kind}.p50_us'] = metric(_percentile(latencies, 0.50) / 1000, 'us', 'lower')
+            results[f'parse_and_convert.{kind}.p99_us'] = metric(_percentile(latencies, 0.99) / 1000, 'us', 'lower')
+    finally:
+        vn.configure_cache(parse_size=sizes[0], convert_size=sizes[1])
+    return results
+
+
+def run(quick: bool = False, only: Optional[list[str]] = None) -> dict:
+    """Run the benchmarks and return ``{"machine": ..., "results": ...}``.
+
+    Args:
+        quick: Fewer inputs and repeats, for smoke testing the suite itself
+        only: Names of the benchmarks to run (``cold_start``, ``hot_paths``,
+            ``memory``, ``prefork``); all of them when omitted
+    """
+    benchmarks = {
+        'cold_start': lambda: bench_cold_start(repeat=1 if quick else 5),
+        'hot_paths': lambda: bench_hot_paths(n=200 if quick else 5000, min_time=0.05 if quick else 1.0),
+        'memory': bench_memory,
+        'prefork': lambda: bench_prefork(workers=2 if quick else 4, n=400 if quick else 20000),
+    }
+    unknown = set(only or ()) - set(benchmarks)
+    if unknown:
+        raise ValueError(f'Unknown benchmark: {", ".join(sorted(unknown))}')
+    results: dict = {}
+    for name, bench in benchmarks.items():
+        if only is None or name in only:
+            results.update(bench())
+    return {'machine': machine_info(), 'results': results}
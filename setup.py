@@ -1,4 +1,26 @@
+import os
+import sys
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class build_py_with_index(build_py):
+    """Compile the ward index into the build tree so that it ships in the wheel."""
+
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from vn_address_converter.index import build_index
+
+        data_dir = os.path.join('vn_address_converter', 'data')
+        build_index(
+            os.path.join(data_dir, 'ward_mapping.json'),
+            os.path.join(data_dir, 'manual_aliases.json'),
+            os.path.join(self.build_lib, data_dir, 'ward_index'),
+        )
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -12,7 +34,13 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/nqbao/vn-address-converter",
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
+    cmdclass={"build_py": build_py_with_index},
+    entry_points={
+        "console_scripts": [
+            "vn-address-converter=vn_address_converter.cli:main",
+        ],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -27,6 +55,12 @@ setup(
     install_requires=[
     ],
     extras_require={
+        "pandas": [
+            "pandas",
+        ],
+        "arrow": [
+            "pyarrow",
+        ],
         "dev": [
             "pytest",
             "black",
@@ -0,0 +1,120 @@
+"""
+Tests for the asyncio micro-batching API.
+"""
+import asyncio
+import gc
+import subprocess
+import sys
+
+import pytest
+
+from vn_address_converter import (
+    Address,
+    ConversionStatus,
+    FrozenAddress,
+    aconvert,
+    aparse_and_convert,
+    aio,
+    configure_async,
+)
+from vn_address_converter.models import MappingMissingError
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    saved = dict(aio._settings)
+    yield
+    aio._settings.update(saved)
+
+
+def test_aconvert():
+    async def main():
+        return await aconvert(Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh"))
+
+    result = asyncio.run(main())
+    assert result == Address("720A Điện Biên Phủ", "Phường Thạnh Mỹ Tây", None, "Thành phố Hồ Chí Minh")
+
+
+def test_aconvert_raises_per_call():
+    async def main():
+        return await asyncio.gather(
+            aconvert(FrozenAddress(None, "Phường 1", "Quận 3", "Thành phố Hồ Chí Minh")),
+            aconvert(Address(None, "Phường 1", "Quận 1", "Invalid Province")),
+            aconvert(Address(None, None, "Quận 1", "Thành phố Hồ Chí Minh")),
+            return_exceptions=True,
+        )
+
+    ok, missing, invalid = asyncio.run(main())
+    assert isinstance(ok, FrozenAddress)
+    assert isinstance(missing, MappingMissingError)
+    assert isinstance(invalid, ValueError)
+
+
+def test_bad_item_only_fails_its_own_caller(monkeypatch):
+    configure_async(max_batch_size=10, max_latency=0.05)
+    address = Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh")
+    parse_and_convert = aio.parse_and_convert
+
+    def fails_on_boom(address_string):
+        if address_string == "boom":
+            raise RuntimeError("boom")
+        return parse_and_convert(address_string)
+
+    monkeypatch.setattr(aio, "parse_and_convert", fails_on_boom)
+
+    async def main():
+        return await asyncio.gather(
+            aconvert(address),
+            aconvert(None),
+            aparse_and_convert("720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh"),
+            aparse_and_convert("boom"),
+            return_exceptions=True,
+        )
+
+    converted, bad, parsed, boom = asyncio.run(main())
+    assert converted.ward == "Phường Thạnh Mỹ Tây"
+    assert isinstance(bad, AttributeError)
+    assert parsed.status == ConversionStatus.OK
+    assert isinstance(boom, RuntimeError)
+
+
+def test_concurrent_calls_are_batched(monkeypatch):
+    batches = []
+    process = aio._parse_and_convert_batch
+    monkeypatch.setattr(aio, "_parse_and_convert_batch", lambda items: batches.append(len(items)) or process(items))
+    configure_async(max_batch_size=40, max_latency=0.05)
+
+    inputs = ["123 Nguyễn Huệ, Phường 1, Quận 3, Thành phố Hồ Chí Minh", "not an address"] * 50
+
+    async def main():
+        return await asyncio.gather(*(aparse_and_convert(s) for s in inputs))
+
+    results = asyncio.run(main())
+    assert batches == [40, 40, 20]
+    assert [result.input for result in results] == inputs
+    assert results[0].status == ConversionStatus.OK
+    assert results[1].status == ConversionStatus.PARSE_ERROR
+
+
+def test_finished_loops_are_released():
+    async def main():
+        return await aparse_and_convert("720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh")
+
+    for _ in range(3):
+        asyncio.run(main())
+    gc.collect()
+    assert len(aio._BATCHERS) == 0
+
+
+def test_configure_async_validates():
+    with pytest.raises(ValueError):
+        configure_async(max_batch_size=0)
+    with pytest.raises(ValueError):
+        configure_async(max_latency=-1)
+
+
+def test_import_does_not_load_asyncio():
+    code = "import sys, vn_address_converter; print('asyncio' in sys.modules, 'vn_address_converter.aio' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ["False", "False"]
+    assert aconvert is aio.aconvert
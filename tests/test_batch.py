@@ -0,0 +1,67 @@
+"""
+Tests for batch address conversion.
+"""
+from vn_address_converter import (
+    Address,
+    ConversionStatus,
+    cache_clear,
+    convert_addresses_batch,
+    convert_to_new_address,
+    converter,
+)
+
+
+ADDRESSES = [
+    Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh"),
+    Address("1 P. Nhà Thờ", "Phường Hàng Trống", "Quận Hoàn Kiếm", "Thành phố Hà Nội"),
+    Address("123 Test St", "Phường 1", None, "Thành phố Hồ Chí Minh"),
+    Address("123 Test St", None, "Quận 1", "Thành phố Hồ Chí Minh"),
+    Address("123 Test St", "Phường 1", "Quận 1", "Invalid Province"),
+    Address("123 Test St", "Phường 1", "Invalid District", "Thành phố Hồ Chí Minh"),
+    Address("123 Test St", "Invalid Ward", "Quận Gò Vấp", "Thành phố Hồ Chí Minh"),
+]
+
+
+def test_batch_statuses():
+    result = convert_addresses_batch(ADDRESSES)
+    assert len(result) == len(ADDRESSES)
+    assert result.status == [
+        ConversionStatus.OK,
+        ConversionStatus.OK,
+        ConversionStatus.UNCHANGED,
+        ConversionStatus.MISSING_COMPONENT,
+        ConversionStatus.PROVINCE_NOT_FOUND,
+        ConversionStatus.DISTRICT_NOT_FOUND,
+        ConversionStatus.WARD_NOT_FOUND,
+    ]
+    assert result.street_address == [address.street_address for address in ADDRESSES]
+    assert result.ward[4:] == [None, None, None]
+
+
+def test_batch_matches_single_conversion():
+    result = convert_addresses_batch(ADDRESSES)
+    for i, address in enumerate(ADDRESSES[:3]):
+        assert result.address(i) == convert_to_new_address(address)
+    assert result.addresses()[3:] == [None] * 4
+
+
+def test_batch_resolves_each_key_once(monkeypatch):
+    calls = []
+    resolve = converter._resolve
+
+    def counting_resolve(index, province, district, ward):
+        calls.append((province, district, ward))
+        return resolve(index, province, district, ward)
+
+    monkeypatch.setattr(converter, "_resolve", counting_resolve)
+    cache_clear()
+    rows = [
+        Address(f"{i} Lê Lợi", "Phường Bến Nghé", "Quận 1", "Thành phố Hồ Chí Minh")
+        for i in range(1000)
+    ]
+    rows.append(ADDRESSES[0])
+    result = convert_addresses_batch(rows)
+
+    assert len(calls) == 2
+    assert set(result.ward) == {"Phường Sài Gòn", "Phường Thạnh Mỹ Tây"}
+    assert result.street_address[999] == "999 Lê Lợi"
@@ -0,0 +1,63 @@
+"""
+Tests for the benchmark suite's inputs and result comparison.
+"""
+import io
+
+import pytest
+
+from benchmarks import prefork
+from benchmarks.compare import compare, print_report
+from benchmarks.inputs import KINDS, abbreviate, make_inputs, strip_accents
+from benchmarks.suite import bench_hot_paths, metric
+
+
+def test_inputs_are_deterministic():
+    for kind in KINDS:
+        assert make_inputs(kind, 50) == make_inputs(kind, 50)
+        assert len(make_inputs(kind, 50)) == 50
+    assert make_inputs("clean", 50, seed=1) != make_inputs("clean", 50, seed=2)
+    with pytest.raises(ValueError):
+        make_inputs("nope", 1)
+
+
+def test_input_transforms():
+    assert strip_accents("Phường Đa Kao") == "Phuong Da Kao"
+    assert abbreviate("Thành phố Hồ Chí Minh") == "TP. Hồ Chí Minh"
+    assert abbreviate("Quận 1") == "Q. 1"
+
+
+def test_hot_paths_quick():
+    results = bench_hot_paths(n=20, min_time=0.001)
+    assert results["parse_address.clean.throughput"]["value"] > 0
+    assert results["parse_and_convert.failing.p99_us"]["better"] == "lower"
+
+
+@pytest.mark.skipif(not prefork.available(), reason="needs os.fork and /proc/self/smaps_rollup")
+def test_prefork_measurement():
+    results = prefork.main(workers=2, n=40, prefork=True)
+    assert set(results) == {"prefork"}
+    assert results["prefork"]["pss_before"] > 0
+    assert "private_dirty_steady_growth" in results["prefork"]
+
+
+def test_compare_flags_regressions_by_direction():
+    base = {"results": {
+        "throughput": metric(100.0, "calls/s", "higher"),
+        "latency": metric(10.0, "us", "lower"),
+        "memory": metric(50.0, "MiB", "lower"),
+        "gone": metric(1.0, "ms", "lower"),
+    }}
+    new = {"results": {
+        "throughput": metric(80.0, "calls/s", "higher"),
+        "latency": metric(8.0, "us", "lower"),
+        "memory": metric(52.0, "MiB", "lower"),
+    }}
+    rows = {row["name"]: row for row in compare(base, new, threshold=0.1)}
+    assert set(rows) == {"throughput", "latency", "memory"}
+    assert rows["throughput"]["regression"]
+    assert not rows["latency"]["regression"]
+    assert not rows["memory"]["regression"]
+
+    out = io.StringIO()
+    print_report(list(rows.values()), base, new, out)
+    assert "REGRESSION" in out.getvalue()
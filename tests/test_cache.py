@@ -0,0 +1,90 @@
+"""
+Tests for the parse and convert caches.
+"""
+import pytest
+
+from vn_address_converter import (
+    Address,
+    cache_clear,
+    cache_info,
+    configure_cache,
+    convert_to_new_address,
+    converter,
+    parse_address,
+    reload_mapping,
+)
+from vn_address_converter.cache import DEFAULT_CONVERT_CACHE_SIZE, DEFAULT_PARSE_CACHE_SIZE, LRUCache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache_clear()
+    yield
+    configure_cache(parse_size=DEFAULT_PARSE_CACHE_SIZE, convert_size=DEFAULT_CONVERT_CACHE_SIZE)
+    cache_clear()
+
+
+def test_lru_eviction_and_stats():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.maxsize, info.currsize) == (2, 1, 1, 2, 2)
+    assert info.hit_rate == pytest.approx(2 / 3)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 2, 0)
+
+
+def test_parse_cache_returns_fresh_addresses():
+    text = "123 Nguyễn Huệ, Phường 1, Quận 1, Thành phố Hồ Chí Minh"
+    first = parse_address(text)
+    first.ward = "changed"
+    second = parse_address(text)
+
+    assert second.ward == "Phường 1"
+    assert first is not second
+    assert cache_info()["parse"].hits == 1
+    assert cache_info()["parse"].misses == 1
+
+
+def test_convert_cache_hits():
+    address = Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh")
+    first = convert_to_new_address(address)
+    second = convert_to_new_address(Address("1 Lê Lợi", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh"))
+
+    assert first.ward == second.ward == "Phường Thạnh Mỹ Tây"
+    assert second.street_address == "1 Lê Lợi"
+    info = cache_info()["convert"]
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_convert_cache_keeps_failures():
+    address = Address("123 Test St", "Invalid Ward", "Quận Gò Vấp", "Thành phố Hồ Chí Minh")
+    for _ in range(2):
+        with pytest.raises(converter.MappingMissingError):
+            convert_to_new_address(address)
+    assert cache_info()["convert"].hits == 1
+
+
+def test_disabled_cache():
+    configure_cache(parse_size=0, convert_size=0)
+    for _ in range(3):
+        parse_address("Phường 1, Quận 7, Thành phố Hồ Chí Minh")
+    info = cache_info()["parse"]
+    assert (info.hits, info.currsize) == (0, 0)
+
+
+def test_reload_mapping_clears_caches():
+    convert_to_new_address(Address("x", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh"))
+    assert cache_info()["convert"].currsize == 1
+
+    reload_mapping()
+    assert converter.WARD_INDEX is None
+    assert cache_info()["convert"].currsize == 0
+    assert convert_to_new_address(Address("x", "Phường 22", "Quận Bình Thạnh", "HCM")).ward == "Phường Thạnh Mỹ Tây"
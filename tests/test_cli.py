@@ -0,0 +1,86 @@
+"""
+Tests for the command line interface.
+"""
+import csv
+
+import pytest
+
+from vn_address_converter.cli import _read_range, _split_ranges, main
+
+ROWS = [
+    ["1", "720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh"],
+    ["2", "123 Nguyễn Huệ, Phường 1, Quận 1, Thành phố Hồ Chí Minh"],
+    ["3", "Phường Nowhere, Quận 1, Thành phố Hồ Chí Minh"],
+    ["4", ""],
+    ["5", "456 Lê Lợi, Phường Bến Nghé, Thành phố Hồ Chí Minh"],
+]
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = tmp_path / "in.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "address"])
+        writer.writerows(ROWS * 20)
+    return path
+
+
+def _read(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_read_range_splits_on_row_boundaries(tmp_path):
+    path = tmp_path / "lines.txt"
+    data = b"header\n" + b"".join(b"row %d\n" % i for i in range(50))
+    path.write_bytes(data)
+    start = len(b"header\n")
+    for chunk_size in (1, 3, 7, 64, 1000):
+        ranges = _split_ranges(len(data), start, chunk_size)
+        assert b"".join(_read_range(str(path), s, e) for s, e in ranges) == data[start:]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_csv(input_csv, tmp_path, jobs):
+    output = tmp_path / "out.csv"
+    assert main(["convert", str(input_csv), str(output), "--column", "address",
+                 "--jobs", str(jobs), "--chunk-size", "256", "--quiet"]) == 0
+
+    rows = _read(output)
+    assert rows[0] == ["id", "address", "new_address", "conversion_status"]
+    assert [row[:2] for row in rows[1:]] == ROWS * 20
+    assert rows[1][2:] == ["720A Điện Biên Phủ, Phường Thạnh Mỹ Tây, Thành phố Hồ Chí Minh", "ok"]
+    assert rows[3][2:] == ["", "ward_not_found"]
+    assert rows[4][2:] == ["", "parse_error"]
+    assert rows[5][3] == "unchanged"
+
+
+def test_convert_csv_unknown_column(input_csv, tmp_path):
+    with pytest.raises(SystemExit):
+        main(["convert", str(input_csv), str(tmp_path / "out.csv"), "--column", "nope"])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_csv_separator_only_row(tmp_path, jobs):
+    path = tmp_path / "in.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows([["id", "address"], ["1", ",,"], *ROWS[:2]])
+    output = tmp_path / "out.csv"
+    assert main(["convert", str(path), str(output), "--column", "address", "--jobs", str(jobs), "--quiet"]) == 0
+
+    rows = _read(output)
+    assert rows[1] == ["1", ",,", "", "parse_error"]
+    assert rows[2][3] == "ok"
+
+
+def test_convert_csv_does_not_hide_internal_errors(input_csv, tmp_path, monkeypatch):
+    from vn_address_converter import cli
+
+    def broken(address_strings):
+        raise IndexError("boom")
+
+    # Bad addresses get a status from the converter; a bug is not relabelled as one
+    monkeypatch.setattr(cli, "_parse_and_convert_chunk", broken)
+    with pytest.raises(IndexError):
+        main(["convert", str(input_csv), str(tmp_path / "out.csv"), "--column", "address", "--jobs", "1", "--quiet"])
@@ -0,0 +1,84 @@
+"""
+Tests for vectorized column conversion.
+"""
+import pytest
+
+from vn_address_converter import ConversionStatus, convert_columns
+
+
+PROVINCES = ["Thành phố Hồ Chí Minh", "HCM", "Thành phố Hà Nội", "Thành phố Hồ Chí Minh", None, "Invalid"]
+DISTRICTS = ["Quận Bình Thạnh", "Quận Bình Thạnh", "Quận Hoàn Kiếm", None, "Quận 1", "Quận 1"]
+WARDS = ["Phường 22", "Phường 22", "Phường Hàng Trống", "Phường 1", "Phường 1", "Phường 1"]
+STREETS = ["720A Điện Biên Phủ", "1 Lê Lợi", "1 P. Nhà Thờ", "2 Lê Lợi", "3 Lê Lợi", "4 Lê Lợi"]
+
+EXPECTED_WARDS = ["Phường Thạnh Mỹ Tây", "Phường Thạnh Mỹ Tây", "Phường Hoàn Kiếm", "Phường 1", None, None]
+EXPECTED_PROVINCES = [
+    "Thành phố Hồ Chí Minh", "Thành phố Hồ Chí Minh", "Thành phố Hà Nội", "Thành phố Hồ Chí Minh", None, None,
+]
+EXPECTED_STATUSES = [
+    ConversionStatus.OK,
+    ConversionStatus.OK,
+    ConversionStatus.OK,
+    ConversionStatus.UNCHANGED,
+    ConversionStatus.MISSING_COMPONENT,
+    ConversionStatus.PROVINCE_NOT_FOUND,
+]
+
+
+def test_convert_python_columns():
+    result = convert_columns(PROVINCES, DISTRICTS, WARDS, STREETS)
+    assert result.ward == EXPECTED_WARDS
+    assert result.province == EXPECTED_PROVINCES
+    assert result.status == EXPECTED_STATUSES
+    assert result.street_address == STREETS
+
+
+def test_convert_pandas_columns():
+    pd = pytest.importorskip("pandas")
+    index = pd.RangeIndex(10, 10 + len(PROVINCES))
+    df = pd.DataFrame({"province": PROVINCES, "district": DISTRICTS, "ward": WARDS, "street": STREETS}, index=index)
+
+    result = convert_columns(df["province"], df["district"], df["ward"], df["street"])
+    assert list(result.index) == list(index)
+    assert list(result.columns) == ["street_address", "ward", "district", "province", "status"]
+    assert [None if pd.isna(v) else v for v in result["ward"]] == EXPECTED_WARDS
+    assert [None if pd.isna(v) else v for v in result["province"]] == EXPECTED_PROVINCES
+    assert list(result["status"]) == [status.value for status in EXPECTED_STATUSES]
+
+
+def test_convert_arrow_columns():
+    pa = pytest.importorskip("pyarrow")
+    result = convert_columns(
+        pa.chunked_array([PROVINCES[:3], PROVINCES[3:]]),
+        pa.array(DISTRICTS),
+        pa.array(WARDS),
+    )
+    assert result.column_names == ["ward", "district", "province", "status"]
+    assert result.column("ward").to_pylist() == EXPECTED_WARDS
+    assert result.column("province").to_pylist() == EXPECTED_PROVINCES
+    assert result.column("status").to_pylist() == [status.value for status in EXPECTED_STATUSES]
+
+
+def test_convert_columns_resolves_unique_keys(monkeypatch):
+    pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    from vn_address_converter import columns
+
+    calls = []
+    convert_outcome = columns._convert_outcome
+
+    def counting_convert_outcome(*key):
+        calls.append(key)
+        return convert_outcome(*key)
+
+    monkeypatch.setattr(columns, "_convert_outcome", counting_convert_outcome)
+    result = convert_columns(pd.Series(PROVINCES * 500), pd.Series(DISTRICTS * 500), pd.Series(WARDS * 500))
+    assert len(result) == len(PROVINCES) * 500
+    assert len(calls) == len(set(zip(PROVINCES, DISTRICTS, WARDS)))
+
+
+def test_convert_columns_rejects_unequal_lengths():
+    with pytest.raises(ValueError, match="same length"):
+        convert_columns(PROVINCES, DISTRICTS[:-1], WARDS)
+    with pytest.raises(ValueError, match="same length"):
+        convert_columns(PROVINCES, DISTRICTS, WARDS, STREETS[:-1])
@@ -0,0 +1,160 @@
+"""
+Tests for the per-level match tier counters and ConversionResult.tiers.
+"""
+import threading
+
+import pytest
+
+from vn_address_converter import (
+    Address,
+    AddressLevel,
+    ConversionStatus,
+    MatchTier,
+    cache_clear,
+    convert_addresses_batch,
+    convert_columns,
+    convert_to_new_address,
+    get_conversion_stats,
+    iter_parse_and_convert,
+    parse_address,
+    parse_and_convert,
+    reset_conversion_stats,
+)
+from vn_address_converter.converter import _get_index
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    cache_clear()
+    reset_conversion_stats()
+    yield
+    reset_conversion_stats()
+
+
+def _tiers(address_string):
+    result = parse_and_convert(address_string, with_tiers=True)
+    return {level.value: tier.value for level, tier in result.tiers.items()}
+
+
+def test_stats_start_at_zero():
+    stats = get_conversion_stats()
+    assert list(stats) == ["province", "district", "ward"]
+    for counts in stats.values():
+        assert counts == {"exact": 0, "normalized": 0, "folded": 0, "manual": 0, "miss": 0}
+
+
+@pytest.mark.parametrize("address_string, expected", [
+    ("1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh",
+     {"province": "exact", "district": "exact", "ward": "exact"}),
+    ("1 Lê Lợi, Phường Bến Nghé, Quận 1, Hồ Chí Minh",
+     {"province": "normalized", "district": "exact", "ward": "exact"}),
+    ("1 Lê Lợi, Phường Bén Nghé, Quận 1, Thành phố Hồ Chí Minh",
+     {"province": "exact", "district": "exact", "ward": "folded"}),
+    ("1 Le Loi, Phuong Ben Nghe, Quan 1, Saigon",
+     {"province": "manual", "district": "normalized", "ward": "normalized"}),
+    ("1 Lê Lợi, Phường Xyz, Quận 1, Hồ Chí Minh",
+     {"province": "normalized", "district": "exact", "ward": "miss"}),
+    ("1 Lê Lợi, Phường Bến Nghé, Quận 1, Atlantis",
+     {"province": "miss"}),
+])
+def test_result_tiers(address_string, expected):
+    assert _tiers(address_string) == expected
+
+
+def test_tiers_are_only_set_on_request():
+    result = parse_and_convert("1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh")
+    assert result.tiers is None
+    assert "tiers" not in result.to_dict()
+
+
+def test_no_lookup_gives_empty_tiers():
+    result = parse_and_convert("1 Lê Lợi, Phường Bến Thành, Thành phố Hồ Chí Minh", with_tiers=True)
+    assert result.status == ConversionStatus.UNCHANGED
+    assert result.tiers == {}
+    assert get_conversion_stats()["province"]["exact"] == 0
+
+
+def test_to_dict_includes_tiers():
+    result = parse_and_convert("1 Le Loi, Phuong Ben Nghe, Quan 1, Saigon", with_tiers=True)
+    assert result.to_dict()["tiers"] == {"province": "manual", "district": "normalized", "ward": "normalized"}
+    assert result.tiers[AddressLevel.PROVINCE] is MatchTier.MANUAL
+
+
+def test_cached_conversions_are_counted():
+    address = "1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh"
+    for _ in range(3):
+        convert_to_new_address(parse_address(address))
+    parse_and_convert(address)
+    stats = get_conversion_stats()
+    assert stats["province"]["exact"] == 4
+    assert stats["ward"]["exact"] == 4
+
+
+def test_batch_and_column_rows_are_counted():
+    address = Address(None, "Phường Bến Nghé", "Quận 1", "Thành phố Hồ Chí Minh")
+    missing = Address(None, "Phường Xyz", "Quận 1", "Thành phố Hồ Chí Minh")
+    convert_addresses_batch([address] * 100 + [missing] * 3)
+    stats = get_conversion_stats()
+    assert stats["province"]["exact"] == 103
+    assert stats["ward"] == {"exact": 100, "normalized": 0, "folded": 0, "manual": 0, "miss": 3}
+
+    reset_conversion_stats()
+    convert_columns(["Thành phố Hồ Chí Minh"] * 7, ["Quận 1"] * 7, ["Phường Bến Nghé"] * 7)
+    assert get_conversion_stats()["ward"]["exact"] == 7
+
+    reset_conversion_stats()
+    list(iter_parse_and_convert(["1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh"] * 9))
+    assert get_conversion_stats()["ward"]["exact"] == 9
+
+
+def test_column_rows_are_counted_with_pandas():
+    pd = pytest.importorskip("pandas")
+    convert_columns(pd.Series(["Thành phố Hồ Chí Minh"] * 5), pd.Series(["Quận 1"] * 5),
+                    pd.Series(["Phường Bến Nghé"] * 4 + ["Phường Xyz"]))
+    assert get_conversion_stats()["ward"]["exact"] == 4
+    assert get_conversion_stats()["ward"]["miss"] == 1
+
+
+def test_levels_after_a_miss_are_not_counted():
+    parse_and_convert("1 Lê Lợi, Phường Bến Nghé, Quận 1, Atlantis")
+    stats = get_conversion_stats()
+    assert stats["province"]["miss"] == 1
+    assert sum(stats["district"].values()) == 0
+    assert sum(stats["ward"].values()) == 0
+
+
+def test_reset():
+    parse_and_convert("1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh")
+    reset_conversion_stats()
+    assert all(count == 0 for counts in get_conversion_stats().values() for count in counts.values())
+
+
+def test_threads_are_counted_after_they_exit():
+    address = "1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh"
+
+    def convert():
+        for _ in range(50):
+            parse_and_convert(address)
+
+    threads = [threading.Thread(target=convert) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    convert()
+    for thread in threads:
+        thread.join()
+    assert get_conversion_stats()["ward"]["exact"] == 250
+
+    reset_conversion_stats()
+    thread = threading.Thread(target=convert)
+    thread.start()
+    thread.join()
+    assert get_conversion_stats()["ward"]["exact"] == 50
+
+
+def test_manual_flag_only_on_manual_only_keys():
+    index = _get_index()
+    province_id, manual = index.find_alias(AddressLevel.PROVINCE, "saigon")
+    assert manual
+    assert index.find_alias(AddressLevel.PROVINCE, "hồ chí minh") == (province_id, False)
+    assert index.find(AddressLevel.PROVINCE, "saigon") == province_id
+    assert index.find_alias(AddressLevel.PROVINCE, "atlantis") is None
@@ -0,0 +1,76 @@
+"""
+Tests for the synthetic corpus generator.
+"""
+import csv
+import io
+import json
+from collections import Counter
+
+import pytest
+
+from benchmarks.corpus import FIELDS, NoiseModel, abbreviate, generate, write_corpus
+from benchmarks.__main__ import main
+
+
+def test_same_seed_same_rows():
+    assert list(generate(200, seed=7)) == list(generate(200, seed=7))
+    assert list(generate(200, seed=7)) != list(generate(200, seed=8))
+
+
+def test_clean_rows_carry_their_conversion():
+    noise = NoiseModel(accent_strip=0, abbreviate=0, alias=0, typo=0, new_format=0, missing_street=0,
+                       separators=((", ", 1),))
+    rows = list(generate(50, seed=1, noise=noise))
+    for row in rows:
+        assert set(row) == set(FIELDS)
+        assert row["noise"] == ""
+        assert row["address"].endswith(f"{row['ward']}, {row['district']}, {row['province']}")
+        assert row["new_ward"] and row["new_province"]
+
+
+def test_noise_rates_follow_the_model():
+    rows = list(generate(4000, seed=2, noise=NoiseModel(accent_strip=0.5, abbreviate=0, alias=0, typo=0,
+                                                         new_format=0.25)))
+    counts = Counter(name for row in rows for name in row["noise"].split(";") if name)
+    assert 1800 < counts["accent_strip"] < 2200
+    assert 850 < counts["new_format"] < 1150
+    for row in rows:
+        if "new_format" in row["noise"]:
+            assert row["district"] == ""
+
+
+def test_distributions():
+    hcm = "Thành phố Hồ Chí Minh"
+    weighted = Counter(row["province"] for row in generate(2000, seed=3, province_weights={hcm: 1000.0},
+                                                            noise=NoiseModel(new_format=0)))
+    assert weighted[hcm] > 1500
+    zipf = Counter(row["ward"] + row["district"] for row in generate(2000, seed=3, distribution="zipf",
+                                                                      noise=NoiseModel(new_format=0)))
+    assert zipf.most_common(1)[0][1] > 100
+    with pytest.raises(ValueError):
+        next(generate(1, distribution="nope"))
+
+
+def test_abbreviate():
+    assert abbreviate("Thành phố Hồ Chí Minh") == "TP. Hồ Chí Minh"
+    assert abbreviate("Phường 12", 1) == "P.12"
+    assert abbreviate("Lê Lợi") == "Lê Lợi"
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_write_corpus_streams_in_chunks(fmt):
+    out = io.StringIO()
+    assert write_corpus(generate(25, seed=4), out, fmt, chunk_size=10) == 25
+    if fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    else:
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(rows) == 25
+    assert [str(row["id"]) for row in rows] == [str(i) for i in range(25)]
+
+
+def test_cli(tmp_path):
+    path = tmp_path / "corpus.ndjson"
+    assert main(["corpus", "-n", "10", "--seed", "5", "--format", "ndjson", "-o", str(path)]) == 0
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert rows == list(generate(10, seed=5))
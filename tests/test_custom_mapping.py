@@ -0,0 +1,179 @@
+"""
+Tests for user-supplied mapping and alias files and their on-disk index cache.
+"""
+import json
+import os
+
+import pytest
+
+import vn_address_converter
+from vn_address_converter import (
+    ConversionStatus,
+    MatchTier,
+    AddressLevel,
+    converter,
+    datasets,
+    find_mentions,
+    load_mapping,
+    parse_and_convert,
+)
+
+ADDRESS = "1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh"
+CORRECTIONS = {
+    "Thành phố Hồ Chí Minh": {
+        "Quận 1": {
+            "Phường Bến Nghé": {"new_ward_name": "Phường Sửa Lại", "new_provine_name": "Thành phố Hồ Chí Minh"},
+            "Phường Mới": {"new_ward_name": "Phường Sài Gòn", "new_provine_name": "Thành phố Hồ Chí Minh"},
+        },
+    },
+}
+ALIASES = {"provinces": {"Thành phố Hồ Chí Minh": ["Hòn Ngọc Viễn Đông"]}}
+
+
+@pytest.fixture(autouse=True)
+def packaged_data():
+    yield
+    load_mapping()
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def _entries(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if not name.startswith("."))
+
+
+def test_corrections_and_new_wards(tmp_path):
+    mapping = _write(tmp_path / "corrections.json", CORRECTIONS)
+    load_mapping([mapping], cache_dir=str(tmp_path / "cache"))
+
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Sửa Lại"
+    assert parse_and_convert("Phường Mới, Quận 1, Thành phố Hồ Chí Minh").address.ward == "Phường Sài Gòn"
+    # The rest of the packaged mapping is still there
+    assert parse_and_convert("Xã Long Xá, Huyện Hưng Nguyên, Tỉnh Nghệ An").status == ConversionStatus.OK
+
+    load_mapping()
+    assert parse_and_convert(ADDRESS).address.ward != "Phường Sửa Lại"
+
+
+def test_extra_aliases(tmp_path):
+    aliases = _write(tmp_path / "aliases.json", ALIASES)
+    load_mapping(alias_files=[aliases], cache_dir=str(tmp_path / "cache"))
+
+    result = parse_and_convert("1 Lê Lợi, Phường Bến Nghé, Quận 1, Hòn Ngọc Viễn Đông", with_tiers=True)
+    assert result.status == ConversionStatus.OK
+    assert result.tiers[AddressLevel.PROVINCE] is MatchTier.MANUAL
+    # Packaged aliases are merged too
+    assert parse_and_convert("1 Lê Lợi, Phường Bến Nghé, Quận 1, Saigon").status == ConversionStatus.OK
+    assert any("Thành phố Hồ Chí Minh" in mention.names
+               for mention in find_mentions("giao tại Phường Bến Nghé, Quận 1, Hòn Ngọc Viễn Đông"))
+
+
+def test_without_packaged_data(tmp_path):
+    mapping = _write(tmp_path / "mapping.json", CORRECTIONS)
+    load_mapping([mapping], builtin=False, cache_dir=str(tmp_path / "cache"))
+
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Sửa Lại"
+    result = parse_and_convert("Xã Long Xá, Huyện Hưng Nguyên, Tỉnh Nghệ An")
+    assert result.status == ConversionStatus.PROVINCE_NOT_FOUND
+
+    with pytest.raises(ValueError):
+        load_mapping(builtin=False)
+
+
+def test_compiled_index_is_cached(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    mapping = _write(tmp_path / "corrections.json", CORRECTIONS)
+    load_mapping([mapping], cache_dir=cache_dir)
+    entries = _entries(cache_dir)
+    assert len(entries) == 1
+
+    def fail(*args):
+        raise AssertionError("recompiled a cached index")
+
+    # Loading the same files again only maps the cached index
+    monkeypatch.setattr(datasets, "write_index", fail)
+    monkeypatch.setattr(datasets.CompiledIndex, "from_mapping", fail)
+    load_mapping([mapping], cache_dir=cache_dir)
+    assert converter.WARD_INDEX.memory_usage()["mapped"] == 1
+    assert _entries(cache_dir) == entries
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Sửa Lại"
+
+
+def test_cache_is_invalidated_by_content_and_version(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    mapping = tmp_path / "corrections.json"
+    load_mapping([_write(mapping, CORRECTIONS)], cache_dir=cache_dir)
+
+    changed = json.loads(json.dumps(CORRECTIONS))
+    changed["Thành phố Hồ Chí Minh"]["Quận 1"]["Phường Bến Nghé"]["new_ward_name"] = "Phường Khác"
+    load_mapping([_write(mapping, changed)], cache_dir=cache_dir)
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Khác"
+    assert len(_entries(cache_dir)) == 2
+
+    monkeypatch.setattr(vn_address_converter, "__version__", "99.0.0")
+    load_mapping([str(mapping)], cache_dir=cache_dir)
+    assert len(_entries(cache_dir)) == 3
+
+
+def test_broken_cache_entry_is_rebuilt(tmp_path):
+    cache_dir = tmp_path / "cache"
+    mapping = _write(tmp_path / "corrections.json", CORRECTIONS)
+    load_mapping([mapping], cache_dir=str(cache_dir))
+    (entry,) = _entries(cache_dir)
+    (cache_dir / entry / "root.bin").write_bytes(b"broken")
+
+    load_mapping([mapping], cache_dir=str(cache_dir))
+    assert converter.WARD_INDEX.memory_usage()["mapped"] == 1
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Sửa Lại"
+
+
+def test_unwritable_cache_compiles_in_memory(tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    mapping = _write(tmp_path / "corrections.json", CORRECTIONS)
+    load_mapping([mapping], cache_dir=str(not_a_dir))
+    assert converter.WARD_INDEX.memory_usage()["mapped"] == 0
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Sửa Lại"
+
+
+def test_bad_file_keeps_current_data(tmp_path):
+    mapping = _write(tmp_path / "corrections.json", CORRECTIONS)
+    load_mapping([mapping], cache_dir=str(tmp_path / "cache"))
+
+    bad = _write(tmp_path / "bad.json", {"Tỉnh X": {"Huyện Y": {"Xã Z": {"new_ward_name": "Xã Z"}}}})
+    with pytest.raises(ValueError, match="new_provine_name"):
+        load_mapping([bad], cache_dir=str(tmp_path / "cache"))
+    (tmp_path / "invalid.json").write_text("{", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_mapping([str(tmp_path / "invalid.json")], cache_dir=str(tmp_path / "cache"))
+    with pytest.raises(FileNotFoundError):
+        load_mapping([str(tmp_path / "missing.json")], cache_dir=str(tmp_path / "cache"))
+
+    assert parse_and_convert(ADDRESS).address.ward == "Phường Sửa Lại"
+
+
+@pytest.mark.parametrize("mapping, aliases", [
+    ([CORRECTIONS], None),
+    ({"Tỉnh X": {"Huyện Y": ["Xã Z"]}}, None),
+    ({"Tỉnh X": ["Huyện Y"]}, None),
+    (None, [ALIASES]),
+    (None, {"provinces": {"Tỉnh X": "Tỉnh Y"}}),
+    (None, {"wards": {"Tỉnh X": {"Huyện Y": ["Xã Z"]}}}),
+])
+def test_malformed_file_names_the_file(tmp_path, mapping, aliases):
+    mapping_files = [] if mapping is None else [_write(tmp_path / "mapping.json", mapping)]
+    alias_files = [] if aliases is None else [_write(tmp_path / "aliases.json", aliases)]
+    with pytest.raises(ValueError, match=r"(mapping|aliases)\.json: "):
+        load_mapping(mapping_files, alias_files, cache_dir=str(tmp_path / "cache"))
+    assert parse_and_convert(ADDRESS).status == ConversionStatus.OK
+
+
+def test_default_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv(datasets.CACHE_DIR_ENV_VAR, str(tmp_path))
+    assert datasets.default_cache_dir() == str(tmp_path)
+    monkeypatch.delenv(datasets.CACHE_DIR_ENV_VAR)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert datasets.default_cache_dir() == str(tmp_path / "xdg" / "vn-address-converter")
@@ -0,0 +1,90 @@
+"""
+Tests for the newline-delimited conversion daemon.
+"""
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from vn_address_converter.daemon import MAX_LINE_BYTES, make_unix_server, serve_stream
+
+ADDRESS = "720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh"
+NEW_ADDRESS = "720A Điện Biên Phủ, Phường Thạnh Mỹ Tây, Thành phố Hồ Chí Minh"
+
+
+def _serve(data, fmt="tsv", read_size=None):
+    source = io.BytesIO(data)
+    out = io.BytesIO()
+    read = source.read if read_size is None else (lambda size: source.read(read_size))
+    answered = serve_stream(read, out.write, fmt)
+    return answered, out.getvalue().decode("utf-8").splitlines()
+
+
+def test_tsv_responses_in_order():
+    requests = f"{ADDRESS}\n\nPhường Nowhere, Quận 1, Thành phố Hồ Chí Minh\r\n{ADDRESS}".encode("utf-8")
+    answered, lines = _serve(requests)
+    assert answered == 4
+    assert lines == [f"ok\t{NEW_ADDRESS}", "parse_error\t", "ward_not_found\t", f"ok\t{NEW_ADDRESS}"]
+
+
+def test_requests_split_across_reads():
+    requests = f"{ADDRESS}\n".encode("utf-8") * 20
+    assert _serve(requests, read_size=7) == (20, [f"ok\t{NEW_ADDRESS}"] * 20)
+
+
+def test_json_format():
+    _, lines = _serve(f"{ADDRESS}\n".encode("utf-8"), fmt="json")
+    result = json.loads(lines[0])
+    assert result["status"] == "ok"
+    assert result["address"] == NEW_ADDRESS
+
+
+@pytest.mark.parametrize("read_size", [None, 1000, 100000])
+def test_over_long_line_is_answered_with_an_error(read_size):
+    long_line = b"x" * (3 * MAX_LINE_BYTES)
+    requests = f"{ADDRESS}\n".encode("utf-8") + long_line + f"\n{ADDRESS}\n".encode("utf-8")
+    answered, lines = _serve(requests, read_size=read_size)
+    assert answered == 3
+    assert lines[0] == lines[2] == f"ok\t{NEW_ADDRESS}"
+    assert lines[1].startswith("error\t")
+
+    _, lines = _serve(long_line, fmt="json", read_size=read_size)
+    assert [json.loads(line)["status"] for line in lines] == ["error"]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        serve_stream(io.BytesIO().read, io.BytesIO().write, "xml")
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+def test_unix_socket_pipelining(tmp_path):
+    path = str(tmp_path / "daemon.sock")
+    server = make_unix_server(path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(f"{ADDRESS}\n".encode("utf-8") * 100)
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile("rb") as f:
+                lines = f.read().decode("utf-8").splitlines()
+        assert lines == [f"ok\t{NEW_ADDRESS}"] * 100
+    finally:
+        server.shutdown()
+        server.server_close()
+        os.unlink(path)
+
+
+def test_stdio_daemon():
+    process = subprocess.run(
+        [sys.executable, "-m", "vn_address_converter", "daemon"],
+        input=f"{ADDRESS}\n{ADDRESS}\n".encode("utf-8"), capture_output=True, timeout=30,
+    )
+    assert process.returncode == 0
+    assert process.stdout.decode("utf-8").splitlines() == [f"ok\t{NEW_ADDRESS}"] * 2
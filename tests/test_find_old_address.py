@@ -0,0 +1,37 @@
+"""
+Tests for the reverse lookup from new wards to old addresses.
+"""
+from vn_address_converter import Address, convert_to_new_address, find_old_address
+
+
+def test_find_old_address():
+    old = find_old_address("Phường Thạnh Mỹ Tây")
+    assert [address.format() for address in old] == [
+        "Phường 19, Quận Bình Thạnh, Thành phố Hồ Chí Minh",
+        "Phường 22, Quận Bình Thạnh, Thành phố Hồ Chí Minh",
+        "Phường 25, Quận Bình Thạnh, Thành phố Hồ Chí Minh",
+    ]
+    for address in old:
+        assert convert_to_new_address(address).ward == "Phường Thạnh Mỹ Tây"
+
+
+def test_find_old_address_is_accent_and_prefix_insensitive():
+    # Without a prefix the name also matches "Xã Thạnh Mỹ Tây" in An Giang
+    assert len(find_old_address("thanh my tay")) == 6
+    assert find_old_address("phuong thanh my tay", "HCM") == find_old_address("Phường Thạnh Mỹ Tây")
+    assert {a.province for a in find_old_address("Thạnh Mỹ Tây", "An Giang")} == {"Tỉnh An Giang"}
+
+
+def test_find_old_address_not_found():
+    assert find_old_address("Phường Không Có") == []
+    assert find_old_address("Phường Thạnh Mỹ Tây", "Hà Nội") == []
+
+
+def test_accents_tell_apart_new_wards_with_the_same_folded_name():
+    # "Xã Tân Thạnh" and "Xã Tân Thành" fold to the same key
+    thanh = {address.ward for address in find_old_address("Xã Tân Thạnh", "Đồng Tháp")}
+    assert thanh == {"Xã Tân Thạnh", "Xã Phú Lợi"}
+    assert {address.ward for address in find_old_address("Tân Thạnh", "Đồng Tháp")} == thanh
+    assert not thanh & {address.ward for address in find_old_address("Xã Tân Thành", "Đồng Tháp")}
+    # Without accents both still match
+    assert thanh < {address.ward for address in find_old_address("Xa Tan Thanh", "Đồng Tháp")}
@@ -0,0 +1,53 @@
+"""
+Tests for the immutable FrozenAddress variant.
+"""
+import dataclasses
+
+import pytest
+
+from vn_address_converter import (
+    Address,
+    FrozenAddress,
+    convert_addresses_batch,
+    convert_to_new_address,
+)
+
+
+def test_frozen_address_is_immutable_and_hashable():
+    address = FrozenAddress("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        address.ward = "Phường 1"
+    assert not hasattr(address, "__dict__")
+    assert len({address, address.thaw().freeze()}) == 1
+
+
+def test_freeze_thaw_round_trip():
+    address = Address("1 P. Nhà Thờ", "Phường Hàng Trống", "Quận Hoàn Kiếm", "Thành phố Hà Nội")
+    frozen = address.freeze()
+    assert frozen.format() == address.format()
+    assert frozen.thaw() == address
+
+
+def test_convert_frozen_address():
+    address = FrozenAddress("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh")
+    result = convert_to_new_address(address)
+    assert result == FrozenAddress("720A Điện Biên Phủ", "Phường Thạnh Mỹ Tây", None, "Thành phố Hồ Chí Minh")
+
+    # New names are shared with the index rather than copied per result
+    other = convert_to_new_address(FrozenAddress("1 Lê Lợi", "Phường 22", "Quận Bình Thạnh", "HCM"))
+    assert other.ward is result.ward
+    assert other.province is result.province
+
+
+def test_convert_frozen_address_without_district():
+    address = FrozenAddress("123 Test St", "Phường 1", None, "Thành phố Hồ Chí Minh")
+    assert convert_to_new_address(address) is address
+
+
+def test_batch_frozen_addresses():
+    addresses = [
+        Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh"),
+        Address("123 Test St", "Invalid Ward", "Quận Gò Vấp", "Thành phố Hồ Chí Minh"),
+    ]
+    result = convert_addresses_batch(addresses).addresses(frozen=True)
+    assert result == [convert_to_new_address(addresses[0].freeze()), None]
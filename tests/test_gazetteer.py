@@ -0,0 +1,43 @@
+"""
+Tests for the gazetteer scanner over free text.
+"""
+from vn_address_converter import Address, AddressLevel, extract_addresses, find_mentions
+
+TEXT = (
+    "Giao hàng tới 720A Điện Biên Phủ, P.22, Q. Bình Thạnh, TP.HCM trước 5h. "
+    "Nếu vắng gửi về số 1 Nhà Thờ, phuong Hang Trong, quan Hoan Kiem, Hà Nội nhé."
+)
+
+
+def test_find_mentions_offsets():
+    mentions = find_mentions(TEXT)
+    for mention in mentions:
+        assert TEXT[mention.start:mention.end] == mention.text
+
+    by_text = {(m.text, m.level): m for m in mentions}
+    assert by_text[("P.22", AddressLevel.WARD)].names == ("Phường 22",)
+    assert by_text[("Q. Bình Thạnh", AddressLevel.DISTRICT)].names == ("Quận Bình Thạnh",)
+    assert by_text[("TP.HCM", AddressLevel.PROVINCE)].names == ("Thành phố Hồ Chí Minh",)
+    # Words that merely contain a name are not mentions
+    assert not any(m.text == "Ba" for m in find_mentions("Bao nhiêu"))
+
+
+def test_extract_addresses():
+    first, second = extract_addresses(TEXT)
+
+    assert TEXT[first.start:first.end] == "P.22, Q. Bình Thạnh, TP.HCM"
+    assert first.address == Address(None, "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh")
+    assert first.new_address == Address(None, "Phường Thạnh Mỹ Tây", None, "Thành phố Hồ Chí Minh")
+    assert first.province.text == "TP.HCM"
+
+    assert TEXT[second.start:second.end] == "phuong Hang Trong, quan Hoan Kiem, Hà Nội"
+    assert second.address.ward == "Phường Hàng Trống"
+    assert second.new_address.province == "Thành phố Hà Nội"
+
+
+def test_ambiguous_district_needs_a_province():
+    assert extract_addresses("Phường 22, Quận Bình Thạnh")[0].province is None
+    # "Xã Tân Phú, Huyện Châu Thành" exists in several provinces
+    assert extract_addresses("Xã Tân Phú, Huyện Châu Thành") == []
+    (found,) = extract_addresses("Xã Tân Phú, Huyện Châu Thành, Bến Tre")
+    assert found.address.province == "Tỉnh Bến Tre"
@@ -0,0 +1,73 @@
+"""
+Tests for hierarchy listings and autocomplete.
+"""
+import json
+
+import pytest
+
+from vn_address_converter import (
+    AddressLevel,
+    autocomplete,
+    converter,
+    list_districts_by_province,
+    list_provinces,
+    list_wards_by_district,
+)
+from vn_address_converter.models import MappingMissingError
+
+
+@pytest.fixture(scope="module")
+def mapping():
+    with open(converter.WARD_MAPPING_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_listings_match_mapping(mapping):
+    assert sorted(list_provinces()) == sorted(mapping)
+    hcm = mapping["Thành phố Hồ Chí Minh"]
+    assert sorted(list_districts_by_province("HCM")) == sorted(hcm)
+    assert sorted(list_wards_by_district("HCM", "Quận 3")) == sorted(hcm["Quận 3"])
+
+
+def test_listings_are_sorted_ignoring_accents_and_prefixes():
+    provinces = list_provinces()
+    assert provinces[0] == "Tỉnh An Giang"
+    assert provinces.index("Tỉnh Bắc Giang") < provinces.index("Tỉnh Cà Mau")
+    assert list_wards_by_district("HCM", "Quận 3")[:3] == ["Phường 1", "Phường 2", "Phường 3"]
+    # Callers get their own copy
+    list_provinces().clear()
+    assert list_provinces() == provinces
+
+
+def test_listings_unknown_names():
+    with pytest.raises(MappingMissingError):
+        list_districts_by_province("Atlantis")
+    with pytest.raises(MappingMissingError):
+        list_wards_by_district("HCM", "Quận 99")
+
+
+def test_autocomplete_old_and_new_names():
+    names = {(c.name, c.new) for c in autocomplete("thanh my", province="HCM")}
+    assert ("Phường Thạnh Mỹ Tây", True) in names
+
+    (ben_nghe,) = autocomplete("Bến Ng")
+    assert (ben_nghe.name, ben_nghe.district, ben_nghe.province) == ("Phường Bến Nghé", "Quận 1", "Thành phố Hồ Chí Minh")
+
+    provinces = autocomplete("HO CHI", level=AddressLevel.PROVINCE)
+    assert [(c.name, c.new) for c in provinces] == [("Thành phố Hồ Chí Minh", False), ("Thành phố Hồ Chí Minh", True)]
+
+
+def test_autocomplete_scoped_to_district():
+    completions = autocomplete("phuong 1", province="HCM", district="Quận 3", limit=3)
+    assert [c.name for c in completions] == ["Phường 1", "Phường 11", "Phường 12"]
+    assert all(c.district == "Quận 3" for c in completions)
+    assert len(autocomplete("", limit=7)) == 7
+    with pytest.raises(ValueError):
+        autocomplete("p", district="Quận 3")
+
+
+def test_autocomplete_level_matches_filtering_all_levels():
+    for prefix in ("", "phuong", "thanh", "an"):
+        for level in (AddressLevel.PROVINCE, AddressLevel.DISTRICT, AddressLevel.WARD):
+            every = [c for c in autocomplete(prefix, limit=100000) if c.level == level]
+            assert autocomplete(prefix, level=level, limit=5) == every[:5]
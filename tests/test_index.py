@@ -0,0 +1,151 @@
+"""
+Tests for the compiled, memory-mapped ward index.
+"""
+import json
+
+import pytest
+
+from vn_address_converter import AddressLevel, converter
+from vn_address_converter.index import ROOT_FILENAME, CompiledIndex, build_index, compile_root
+
+
+@pytest.fixture(scope="module")
+def mapping():
+    with open(converter.WARD_MAPPING_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def index_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("index") / "ward_index")
+    build_index(converter.WARD_MAPPING_PATH, converter.MANUAL_ALIASES_PATH, path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def index_file(index_path):
+    index = CompiledIndex.open(index_path)
+    yield index
+    index.close()
+
+
+def test_index_matches_mapping(index_file, mapping):
+    """Every ward of the mapping is found by exact name and maps to the same target"""
+    assert index_file.num_provinces == len(mapping)
+    for prov_name, prov_val in mapping.items():
+        province_id = index_file.find(AddressLevel.PROVINCE, prov_name, exact=True)
+        assert index_file.province_name(province_id) == prov_name
+        assert len(index_file.districts(province_id)) == len(prov_val)
+        for dist_name, dist_val in prov_val.items():
+            district_id = index_file.find(AddressLevel.DISTRICT, dist_name, province_id, exact=True)
+            assert index_file.district_name(district_id) == dist_name
+            assert index_file.district_province(district_id) == province_id
+            assert len(index_file.wards(district_id)) == len(dist_val)
+            for ward_name, ward_val in dist_val.items():
+                ward_id = index_file.find(AddressLevel.WARD, ward_name, district_id, exact=True)
+                assert index_file.ward_name(ward_id) == ward_name
+                assert index_file.ward_district(ward_id) == district_id
+                assert index_file.ward_target(ward_id) == (
+                    ward_val["new_ward_name"],
+                    ward_val["new_provine_name"],
+                )
+
+
+def test_index_aliases(index_file):
+    """Generated and manual aliases resolve within their scope"""
+    hcm = index_file.find(AddressLevel.PROVINCE, "hcm")
+    assert index_file.province_name(hcm) == "Thành phố Hồ Chí Minh"
+    assert index_file.find(AddressLevel.PROVINCE, "ho chi minh") == hcm
+
+    go_vap = index_file.find(AddressLevel.DISTRICT, "go vap", hcm)
+    assert index_file.district_name(go_vap) == "Quận Gò Vấp"
+
+    ward_id = index_file.find(AddressLevel.WARD, "p12", go_vap)
+    assert index_file.ward_name(ward_id) == "Phường 12"
+
+    # Aliases are scoped to their parent and exact lookups are case sensitive
+    assert index_file.find(AddressLevel.DISTRICT, "go vap", hcm + 1) is None
+    assert index_file.find(AddressLevel.PROVINCE, "hcm", exact=True) is None
+
+
+def test_index_rejects_invalid_buffer():
+    with pytest.raises(ValueError):
+        CompiledIndex(b"not an index" * 10, lambda province_id: b"")
+
+
+def test_stale_index_file_is_ignored(tmp_path, monkeypatch, mapping):
+    """A prebuilt index whose digest does not match the sources is rebuilt in memory"""
+    root = compile_root({}, {"provinces": {}, "districts": {}, "wards": {}}, b"stale")
+    (tmp_path / ROOT_FILENAME).write_bytes(root)
+    monkeypatch.setattr(converter, "WARD_INDEX_PATH", str(tmp_path))
+    monkeypatch.setattr(converter, "WARD_INDEX", None)
+
+    index = converter._get_index()
+    assert index.num_provinces == len(mapping)
+
+
+def test_memory_usage(index_path):
+    index = CompiledIndex.open(index_path)
+    usage = index.memory_usage()
+    assert usage["mapped"] == 1
+    assert usage["provinces_loaded"] == 0
+    assert usage["index_bytes"] > usage["heap_bytes"] > 0
+
+    # Decoded names are interned and shared between lookups
+    province_id = index.find(AddressLevel.PROVINCE, "hcm")
+    assert index.province_name(province_id) is index.province_name(province_id)
+    assert index.memory_usage()["names_decoded"] == usage["names_decoded"] + 1
+    index.close()
+
+
+def test_shards_load_on_first_use(index_path):
+    """Only the shards of provinces that are resolved get loaded"""
+    index = CompiledIndex.open(index_path)
+    hcm = index.find(AddressLevel.PROVINCE, "hcm")
+    assert index.memory_usage()["provinces_loaded"] == 0
+
+    district_id = index.find(AddressLevel.DISTRICT, "quận 1", hcm)
+    index.ward_target(index.wards(district_id).start)
+    assert index.memory_usage()["provinces_loaded"] == 1
+    index.close()
+
+
+def test_from_mapping_compiles_provinces_lazily(mapping):
+    compiled = []
+    index = CompiledIndex.from_mapping(mapping, {"provinces": {}, "districts": {}, "wards": {}})
+    load_shard = index._load_shard
+    index._load_shard = lambda province_id: compiled.append(province_id) or load_shard(province_id)
+
+    hcm = index.find(AddressLevel.PROVINCE, "Thành phố Hồ Chí Minh", exact=True)
+    index.find(AddressLevel.DISTRICT, "quận 1", hcm)
+    index.find(AddressLevel.DISTRICT, "quận 3", hcm)
+    assert compiled == [hcm]
+
+
+def test_reverse_index_matches_mapping(index_file, mapping):
+    """Every old ward is listed under the new ward it maps to"""
+    expected = {}
+    ward_id = 0
+    for prov_val in mapping.values():
+        for dist_val in prov_val.values():
+            for ward_val in dist_val.values():
+                expected.setdefault(ward_val["new_ward_name"], set()).add((ward_val["new_provine_name"], ward_id))
+                ward_id += 1
+
+    for new_ward, rows in expected.items():
+        found = {(province, old) for ward, province, old in index_file.old_wards(new_ward) if ward == new_ward}
+        assert found == rows
+
+
+def test_lone_surrogates_are_not_found():
+    """Text decoded with surrogateescape misses instead of raising"""
+    from vn_address_converter import Address, ConversionStatus, convert_addresses_batch, parse_and_convert
+    from vn_address_converter.models import MappingMissingError
+
+    address = Address(None, "Phường 1", "Quận 1", "\udcff")
+    assert convert_addresses_batch([address]).status == [ConversionStatus.PROVINCE_NOT_FOUND]
+    with pytest.raises(MappingMissingError):
+        converter.convert_to_new_address(address)
+    assert not parse_and_convert("Phường 1, Quận 1, \udcff").ok
+    assert parse_and_convert("1 Lê Lợi, Phường 1, Quận 1, \udcff").status == ConversionStatus.PROVINCE_NOT_FOUND
+    assert parse_and_convert("1 Lê Lợi, Phường \udcff, Quận 1, Hồ Chí Minh").status == ConversionStatus.WARD_NOT_FOUND
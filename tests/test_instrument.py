@@ -0,0 +1,83 @@
+"""
+Tests for the per-stage latency instrumentation.
+"""
+import threading
+
+import pytest
+
+from vn_address_converter import (
+    StageHistogram,
+    cache_clear,
+    convert_to_new_address,
+    parse_address,
+    parse_and_convert,
+    set_stage_hook,
+    stage_hook,
+)
+from vn_address_converter import converter, instrument
+
+ADDRESS = "720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, TP HCM"
+
+
+@pytest.fixture(autouse=True)
+def no_hook():
+    cache_clear()
+    yield
+    set_stage_hook(None)
+
+
+def test_disabled_hook_leaves_functions_untouched():
+    originals = [getattr(module, name) for module, name, _ in instrument._STAGES]
+    set_stage_hook(lambda stage, seconds: None)
+    assert converter._find_tier is not originals[-1]
+    set_stage_hook(None)
+    assert [getattr(module, name) for module, name, _ in instrument._STAGES] == originals
+
+
+def test_stages_are_reported():
+    calls = []
+    with stage_hook(lambda stage, seconds: calls.append((stage, seconds))):
+        parse_and_convert(ADDRESS)
+        convert_to_new_address(parse_address("1 Lê Lợi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh"))
+    stages = {stage for stage, _ in calls}
+    assert {"parse", "convert", "convert.lookup.province", "convert.lookup.district",
+            "convert.lookup.ward", "convert.normalize"} <= stages
+    assert all(seconds >= 0 for _, seconds in calls)
+    assert instrument.get_stage_hook() is None
+
+
+def test_classify_stage_for_three_part_addresses():
+    calls = []
+    with stage_hook(lambda stage, seconds: calls.append(stage)):
+        parse_address("Phường 22, Quận Bình Thạnh, TP HCM")
+    assert calls.count("parse.classify") == 3
+    assert calls.count("parse") == 1
+
+
+def test_histogram_aggregates_and_renders():
+    histogram = StageHistogram()
+    histogram("parse", 3e-6)
+    histogram("parse", 7e-6)
+    histogram("parse", 1.0)
+    stats = histogram.snapshot()["parse"]
+    assert stats.count == 3
+    assert stats.seconds == pytest.approx(1.00001)
+    assert stats.quantile(0.5) == 1e-5
+    assert stats.quantile(1.0) == float("inf")
+    text = histogram.render()
+    assert 'vn_address_stage_duration_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'vn_address_stage_duration_seconds_count{stage="parse"} 3' in text
+    histogram.reset()
+    assert histogram.snapshot() == {}
+
+
+def test_histogram_from_threads():
+    histogram = StageHistogram()
+    set_stage_hook(histogram)
+    threads = [threading.Thread(target=lambda: [parse_and_convert(ADDRESS) for _ in range(50)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    set_stage_hook(None)
+    assert histogram.snapshot()["convert"].count == 200
@@ -0,0 +1,74 @@
+"""
+Tests for the fused parse_and_convert entry point.
+"""
+import re
+from pathlib import Path
+
+import pytest
+
+from vn_address_converter import (
+    ConversionStatus,
+    convert_to_new_address,
+    parse_address,
+    parse_and_convert,
+)
+from vn_address_converter import converter
+from vn_address_converter.models import AddressLevel, MappingMissingError
+
+
+def _parse_address_inputs():
+    source = (Path(__file__).parent / "test_parse_address.py").read_text(encoding="utf-8")
+    return re.findall(r'parse_address\(\s*"([^"]*)"', source)
+
+
+@pytest.mark.parametrize("address_string", _parse_address_inputs() + [
+    "720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh",
+    "123 nguyen hue, phuong ben nghe, quan 1, ho chi minh",
+    "Phường Nowhere, Quận 1, Thành phố Hồ Chí Minh",
+    "456 Lê Lợi, Phường Bến Nghé, Thành phố Hồ Chí Minh",
+    "",
+])
+def test_matches_parse_then_convert(address_string):
+    result = parse_and_convert(address_string)
+    assert result.input == address_string
+    try:
+        parsed = parse_address(address_string)
+    except ValueError:
+        assert result.status == ConversionStatus.PARSE_ERROR
+        assert result.parsed is None and result.address is None
+        return
+    assert result.parsed == parsed
+    try:
+        expected = convert_to_new_address(parsed)
+    except (ValueError, MappingMissingError):
+        assert not result.ok
+        assert result.address is None
+    else:
+        assert result.address == expected
+        assert result.status in (ConversionStatus.OK, ConversionStatus.UNCHANGED)
+
+
+def test_statuses():
+    assert parse_and_convert("720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh").status == ConversionStatus.OK
+    assert parse_and_convert("456 Lê Lợi, Phường Bến Nghé, Thành phố Hồ Chí Minh").status == ConversionStatus.UNCHANGED
+    assert parse_and_convert("1 Lê Lợi, Phường 22, Quận Nowhere, Hồ Chí Minh").status == ConversionStatus.DISTRICT_NOT_FOUND
+    assert parse_and_convert("only one part").status == ConversionStatus.PARSE_ERROR
+
+
+@pytest.mark.parametrize("address_string", [",,", " ; ", "-"])
+def test_separators_only_is_a_parse_error(address_string):
+    result = parse_and_convert(address_string)
+    assert result.status == ConversionStatus.PARSE_ERROR
+    with pytest.raises(ValueError):
+        parse_address(address_string)
+
+
+def test_lookup_forms_are_shared_and_bounded(monkeypatch):
+    monkeypatch.setattr(converter, "_LOOKUP_FORMS", {})
+    monkeypatch.setattr(converter, "_LOOKUP_FORMS_SIZE", 4)
+    forms = converter._lookup_forms(AddressLevel.DISTRICT, "Quận Bình Thạnh")
+    assert forms == ("bình thạnh", "binh thanh")
+    assert converter._lookup_forms(AddressLevel.DISTRICT, "Quận Bình Thạnh") is forms
+    for i in range(10):
+        converter._lookup_forms(AddressLevel.WARD, f"Phường {i}")
+    assert len(converter._LOOKUP_FORMS) <= 4
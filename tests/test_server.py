@@ -0,0 +1,145 @@
+"""
+Tests for the HTTP conversion server.
+"""
+import http.client
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from vn_address_converter.server import make_server
+
+ADDRESS = "720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh"
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, data=None):
+    body = None if data is None else json.dumps(data).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body)) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+def test_convert(base_url):
+    status, body = _request(f"{base_url}/convert?address={urllib.parse.quote(ADDRESS)}")
+    assert status == 200
+    result = json.loads(body)
+    assert result["status"] == "ok"
+    assert result["address"] == "720A Điện Biên Phủ, Phường Thạnh Mỹ Tây, Thành phố Hồ Chí Minh"
+    assert result["components"]["district"] is None
+    assert result["parsed"]["ward"] == "Phường 22"
+
+    status, body = _request(f"{base_url}/convert", {"address": ADDRESS})
+    assert status == 200 and json.loads(body)["status"] == "ok"
+
+
+def test_batch(base_url):
+    status, body = _request(f"{base_url}/convert/batch", [ADDRESS, "", ADDRESS])
+    assert status == 200
+    assert [result["status"] for result in json.loads(body)] == ["ok", "parse_error", "ok"]
+
+
+def test_errors(base_url):
+    assert _request(f"{base_url}/convert/batch", {"address": ADDRESS})[0] == 400
+    assert _request(f"{base_url}/convert/batch")[0] == 405
+    assert _request(f"{base_url}/convert")[0] == 400
+    assert _request(f"{base_url}/nope")[0] == 404
+
+
+def test_negative_content_length(base_url):
+    connection = http.client.HTTPConnection(urllib.parse.urlsplit(base_url).netloc, timeout=5)
+    connection.putrequest("POST", "/convert")
+    connection.putheader("Content-Length", "-1")
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert response.getheader("Connection") == "close"
+    connection.close()
+
+
+@pytest.mark.parametrize("path", ["/nope", "/metrics"])
+def test_unread_body_is_not_taken_for_the_next_request(base_url, path):
+    host, port = urllib.parse.urlsplit(base_url).netloc.split(":")
+    query = urllib.parse.quote(ADDRESS)
+    # A body that reads as a request of its own if it is left unread
+    body = "GET /x HTTP/1.1\r\n\r\n"
+    requests = (
+        f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n{body}"
+        f"GET /convert?address={query} HTTP/1.1\r\nHost: x\r\n\r\n"
+    )
+    with socket.create_connection((host, int(port)), timeout=5) as sock:
+        sock.sendall(requests.encode("ascii"))
+        received = b""
+        while chunk := sock.recv(65536):
+            received += chunk
+            if b"HTTP/1.1 200" in received:
+                break
+    statuses = re.findall(rb"HTTP/1\.1 (\d{3}) ", received)
+    # The connection is closed after the error, or the next request is answered
+    assert statuses[0] in (b"404", b"405")
+    assert statuses[1:] in ([], [b"200"])
+
+
+def test_metrics(base_url):
+    _request(f"{base_url}/convert/batch", [ADDRESS] * 3)
+    status, body = _request(f"{base_url}/metrics")
+    assert status == 200
+    assert re.search(r'^vn_address_requests_total\{endpoint="batch",code="2xx"\} [1-9]', body, re.M)
+    assert re.search(r'^vn_address_request_duration_seconds_bucket\{endpoint="batch",le="\+Inf"\} [1-9]', body, re.M)
+    assert re.search(r'^vn_address_cache_hit_ratio\{cache="parse"\} 0\.\d+', body, re.M)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork needs os.fork")
+def test_prefork_serve():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "vn_address_converter", "serve", "--port", "0", "--workers", "2"],
+        stderr=subprocess.PIPE, text=True,
+    )
+    try:
+        line = process.stderr.readline()
+        port = re.search(r":(\d+) ", line).group(1)
+        base = f"http://127.0.0.1:{port}"
+        for _ in range(4):
+            assert _request(f"{base}/convert", ADDRESS)[0] == 200
+        body = _request(f"{base}/metrics")[1]
+        # Counts from both workers are aggregated in shared memory
+        assert 'vn_address_requests_total{endpoint="convert",code="2xx"} 4' in body
+        assert "vn_address_workers 2" in body
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+
+
+def test_prefork_serve_gives_up_on_workers_that_die_at_startup():
+    code = (
+        "from vn_address_converter import server\n"
+        "def crash(*args):\n"
+        "    raise OSError('cannot start')\n"
+        "server._run_worker = crash\n"
+        "server.RESTART_DELAY = 0.01\n"
+        "server.MAX_FAST_FAILURES = 3\n"
+        "server.serve(port=0, workers=2)\n"
+    )
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=30)
+    assert process.returncode != 0
+    assert "exited at startup 3 times in a row" in process.stderr
@@ -0,0 +1,80 @@
+"""
+Tests for the streaming parse-and-convert API.
+"""
+import tracemalloc
+
+import pytest
+
+from vn_address_converter import ConversionStatus, converter, iter_parse_and_convert, parse_and_convert
+
+
+INPUTS = [
+    "720A Điện Biên Phủ, Phường 22, Quận Bình Thạnh, Hồ Chí Minh",
+    "",
+    "Phường Nowhere, Quận 1, Thành phố Hồ Chí Minh",
+    "456 Lê Lợi, Phường Bến Nghé, Thành phố Hồ Chí Minh",
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iter_parse_and_convert_in_order(chunk_size):
+    results = list(iter_parse_and_convert(iter(INPUTS * 3), chunk_size=chunk_size))
+    assert [result.input for result in results] == INPUTS * 3
+    assert [result.status for result in results[:4]] == [
+        ConversionStatus.OK,
+        ConversionStatus.PARSE_ERROR,
+        ConversionStatus.WARD_NOT_FOUND,
+        ConversionStatus.UNCHANGED,
+    ]
+    first = results[0]
+    assert first.ok
+    assert first.parsed.ward == "Phường 22"
+    assert first.address.format() == "720A Điện Biên Phủ, Phường Thạnh Mỹ Tây, Thành phố Hồ Chí Minh"
+    assert results[2].address is None and results[2].parsed is not None
+
+
+def test_chunk_resolves_each_distinct_key_once(monkeypatch):
+    calls = []
+    convert_key = converter._convert_key
+    monkeypatch.setattr(converter, "_convert_key", lambda *args: calls.append(args) or convert_key(*args))
+
+    results = list(iter_parse_and_convert(INPUTS * 5, chunk_size=1024))
+    # Two of the inputs have a district to look up, each repeated five times
+    assert sorted(count for *_, count in calls) == [5, 5]
+    assert [result.to_dict() for result in results] == [parse_and_convert(s).to_dict() for s in INPUTS * 5]
+
+
+def test_iter_parse_and_convert_is_lazy():
+    consumed = []
+
+    def source():
+        for i, address in enumerate(INPUTS * 100):
+            consumed.append(i)
+            yield address
+
+    results = iter_parse_and_convert(source(), chunk_size=10)
+    next(results)
+    assert len(consumed) == 10
+
+
+def test_iter_parse_and_convert_memory_is_flat():
+    def source(n):
+        for i in range(n):
+            # A bounded set of distinct strings, so the LRU caches stop growing
+            yield f"{i % 500} Lê Lợi, Phường 1, Quận 1, Thành phố Hồ Chí Minh"
+
+    def peak(n):
+        tracemalloc.start()
+        for _ in iter_parse_and_convert(source(n), chunk_size=100):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    peak(1000)
+    assert peak(20000) < 2 * peak(2000)
+
+
+def test_iter_parse_and_convert_rejects_bad_chunk_size():
+    with pytest.raises(ValueError):
+        next(iter_parse_and_convert(INPUTS, chunk_size=0))
@@ -0,0 +1,37 @@
+"""
+Tests for fuzzy address suggestions.
+"""
+from vn_address_converter import Address, get_address_suggestions, reload_mapping
+
+
+def test_suggests_misspelled_district():
+    suggestions = get_address_suggestions(Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạn", "Hồ Chí Minh"))
+    best = suggestions[0]
+    assert best.address == Address("720A Điện Biên Phủ", "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh")
+    assert best.new_address == Address("720A Điện Biên Phủ", "Phường Thạnh Mỹ Tây", None, "Thành phố Hồ Chí Minh")
+    assert 0 < best.score < 1
+
+
+def test_suggests_misspelled_ward_and_province_without_accents():
+    suggestions = get_address_suggestions(Address(None, "Phuong Tan Dihn", "Quan 1", "Ho Chi Mnh"), limit=3)
+    assert len(suggestions) <= 3
+    assert suggestions[0].address.ward == "Phường Tân Định"
+    assert suggestions[0].address.province == "Thành phố Hồ Chí Minh"
+    assert [s.score for s in suggestions] == sorted((s.score for s in suggestions), reverse=True)
+
+
+def test_exact_address_scores_one():
+    suggestions = get_address_suggestions(Address(None, "Phường 22", "Quận Bình Thạnh", "Thành phố Hồ Chí Minh"))
+    assert len(suggestions) == 1 and suggestions[0].score == 1.0
+
+
+def test_no_suggestions():
+    assert get_address_suggestions(Address(None, "Phường 1", None, "Thành phố Hồ Chí Minh")) == []
+    assert get_address_suggestions(Address(None, "zzzz", "qqqq", "xxxxxx")) == []
+
+
+def test_suggestions_survive_reload():
+    address = Address(None, "Phường Tân Địnhh", "Quận 1", "Thành phố Hồ Chí Minh")
+    before = get_address_suggestions(address)
+    reload_mapping()
+    assert get_address_suggestions(address) == before
@@ -0,0 +1,85 @@
+"""
+Tests for thread-safe index initialization and warmup.
+"""
+import gc
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from vn_address_converter import converter, memory_usage, preload_in_background, prepare_for_fork, warmup
+from vn_address_converter.models import MappingMissingError
+
+
+def test_concurrent_first_calls_load_once(monkeypatch):
+    """Threads racing on the first call share a single index load"""
+    calls = []
+    load_index = converter._load_index
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.05)
+        return load_index()
+
+    monkeypatch.setattr(converter, "WARD_INDEX", None)
+    monkeypatch.setattr(converter, "_load_index", slow_load)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(converter._get_index())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(index is results[0] for index in results)
+
+
+def test_warmup_loads_all_segments(monkeypatch):
+    monkeypatch.setattr(converter, "WARD_INDEX", None)
+    warmup()
+    index = converter.WARD_INDEX
+    assert index is not None
+    assert memory_usage()["provinces_loaded"] == index.num_provinces
+
+
+def test_warmup_selected_provinces(monkeypatch):
+    monkeypatch.setattr(converter, "WARD_INDEX", None)
+    warmup(["HCM", "Hà Nội"])
+    assert memory_usage()["provinces_loaded"] == 2
+
+    with pytest.raises(MappingMissingError):
+        warmup(["Invalid Province"])
+
+
+def test_preload_in_background(monkeypatch):
+    monkeypatch.setattr(converter, "WARD_INDEX", None)
+    thread = preload_in_background()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
+    assert converter.WARD_INDEX is not None
+
+
+def test_preload_env_var_at_import():
+    code = (
+        "import threading, vn_address_converter; "
+        "print(any(t.name == 'vn-address-converter-preload' for t in threading.enumerate()) "
+        "or vn_address_converter.converter.WARD_INDEX is not None)"
+    )
+    env = dict(os.environ, **{converter.PRELOAD_ENV_VAR: "1"})
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "True"
+
+
+def test_prepare_for_fork(monkeypatch):
+    monkeypatch.setattr(converter, "WARD_INDEX", None)
+    try:
+        prepare_for_fork()
+        assert memory_usage()["provinces_loaded"] == converter.WARD_INDEX.num_provinces
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
@@ -1,10 +1,102 @@
-from .converter import convert_to_new_address
+import os
+
+__version__ = "0.1.2"
+
+from .cache import cache_clear, cache_info, configure_cache
+from .converter import (
+    PRELOAD_ENV_VAR,
+    convert_addresses_batch,
+    convert_to_new_address,
+    find_old_address,
+    get_conversion_stats,
+    iter_parse_and_convert,
+    load_mapping,
+    memory_usage,
+    parse_and_convert,
+    preload_in_background,
+    prepare_for_fork,
+    reload_mapping,
+    reset_conversion_stats,
+    warmup,
+)
+from .gazetteer import extract_addresses, find_mentions
+from .hierarchy import autocomplete, list_districts_by_province, list_provinces, list_wards_by_district
 from .parser import parse_address
-from .models import Address, AddressLevel
+from .suggest import get_address_suggestions
+from .models import Address, AddressLevel, BatchResult, ConversionResult, Completion, ConversionStatus, ExtractedAddress, FrozenAddress, MatchTier, Mention, Suggestion
 
 __all__ = [
     "convert_to_new_address",
+    "convert_addresses_batch",
+    "convert_columns",
+    "parse_and_convert",
+    "iter_parse_and_convert",
+    "find_old_address",
+    "aconvert",
+    "aparse_and_convert",
+    "configure_async",
+    "memory_usage",
+    "warmup",
+    "preload_in_background",
+    "prepare_for_fork",
+    "reload_mapping",
+    "load_mapping",
+    "get_conversion_stats",
+    "reset_conversion_stats",
+    "set_stage_hook",
+    "stage_hook",
+    "StageHistogram",
+    "configure_cache",
+    "cache_info",
+    "cache_clear",
     "parse_address",
+    "get_address_suggestions",
+    "extract_addresses",
+    "find_mentions",
+    "list_provinces",
+    "list_districts_by_province",
+    "list_wards_by_district",
+    "autocomplete",
     "Address",
+    "FrozenAddress",
     "AddressLevel",
-]
\ No newline at end of file
+    "BatchResult",
+    "ConversionResult",
+    "ConversionStatus",
+    "MatchTier",
+    "Suggestion",
+    "Mention",
+    "ExtractedAddress",
+    "Completion",
+]
+
+# Imported on first use, so that ``import vn_address_converter`` does not pay
+# for asyncio and the optional APIs
+_LAZY = {
+    "aconvert": "aio",
+    "aparse_and_convert": "aio",
+    "configure_async": "aio",
+    "convert_columns": "columns",
+    "set_stage_hook": "instrument",
+    "stage_hook": "instrument",
+    "StageHistogram": "instrument",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if os.environ.get(PRELOAD_ENV_VAR) == '1':
+    preload_in_background()
@@ -0,0 +1,153 @@
+"""asyncio API that coalesces concurrent calls into batches run off the event loop.
+
+Each event loop gets one micro-batcher per operation. A call adds its input to
+the pending batch and waits on a future; the batch is flushed when it reaches
+``max_batch_size`` or ``max_latency`` seconds after its first call, converted
+in an executor thread (so loading the index never blocks the loop), and the
+results are handed back to the waiting callers.
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+from .converter import convert_to_new_address, parse_and_convert
+from .models import Address, ConversionResult, FrozenAddress
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_LATENCY = 0.002
+
+_settings = {
+    'max_batch_size': DEFAULT_MAX_BATCH_SIZE,
+    'max_latency': DEFAULT_MAX_LATENCY,
+    'executor': None,
+}
+_BATCHERS: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]' = weakref.WeakKeyDictionary()
+
+
+def configure_async(max_batch_size: Optional[int] = None, max_latency: Optional[float] = None,
+                    executor: Optional[Executor] = None) -> None:
+    """Tune the micro-batching of ``aconvert`` and ``aparse_and_convert``.
+
+    Args:
+        max_batch_size: Flush a batch as soon as it has this many calls
+        max_latency: Seconds to wait for more calls after the first call of a batch
+        executor: Executor running the batches (None keeps the current one; the
+            default is the event loop's default executor)
+    """
+    if max_batch_size is not None:
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be at least 1')
+        _settings['max_batch_size'] = max_batch_size
+    if max_latency is not None:
+        if max_latency < 0:
+            raise ValueError('max_latency must not be negative')
+        _settings['max_latency'] = max_latency
+    if executor is not None:
+        _settings['executor'] = executor
+
+
+class _MicroBatcher:
+    """Collect calls made on one event loop and process them in batches.
+
+    The loop is looked up when needed rather than kept: the batcher is the value
+    of its loop in ``_BATCHERS`` and must not keep that key alive.
+    """
+
+    def __init__(self, process: Callable[[list], list]):
+        self._process = process
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, item: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= _settings['max_batch_size']:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(_settings['max_latency'], self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                _settings['executor'], self._process, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # The caller may have been cancelled while the batch was running
+            if not future.done():
+                future.set_result(result)
+
+
+def _convert_batch(addresses: list) -> list[tuple[Any, Optional[Exception]]]:
+    # Each caller gets its own result or error, whatever the other items do
+    results = []
+    for address in addresses:
+        try:
+            results.append((convert_to_new_address(address), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
+def _parse_and_convert_batch(address_strings: list[str]) -> list[tuple[Optional[ConversionResult], Optional[Exception]]]:
+    results = []
+    for address_string in address_strings:
+        try:
+            results.append((parse_and_convert(address_string), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
+def _batcher(name: str, process: Callable[[list], list]) -> _MicroBatcher:
+    loop = asyncio.get_running_loop()
+    batchers = _BATCHERS.get(loop)
+    if batchers is None:
+        batchers = _BATCHERS[loop] = {}
+    batcher = batchers.get(name)
+    if batcher is None:
+        batcher = batchers[name] = _MicroBatcher(process)
+    return batcher
+
+
+async def aconvert(address: Address | FrozenAddress) -> Address | FrozenAddress:
+    """Async ``convert_to_new_address``, batched with concurrent calls.
+
+    Raises:
+        ValueError: If the province or ward is missing
+        MappingMissingError: If a component is not found in the mapping
+    """
+    result, error = await _batcher('convert', _convert_batch).submit(address)
+    if error is not None:
+        raise error
+    return result
+
+
+async def aparse_and_convert(address_string: str) -> ConversionResult:
+    """Parse and convert an address string without blocking the event loop.
+
+    Concurrent calls are coalesced into one batch. Bad input never raises; see
+    ``ConversionResult.status``.
+    """
+    result, error = await _batcher('parse_and_convert', _parse_and_convert_batch).submit(address_string)
+    if error is not None:
+        raise error
+    return result
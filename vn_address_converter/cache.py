@@ -0,0 +1,105 @@
+"""Bounded LRU caches in front of ``parse_address`` and ``convert_to_new_address``."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+DEFAULT_PARSE_CACHE_SIZE = 8192
+DEFAULT_CONVERT_CACHE_SIZE = 8192
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of one cache."""
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """Thread-safe bounded mapping with least-recently-used eviction.
+
+    A ``maxsize`` of 0 disables the cache: every lookup is a miss and nothing
+    is stored.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` (marking it recently used), or None."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._data))
+
+
+PARSE_CACHE = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+CONVERT_CACHE = LRUCache(DEFAULT_CONVERT_CACHE_SIZE)
+
+
+def configure_cache(parse_size: Optional[int] = None, convert_size: Optional[int] = None) -> None:
+    """Set the maximum number of entries of the parse and convert caches.
+
+    Args:
+        parse_size: Maximum number of raw address strings kept by
+            ``parse_address`` (0 disables the cache, None keeps the current size)
+        convert_size: Maximum number of (province, district, ward) keys kept by
+            ``convert_to_new_address`` (0 disables the cache, None keeps the current size)
+    """
+    if parse_size is not None:
+        PARSE_CACHE.resize(parse_size)
+    if convert_size is not None:
+        CONVERT_CACHE.resize(convert_size)
+
+
+def cache_info() -> dict[str, CacheInfo]:
+    """Return hit, miss and eviction statistics of the ``parse`` and ``convert`` caches."""
+    return {'parse': PARSE_CACHE.info(), 'convert': CONVERT_CACHE.info()}
+
+
+def cache_clear() -> None:
+    """Clear both caches and their statistics."""
+    PARSE_CACHE.clear()
+    CONVERT_CACHE.clear()
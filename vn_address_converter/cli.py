@@ -0,0 +1,221 @@
+"""Command line interface: ``vn-address-converter <command> ...``."""
+
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Iterable, Iterator, Optional
+
+from .converter import _parse_and_convert_chunk, warmup
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Rows converted together when streaming a file in a single process
+_ROWS_PER_BATCH = 10000
+
+
+def _convert_rows(rows: Iterable[list[str]], column_index: int) -> Iterator[list[str]]:
+    """Yield each row with the converted address and the conversion status appended."""
+    rows = list(rows)
+    results = _parse_and_convert_chunk([row[column_index] if column_index < len(row) else '' for row in rows])
+    for row, result in zip(rows, results):
+        yield row + [result.address.format() if result.address else '', result.status.value]
+
+
+def _split_ranges(size: int, start: int, chunk_size: int) -> list[tuple[int, int]]:
+    return [(offset, min(offset + chunk_size, size)) for offset in range(start, size, chunk_size)]
+
+
+def _read_range(path: str, start: int, end: int) -> bytes:
+    """Read the lines that start within ``[start, end)``; ``start`` must be past the header."""
+    with open(path, 'rb') as f:
+        f.seek(start - 1)
+        data = f.read(end - start + 1)
+        # Bytes up to the first newline belong to a line owned by the previous range
+        newline = data.find(b'\n')
+        if newline == -1:
+            return b''
+        data = data[newline + 1:]
+        if data and not data.endswith(b'\n'):
+            data += f.readline()
+    return data
+
+
+def _convert_range(task: tuple) -> tuple[str, Counter]:
+    """Worker: convert one byte range of the input into a part file."""
+    path, start, end, column_index, part_path = task
+    text = _read_range(path, start, end).decode('utf-8')
+    counts: Counter = Counter()
+    with open(part_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        for row in _convert_rows(csv.reader(io.StringIO(text)), column_index):
+            counts[row[-1]] += 1
+            writer.writerow(row)
+    return part_path, counts
+
+
+class _Progress:
+    def __init__(self, quiet: bool):
+        self.quiet = quiet
+        self.started = time.perf_counter()
+        self.counts: Counter = Counter()
+
+    def update(self, counts: Counter) -> None:
+        self.counts.update(counts)
+        if not self.quiet:
+            rows = sum(self.counts.values())
+            rate = rows / max(time.perf_counter() - self.started, 1e-9)
+            sys.stderr.write(f'\r{rows:,} rows, {rate:,.0f} rows/s')
+            sys.stderr.flush()
+
+    def finish(self) -> None:
+        if not self.quiet:
+            summary = ', '.join(f'{status}: {count:,}' for status, count in self.counts.most_common())
+            sys.stderr.write(f'\n{summary}\n')
+
+
+def convert_csv(input_path: str, output_path: str, column: str, jobs: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, output_column: str = 'new_address',
+                status_column: str = 'conversion_status', quiet: bool = True) -> Counter:
+    """Convert the address column of a CSV file, appending the new address and status.
+
+    With more than one job the file after the header is split into byte ranges
+    on row boundaries, the ranges are converted by a process pool whose workers
+    load the index once, and the output is written in the original row order.
+    Byte-range splitting assumes no quoted field spans several lines; use
+    ``jobs=1`` to stream such files through the ``csv`` module instead.
+
+    Args:
+        input_path: UTF-8 CSV file with a header row
+        output_path: Where to write the converted CSV
+        column: Name of the column holding the address strings
+        jobs: Number of worker processes (defaults to the number of CPUs)
+        chunk_size: Size of the byte ranges handed to the workers
+        output_column: Name of the appended converted address column
+        status_column: Name of the appended conversion status column
+        quiet: Do not report progress on stderr
+
+    Returns:
+        Counter: Number of rows per conversion status
+
+    Raises:
+        ValueError: If ``column`` is not in the header
+    """
+    jobs = jobs or os.cpu_count() or 1
+    with open(input_path, 'rb') as f:
+        header_line = f.readline()
+    header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+    if column not in header:
+        raise ValueError(f'Column not found in header: {column}')
+    column_index = header.index(column)
+
+    warmup()
+    progress = _Progress(quiet)
+    with open(output_path, 'w', encoding='utf-8', newline='') as out:
+        csv.writer(out).writerow(header + [output_column, status_column])
+
+        if jobs == 1:
+            with open(input_path, encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                writer = csv.writer(out)
+                while True:
+                    rows = [row for _, row in zip(range(_ROWS_PER_BATCH), reader)]
+                    if not rows:
+                        break
+                    converted = list(_convert_rows(rows, column_index))
+                    writer.writerows(converted)
+                    progress.update(Counter(row[-1] for row in converted))
+        else:
+            size = os.path.getsize(input_path)
+            part_dir = tempfile.mkdtemp(prefix='vn-address-converter-', dir=os.path.dirname(os.path.abspath(output_path)))
+            ranges = _split_ranges(size, len(header_line), chunk_size)
+            tasks = [
+                (input_path, start, end, column_index, os.path.join(part_dir, f'{i:08d}.csv'))
+                for i, (start, end) in enumerate(ranges)
+            ]
+            try:
+                with multiprocessing.Pool(jobs, initializer=warmup) as pool:
+                    # imap yields in task order, so parts are appended in row order
+                    for part_path, counts in pool.imap(_convert_range, tasks):
+                        out.flush()
+                        with open(part_path, encoding='utf-8', newline='') as part:
+                            shutil.copyfileobj(part, out)
+                        os.remove(part_path)
+                        progress.update(counts)
+            finally:
+                shutil.rmtree(part_dir, ignore_errors=True)
+
+    progress.finish()
+    return progress.counts
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='vn-address-converter',
+        description='Convert old Vietnamese addresses to the new administrative format.',
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help='Convert the address column of a CSV file')
+    convert.add_argument('input', help='Input CSV file (UTF-8, with a header row)')
+    convert.add_argument('output', help='Output CSV file')
+    convert.add_argument('--column', required=True, help='Name of the column holding the addresses')
+    convert.add_argument('--jobs', '-j', type=int, default=None,
+                         help='Worker processes (default: number of CPUs); use 1 for files with '
+                              'multi-line quoted fields')
+    convert.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                         help='Bytes of input per work unit (default: %(default)s)')
+    convert.add_argument('--output-column', default='new_address',
+                         help='Name of the converted address column (default: %(default)s)')
+    convert.add_argument('--status-column', default='conversion_status',
+                         help='Name of the status column (default: %(default)s)')
+    convert.add_argument('--quiet', '-q', action='store_true', help='Do not report progress')
+
+    serve = commands.add_parser('serve', help='Run the HTTP conversion server')
+    serve.add_argument('--host', default='127.0.0.1', help='Address to bind (default: %(default)s)')
+    serve.add_argument('--port', type=int, default=8000, help='Port to bind (default: %(default)s)')
+    serve.add_argument('--workers', '-w', type=int, default=None,
+                       help='Worker processes (default: number of CPUs)')
+    serve.add_argument('--access-log', action='store_true', help='Log every request to stderr')
+
+    daemon = commands.add_parser('daemon', help='Answer one address per line over stdin/stdout or a Unix socket')
+    daemon.add_argument('--socket', default=None, help='Listen on this Unix domain socket instead of stdin')
+    daemon.add_argument('--format', choices=('tsv', 'json'), default='tsv',
+                        help='Response format (default: %(default)s)')
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        try:
+            convert_csv(
+                args.input, args.output, args.column,
+                jobs=args.jobs,
+                chunk_size=args.chunk_size,
+                output_column=args.output_column,
+                status_column=args.status_column,
+                quiet=args.quiet,
+            )
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    elif args.command == 'serve':
+        from .server import serve
+
+        serve(args.host, args.port, workers=args.workers, access_log=args.access_log)
+    elif args.command == 'daemon':
+        from .daemon import serve_stdio, serve_unix
+
+        if args.socket:
+            serve_unix(args.socket, args.format)
+        else:
+            serve_stdio(args.format)
+    return 0
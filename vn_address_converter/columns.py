@@ -0,0 +1,152 @@
+"""Vectorized conversion of pandas and PyArrow address columns.
+
+pandas, numpy and pyarrow are optional; they are only imported when columns
+of those types are passed in (``pip install vn-address-converter[pandas]`` or
+``[arrow]``).
+"""
+
+from collections import Counter
+from typing import Any, Optional, Sequence
+
+from .converter import _convert_outcome
+from .models import BatchResult, ConversionStatus
+
+_STATUSES = list(ConversionStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+
+def _column_kind(column: Any) -> str:
+    module = type(column).__module__
+    if module.startswith('pandas'):
+        return 'pandas'
+    if module.startswith('pyarrow'):
+        return 'arrow'
+    return 'python'
+
+
+def _factorize(column: Any) -> tuple[Any, list]:
+    """Dictionary-encode a column into ``(codes, uniques)``; missing values get code -1."""
+    import numpy as np
+
+    kind = _column_kind(column)
+    if kind == 'pandas':
+        import pandas as pd
+
+        codes, uniques = pd.factorize(column)
+        return np.asarray(codes, dtype=np.int64), list(uniques)
+    if kind == 'arrow':
+        import pyarrow as pa
+
+        if isinstance(column, pa.ChunkedArray):
+            column = column.combine_chunks()
+        encoded = column.dictionary_encode()
+        codes = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        return codes.astype(np.int64), encoded.dictionary.to_pylist()
+
+    seen: dict = {}
+    codes = [-1 if value is None else seen.setdefault(value, len(seen)) for value in column]
+    return np.asarray(codes, dtype=np.int64), list(seen)
+
+
+def _convert_python(province: Sequence, district: Sequence, ward: Sequence,
+                    street: Optional[Sequence]) -> BatchResult:
+    keys = list(zip(province, district, ward, strict=True))
+    # Resolve each distinct key once, counted once per row in the statistics
+    resolved = {key: _convert_outcome(*key, count) for key, count in Counter(keys).items()}
+    result = BatchResult()
+    for key in keys:
+        status, new_ward, new_district, new_province = resolved[key]
+        result.ward.append(new_ward)
+        result.district.append(new_district)
+        result.province.append(new_province)
+        result.status.append(status)
+    result.street_address = list(street) if street is not None else [None] * len(result.status)
+    return result
+
+
+def convert_columns(province: Any, district: Any, ward: Any, street: Any = None) -> Any:
+    """Convert old addresses given as columns, resolving each distinct ward key once.
+
+    Each input column is dictionary-encoded (``pandas.factorize`` or Arrow
+    ``dictionary_encode``), the distinct (province, district, ward) code
+    triples are resolved through the alias indexes, and the result columns are
+    built by indexing the per-key results with the row codes. Rows are never
+    raised on; the outcome of each row is in the ``status`` column.
+
+    Args:
+        province: Old province names (pandas Series, PyArrow array or sequence)
+        district: Old district names, same length as ``province``
+        ward: Old ward names, same length as ``province``
+        street: Optional street addresses, passed through unchanged
+
+    Returns:
+        A ``pandas.DataFrame`` (indexed like ``province``) for pandas input, a
+        ``pyarrow.Table`` for PyArrow input, or a ``BatchResult`` for plain
+        sequences. The columns are ``street_address`` (if given), ``ward``,
+        ``district``, ``province`` and ``status``.
+
+    Raises:
+        ValueError: If the columns do not all have the same length
+    """
+    columns = (province, district, ward)
+    lengths = [len(column) for column in (*columns, *([] if street is None else [street]))]
+    if len(set(lengths)) > 1:
+        raise ValueError(f'Columns must have the same length, got {", ".join(map(str, lengths))}')
+    kind = _column_kind(province)
+    if all(_column_kind(column) == 'python' for column in columns):
+        return _convert_python(province, district, ward, street)
+
+    import numpy as np
+
+    encoded = [_factorize(column) for column in columns]
+    # Combine the per-column codes into one dense key per distinct triple,
+    # re-densifying after each step so that the key never overflows
+    key = encoded[0][0] + 1
+    for codes, uniques in encoded[1:]:
+        key = np.unique(key, return_inverse=True)[1].reshape(-1) * (len(uniques) + 1) + codes + 1
+    _, first_rows, inverse = np.unique(key, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    counts = np.bincount(inverse, minlength=len(first_rows))
+
+    wards, districts, provinces, status_codes = [], [], [], []
+    for row, count in zip(first_rows, counts.tolist()):
+        values = [uniques[codes[row]] if codes[row] >= 0 else None for codes, uniques in encoded]
+        status, new_ward, new_district, new_province = _convert_outcome(*values, count)
+        wards.append(new_ward)
+        districts.append(new_district)
+        provinces.append(new_province)
+        status_codes.append(_STATUS_CODES[status])
+
+    if kind == 'arrow':
+        import pyarrow as pa
+
+        indices = pa.array(inverse)
+        table = {} if street is None else {'street_address': street}
+        for name, values in (('ward', wards), ('district', districts), ('province', provinces)):
+            table[name] = pa.array(values, type=pa.string()).take(indices)
+        table['status'] = pa.DictionaryArray.from_arrays(
+            pa.array(np.asarray(status_codes, dtype=np.int32)[inverse]),
+            pa.array([status.value for status in _STATUSES]),
+        )
+        return pa.table(table)
+
+    frame = {} if street is None else {'street_address': np.asarray(street, dtype=object)}
+    for name, values in (('ward', wards), ('district', districts), ('province', provinces)):
+        frame[name] = np.asarray(values, dtype=object)[inverse]
+    status_column = np.asarray(status_codes, dtype=np.int64)[inverse]
+
+    if kind == 'pandas':
+        import pandas as pd
+
+        frame['status'] = pd.Categorical.from_codes(status_column, categories=[s.value for s in _STATUSES])
+        return pd.DataFrame(frame, index=province.index)
+
+    # Mixed inputs whose province column is a plain sequence
+    return BatchResult(
+        street_address=list(street) if street is not None else [None] * len(inverse),
+        ward=frame['ward'].tolist(),
+        district=frame['district'].tolist(),
+        province=frame['province'].tolist(),
+        status=[_STATUSES[code] for code in status_column],
+    )
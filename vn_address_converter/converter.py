@@ -1,203 +1,610 @@
 import copy
+import gc
 import json
 import os
-import re
-import unicodedata
+import threading
+import weakref
+from collections import Counter
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
-from .models import Address, AddressLevel, MappingMissingError
+from . import datasets
+from .cache import CONVERT_CACHE, PARSE_CACHE, cache_clear
+from .index import CompiledIndex, source_digest
+from .models import (
+    Address,
+    AddressLevel,
+    BatchResult,
+    ConversionResult,
+    ConversionStatus,
+    FrozenAddress,
+    MappingMissingError,
+    MatchTier,
+)
+from .parser import _parse_components
+from .normalize import _accent_fold, _normalize_apostrophes, get_aliases, normalize_alias  # noqa: F401
 
 WARD_MAPPING_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ward_mapping.json')
 MANUAL_ALIASES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'manual_aliases.json')
-WARD_MAPPING = None
-MANUAL_ALIASES = None
+WARD_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ward_index')
+WARD_INDEX = None
+PRELOAD_ENV_VAR = 'VN_ADDRESS_CONVERTER_PRELOAD'
+
+_INDEX_LOCK = threading.Lock()
+# (mapping files, alias files, cache directory) set by load_mapping(), or
+# None for the packaged data
+_DATASET: Optional[tuple[tuple[str, ...], tuple[str, ...], Optional[str]]] = None
+
+# Normalized and accent-folded lookup forms of each component name, computed
+# once per distinct name and shared by every lookup of it; cleared when full
+_LOOKUP_FORMS: dict[tuple, tuple[str, str]] = {}
+_LOOKUP_FORMS_SIZE = 65536
+
+# Conversion statistics: lookups per (level, tier), counted for every
+# conversion, including those answered from the convert cache. Each thread
+# counts the tier tuples of its conversions in its own dict, without a lock;
+# get_conversion_stats() merges them, and the counts of threads that have
+# exited are folded into _RETIRED_COUNTS.
+_STATS_LEVELS = (AddressLevel.PROVINCE, AddressLevel.DISTRICT, AddressLevel.WARD)
+_TIERS = (MatchTier.EXACT, MatchTier.NORMALIZED, MatchTier.FOLDED, MatchTier.MANUAL, MatchTier.MISS)
+_EXACT_TIER, _NORMALIZED_TIER, _FOLDED_TIER, _MANUAL_TIER, _MISS_TIER = range(len(_TIERS))
+_STATS_LOCK = threading.RLock()
+_STATS_LOCAL = threading.local()
+_RETIRED_COUNTS: Counter = Counter()
+_THREAD_COUNTS: 'weakref.WeakSet[_ThreadCounts]' = weakref.WeakSet()
+
+
+class _ThreadCounts:
+    """The tier counts of one thread; they outlive it in ``_RETIRED_COUNTS``."""
+
+    __slots__ = ('counts', '__weakref__')
+
+    def __init__(self) -> None:
+        self.counts: dict[tuple, int] = {}
+
+
+def _retire_counts(counts: dict[tuple, int]) -> None:
+    with _STATS_LOCK:
+        _RETIRED_COUNTS.update(counts)
+
+
+def _new_thread_counts() -> dict[tuple, int]:
+    holder = _ThreadCounts()
+    weakref.finalize(holder, _retire_counts, holder.counts)
+    with _STATS_LOCK:
+        _THREAD_COUNTS.add(holder)
+    _STATS_LOCAL.holder = holder
+    _STATS_LOCAL.counts = holder.counts
+    return holder.counts
+
+
+def _load_manual_aliases():
+    if _DATASET is not None:
+        return datasets.load_aliases(_DATASET[1])
+    try:
+        with open(MANUAL_ALIASES_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"provinces": {}, "districts": {}, "wards": {}}
+
+def _load_index() -> CompiledIndex:
+    """Load the compiled index, preferring the prebuilt shards shipped with the package.
+
+    The prebuilt shards are memory-mapped as long as their digest matches the
+    source JSON files; otherwise (e.g. in a source checkout) the index is
+    compiled in memory from the JSON files, one province at a time as they are
+    first used. Data set by ``load_mapping`` comes from its on-disk cache.
+    """
+    if _DATASET is not None:
+        return datasets.open_index(*_DATASET)
+    digest = source_digest(WARD_MAPPING_PATH, MANUAL_ALIASES_PATH)
+    try:
+        index = CompiledIndex.open(WARD_INDEX_PATH)
+    except (FileNotFoundError, ValueError):
+        index = None
+    if index is not None and index.digest != digest:
+        index.close()
+        index = None
+
+    if index is None:
+        with open(WARD_MAPPING_PATH, encoding='utf-8') as f:
+            mapping = json.load(f)
+        index = CompiledIndex.from_mapping(mapping, _load_manual_aliases(), digest)
+    return index
 
-def _get_manual_aliases():
-    global MANUAL_ALIASES
-    if MANUAL_ALIASES is None:
-        try:
-            with open(MANUAL_ALIASES_PATH, encoding='utf-8') as f:
-                MANUAL_ALIASES = json.load(f)
-        except FileNotFoundError:
-            MANUAL_ALIASES = {"provinces": {}, "districts": {}, "wards": {}}
-    return MANUAL_ALIASES
 
-_APOSTROPHE_CHARS = '\u2019\u2018\u02bc\u0060\u00b4\uff07'
-_APOSTROPHE_TABLE = str.maketrans(_APOSTROPHE_CHARS, "'" * len(_APOSTROPHE_CHARS))
+def _get_index() -> CompiledIndex:
+    """Return the global index, loading it exactly once even under concurrent first calls."""
+    global WARD_INDEX
+    index = WARD_INDEX
+    if index is None:
+        with _INDEX_LOCK:
+            if WARD_INDEX is None:
+                WARD_INDEX = _load_index()
+            index = WARD_INDEX
+    return index
 
 
-def _normalize_apostrophes(name: str) -> str:
-    return name.translate(_APOSTROPHE_TABLE)
+def reload_mapping() -> None:
+    """Drop the loaded index so that the next conversion reloads the mapping data.
+
+    The parse and convert caches are cleared as well.
+    """
+    global WARD_INDEX
+    with _INDEX_LOCK:
+        WARD_INDEX = None
+        cache_clear()
 
 
-def _accent_fold(s: str) -> str:
-    nfd = unicodedata.normalize("NFD", unicodedata.normalize("NFC", s))
-    return ''.join(c for c in nfd if unicodedata.category(c) != 'Mn').lower()
+def load_mapping(mapping_files: Iterable[str] = (), alias_files: Iterable[str] = (), *,
+                 builtin: bool = True, cache_dir: Optional[str] = None) -> None:
+    """Convert with your own mapping and alias files, in addition to or instead of the packaged ones.
 
+    Mapping files have the layout of ``ward_mapping.json`` and alias files the
+    layout of ``manual_aliases.json``; they are merged in order, after the
+    packaged files when ``builtin`` is true. A later mapping file adds wards
+    or replaces their conversion; a later alias file adds aliases.
 
-def normalize_alias(name: str, level: 'AddressLevel') -> str:
-    if level == AddressLevel.PROVINCE:
-        remove_words = ['thành phố', 'tỉnh']
-    elif level == AddressLevel.DISTRICT:
-        remove_words = ['thành phố', 'quận', 'huyện']
-    elif level == AddressLevel.WARD:
-        remove_words = ['phường', 'xã']
+    The first load compiles the merged data into an index under
+    ``cache_dir``; later loads of the same files, in any process, memory-map
+    it. The cache entry is keyed by the content of the files and the library
+    version, so editing a file or upgrading the library compiles a new one.
+    Call ``load_mapping()`` without files to go back to the packaged data.
+    The parse and convert caches are cleared.
+
+    Args:
+        mapping_files: Paths of the mapping files
+        alias_files: Paths of the alias files
+        builtin: Merge the files over the packaged mapping and aliases
+        cache_dir: Directory of the compiled indexes (defaults to
+            ``$VN_ADDRESS_CONVERTER_CACHE_DIR`` or ``~/.cache/vn-address-converter``)
+
+    Raises:
+        OSError: If a file cannot be read
+        ValueError: If a file is not valid JSON, a ward has no conversion,
+            or there is no mapping file at all
+    """
+    global WARD_INDEX, _DATASET
+    mapping_files = tuple(os.fspath(path) for path in mapping_files)
+    alias_files = tuple(os.fspath(path) for path in alias_files)
+    if not mapping_files and not alias_files and builtin:
+        dataset = None
     else:
-        remove_words = []
-    name = unicodedata.normalize("NFC", name)
-    name = _normalize_apostrophes(name)
-    pattern = r"^(%s)\s*" % "|".join([re.escape(w) for w in remove_words])  # <-- FIXED: single backslash
-    name = re.sub(pattern, '', name, flags=re.IGNORECASE).strip()
+        if builtin:
+            mapping_files = (WARD_MAPPING_PATH, *mapping_files)
+            if os.path.exists(MANUAL_ALIASES_PATH):
+                alias_files = (MANUAL_ALIASES_PATH, *alias_files)
+        if not mapping_files:
+            raise ValueError('No mapping file to load')
+        dataset = (mapping_files, alias_files, cache_dir)
 
-    # Handle leading zeros for numeric wards (e.g., "01" -> "1")
-    if level == AddressLevel.WARD and name.isdigit() and len(name) > 1 and name.startswith('0'):
-        name = str(int(name))
+    # Load before switching, so that conversions keep using the current data
+    # until the new index is ready and a bad file changes nothing
+    index = datasets.open_index(*dataset) if dataset is not None else None
+    with _INDEX_LOCK:
+        _DATASET = dataset
+        WARD_INDEX = index
+        cache_clear()
 
-    return name.lower()
 
-def get_aliases(name: str, level: 'AddressLevel') -> list[str]:
-    """Return list of aliases for given input name and level.
-    
+def warmup(provinces: Optional[list[str]] = None) -> None:
+    """Load the address index ahead of the first conversion.
+
+    Call this from an application factory (or before forking workers) so that
+    no request pays the loading cost. Safe to call from several threads and
+    more than once.
+
     Args:
-        name: The name to generate aliases for
-        level: The administrative level (province, district, ward)
-        
+        provinces: Old province names or aliases to load; every province is
+            loaded when omitted. Other provinces still load on first use.
+
+    Raises:
+        MappingMissingError: If one of ``provinces`` is not in the mapping
+    """
+    index = _get_index()
+    if provinces is None:
+        index.preload()
+        return
+
+    province_ids = []
+    for province in provinces:
+        province_id = _find(index, AddressLevel.PROVINCE, province)
+        if province_id is None:
+            raise MappingMissingError(AddressLevel.PROVINCE, province)
+        province_ids.append(province_id)
+    index.preload(province_ids)
+
+
+def prepare_for_fork() -> None:
+    """Load the whole index, then move every object out of the garbage collector's reach.
+
+    Call this in the parent of a prefork server (for example in the app
+    module with ``gunicorn --preload``) right before the workers are forked.
+    Lookups read the index through the memory-mapped (or, when compiled in
+    memory, immutable ``bytes``) buffers, so workers do not write to it.
+    ``gc.freeze()`` moves the objects that exist now to the permanent
+    generation, so that collections in the workers do not write to their
+    pages either, and the pages stay shared instead of being copied into
+    each worker.
+    """
+    _get_index().preload()
+    gc.collect()
+    gc.freeze()
+
+
+def preload_in_background() -> threading.Thread:
+    """Start a daemon thread that runs ``warmup()`` and return it.
+
+    Conversions made while it is still running simply wait for the index to be
+    ready. The package calls this at import time when the
+    ``VN_ADDRESS_CONVERTER_PRELOAD`` environment variable is set to ``1``.
+    """
+    thread = threading.Thread(target=warmup, name='vn-address-converter-preload', daemon=True)
+    thread.start()
+    return thread
+
+
+def memory_usage() -> dict[str, int]:
+    """Report the memory held by the address index, in bytes.
+
     Returns:
-        List of aliases including normalized alias, lowercased original name, and accent folded version
-    """
-    aliases = []
-    
-    # Add normalized alias (if not empty)
-    normalized = normalize_alias(name, level)
-    if normalized:
-        aliases.append(normalized)
-    
-    # Add lowercased original name
-    aliases.append(name.lower())
-    
-    # Add accent folded version (after NFC normalization)
-    nfc_normalized = unicodedata.normalize("NFC", name.lower())
-    accent_folded = unicodedata.normalize("NFD", nfc_normalized)
-    accent_folded = ''.join(c for c in accent_folded if unicodedata.category(c) != 'Mn')
-    accent_folded = accent_folded.lower()
-    if accent_folded and accent_folded not in aliases:
-        aliases.append(accent_folded)
-
-    # Add accent-folded version of normalized alias (without prefix)
-    if normalized:
-        normalized_folded = _accent_fold(normalized)
-        if normalized_folded and normalized_folded not in aliases:
-            aliases.append(normalized_folded)
-
-    return aliases
-
-def _get_ward_mapping():
-    global WARD_MAPPING
-    if WARD_MAPPING is None:
-        with open(WARD_MAPPING_PATH, encoding='utf-8') as f:
-            mapping = json.load(f)
-        
-        manual_aliases = _get_manual_aliases()
-        
-        province_aliases = {}
-        district_aliases = {}
-        ward_aliases = {}
-        
-        for prov_name, prov_val in mapping.items():
-            # Use get_aliases to get all aliases for this province
-            for alias in get_aliases(prov_name, AddressLevel.PROVINCE):
-                province_aliases[alias] = prov_name
-            
-            # Add manual province aliases
-            if prov_name in manual_aliases['provinces']:
-                for alias in manual_aliases['provinces'][prov_name]:
-                    province_aliases[alias.lower()] = prov_name
-            
-            district_aliases[prov_name] = {}
-            ward_aliases[prov_name] = {}
-            
-            for dist_name, dist_val in prov_val.items():
-                # Use get_aliases to get all aliases for this district
-                for alias in get_aliases(dist_name, AddressLevel.DISTRICT):
-                    district_aliases[prov_name][alias] = dist_name
-                
-                # Add manual district aliases
-                if (prov_name in manual_aliases['districts'] and 
-                    dist_name in manual_aliases['districts'][prov_name]):
-                    for alias in manual_aliases['districts'][prov_name][dist_name]:
-                        district_aliases[prov_name][alias.lower()] = dist_name
-                
-                ward_aliases[prov_name][dist_name] = {}
-                
-                for ward_name in dist_val:
-                    # Use get_aliases to get all aliases for this ward
-                    for alias in get_aliases(ward_name, AddressLevel.WARD):
-                        ward_aliases[prov_name][dist_name][alias] = ward_name
-                    
-                    # Add manual ward aliases
-                    if (prov_name in manual_aliases['wards'] and 
-                        dist_name in manual_aliases['wards'][prov_name] and
-                        ward_name in manual_aliases['wards'][prov_name][dist_name]):
-                        for alias in manual_aliases['wards'][prov_name][dist_name][ward_name]:
-                            ward_aliases[prov_name][dist_name][alias.lower()] = ward_name
-        
-        WARD_MAPPING = {
-            'mapping': mapping,
-            'province_aliases': province_aliases,
-            'district_aliases': district_aliases,
-            'ward_aliases': ward_aliases
-        }
-    return WARD_MAPPING
-
-
-def convert_to_new_address(address: Address) -> Address:
+        dict: ``index_bytes`` (size of the loaded index files), ``mapped`` (1
+        when they are memory-mapped and shared between processes),
+        ``provinces_loaded``, ``names_decoded`` and ``heap_bytes`` (memory
+        private to this process)
+    """
+    return _get_index().memory_usage()
+
+
+def _lookup_forms(level: AddressLevel, name: str) -> tuple[str, str]:
+    """Return the normalized alias of a name and its accent-folded form."""
+    key = (level, name)
+    forms = _LOOKUP_FORMS.get(key)
+    if forms is None:
+        normalized = normalize_alias(name, level)
+        forms = (normalized, _accent_fold(normalized))
+        if len(_LOOKUP_FORMS) >= _LOOKUP_FORMS_SIZE:
+            _LOOKUP_FORMS.clear()
+        _LOOKUP_FORMS[key] = forms
+    return forms
+
+
+def _find_tier(index: CompiledIndex, level: AddressLevel, name: str, parent: int = 0) -> tuple[Optional[int], int]:
+    """Look up a name by exact match, then by normalized alias, then by accent-folded alias.
+
+    Returns the id (None if not found) and the tier code that matched.
+    """
+    found = index.find(level, name, parent, exact=True)
+    if found is not None:
+        return found, _EXACT_TIER
+    normalized, folded = _lookup_forms(level, name)
+    tier = _NORMALIZED_TIER
+    entry = index.find_alias(level, normalized, parent)
+    if entry is None:
+        tier = _FOLDED_TIER
+        entry = index.find_alias(level, folded, parent)
+        if entry is None:
+            return None, _MISS_TIER
+    found, manual = entry
+    return found, _MANUAL_TIER if manual else tier
+
+
+def _find(index: CompiledIndex, level: AddressLevel, name: str, parent: int = 0) -> Optional[int]:
+    """Look up a name by exact match, then by normalized alias, then by accent-folded alias."""
+    return _find_tier(index, level, name, parent)[0]
+
+
+def _resolve(index: CompiledIndex, province: str, district: str, ward: str) -> tuple[ConversionStatus, Optional[int], tuple]:
+    """Resolve an old (province, district, ward) to a ward id without raising.
+
+    Also returns the tier code of each level looked up, in province, district,
+    ward order.
+    """
+    if not province or not ward:
+        return ConversionStatus.MISSING_COMPONENT, None, ()
+
+    province_id, province_tier = _find_tier(index, AddressLevel.PROVINCE, province)
+    if province_id is None:
+        return ConversionStatus.PROVINCE_NOT_FOUND, None, (province_tier,)
+
+    district_id, district_tier = _find_tier(index, AddressLevel.DISTRICT, district, province_id)
+    if district_id is None:
+        return ConversionStatus.DISTRICT_NOT_FOUND, None, (province_tier, district_tier)
+
+    ward_id, ward_tier = _find_tier(index, AddressLevel.WARD, ward, district_id)
+    tiers = (province_tier, district_tier, ward_tier)
+    if ward_id is None:
+        return ConversionStatus.WARD_NOT_FOUND, None, tiers
+    return ConversionStatus.OK, ward_id, tiers
+
+
+def _convert_key(province: str, district: str, ward: str,
+                 count: int = 1) -> tuple[ConversionStatus, Optional[str], Optional[str], tuple]:
+    """Return ``(status, new_ward, new_province, tiers)`` for an old key, through the convert cache.
+
+    The tiers are counted ``count`` times in the conversion statistics, once
+    per row that has the key.
+    """
+    key = (province, district, ward)
+    cached = CONVERT_CACHE.get(key)
+    if cached is None:
+        index = _get_index()
+        status, ward_id, tiers = _resolve(index, province, district, ward)
+        if status == ConversionStatus.OK:
+            cached = (status, *index.ward_target(ward_id), tiers)
+        else:
+            cached = (status, None, None, tiers)
+        CONVERT_CACHE.put(key, cached)
+    try:
+        counts = _STATS_LOCAL.counts
+    except AttributeError:
+        counts = _new_thread_counts()
+    tiers = cached[3]
+    counts[tiers] = counts.get(tiers, 0) + count
+    return cached
+
+
+def get_conversion_stats() -> dict[str, dict[str, int]]:
+    """Return how many lookups of each level matched at each tier.
+
+    Every conversion that reaches the lookups counts once per level it looks
+    up, whether or not its result came from the convert cache. Batch and
+    column conversions count every row, even though they look up each
+    distinct key only once. Tiers are
+    ``exact`` (the name as in the mapping), ``normalized`` (no prefix,
+    lowercase), ``folded`` (also without accents), ``manual`` (an alias from
+    ``manual_aliases.json``) and ``miss``. Levels after a miss are not
+    looked up.
+
+    Returns:
+        dict: ``{level: {tier: count}}`` for ``province``, ``district`` and ``ward``
+    """
+    merged = Counter()
+    with _STATS_LOCK:
+        merged.update(_RETIRED_COUNTS)
+        for holder in list(_THREAD_COUNTS):
+            merged.update(holder.counts.copy())
+    counts = [0] * (len(_STATS_LEVELS) * len(_TIERS))
+    for tiers, count in merged.items():
+        for level, tier in enumerate(tiers):
+            counts[level * len(_TIERS) + tier] += count
+    return {
+        level.value: {tier.value: counts[i * len(_TIERS) + j] for j, tier in enumerate(_TIERS)}
+        for i, level in enumerate(_STATS_LEVELS)
+    }
+
+
+def reset_conversion_stats() -> None:
+    """Set every conversion statistic back to zero.
+
+    Conversions running on other threads at the same time may still be counted.
+    """
+    with _STATS_LOCK:
+        _RETIRED_COUNTS.clear()
+        for holder in list(_THREAD_COUNTS):
+            holder.counts.clear()
+
+
+def _convert_outcome(province: str, district: str, ward: str, count: int = 1) -> tuple:
+    """Return the ``(status, ward, district, province)`` columns the ``count`` batch rows of a key convert to."""
+    if not district:
+        return ConversionStatus.UNCHANGED, ward, district, province
+    status, new_ward, new_province, _ = _convert_key(province, district, ward, count)
+    return status, new_ward, None, new_province
+
+
+def _status_error(status: ConversionStatus, address: Address) -> Exception:
+    """Return the exception ``convert_to_new_address`` raises for a failed status."""
+    if status == ConversionStatus.PROVINCE_NOT_FOUND:
+        return MappingMissingError(AddressLevel.PROVINCE, address.province)
+    if status == ConversionStatus.DISTRICT_NOT_FOUND:
+        return MappingMissingError(AddressLevel.DISTRICT, address.district)
+    if status == ConversionStatus.WARD_NOT_FOUND:
+        return MappingMissingError(AddressLevel.WARD, address.ward)
+    return ValueError('Missing province or ward in address')
+
+
+def convert_to_new_address(address: Address | FrozenAddress) -> Address | FrozenAddress:
+    """Convert an old address to the new administrative format.
+
+    A ``FrozenAddress`` input gives a ``FrozenAddress`` result, an ``Address``
+    input gives a new ``Address``.
+
+    Raises:
+        ValueError: If the province or ward is missing
+        MappingMissingError: If a component is not found in the mapping
+    """
     province = address.province
     district = address.district
     ward = address.ward
     street_address = address.street_address
+    frozen = isinstance(address, FrozenAddress)
 
     # If district is missing, this could be a new address format then return as is
     if not district:
-        return copy.copy(address)
-    
-    if not province or not ward:
-        raise ValueError('Missing province or ward in address')
-
-    mapping_obj = _get_ward_mapping()
-    mapping = mapping_obj['mapping']
-    province_aliases = mapping_obj['province_aliases']
-    district_aliases = mapping_obj['district_aliases']
-    ward_aliases = mapping_obj['ward_aliases']
-
-    province_norm = normalize_alias(province, AddressLevel.PROVINCE)
-    province_key = (province if province in mapping
-                    else province_aliases.get(province_norm)
-                    or province_aliases.get(_accent_fold(province_norm)))
-    if not province_key or province_key not in mapping:
-        raise MappingMissingError(AddressLevel.PROVINCE, province)
-    province_map = mapping[province_key]
-
-    district_norm = normalize_alias(district, AddressLevel.DISTRICT)
-    district_key = (district if district in province_map
-                    else district_aliases[province_key].get(district_norm)
-                    or district_aliases[province_key].get(_accent_fold(district_norm)))
-    if not district_key or district_key not in province_map:
-        raise MappingMissingError(AddressLevel.DISTRICT, district)
-    district_map = province_map[district_key]
-
-    ward_norm = normalize_alias(ward, AddressLevel.WARD)
-    ward_key = (ward if ward in district_map
-                else ward_aliases[province_key][district_key].get(ward_norm)
-                or ward_aliases[province_key][district_key].get(_accent_fold(ward_norm)))
-    if not ward_key or ward_key not in district_map:
-        raise MappingMissingError(AddressLevel.WARD, ward)
-    ward_map = district_map[ward_key]
-
-    new_province = ward_map['new_provine_name']
-    new_ward = ward_map['new_ward_name']
+        # Frozen addresses are immutable, so there is no need to copy them
+        return address if frozen else copy.copy(address)
+
+    status, new_ward, new_province, _ = _convert_key(province, district, ward)
+    if status != ConversionStatus.OK:
+        raise _status_error(status, address)
 
+    if frozen:
+        return FrozenAddress(street_address, new_ward, None, new_province)
     return Address(
         street_address=street_address,
         ward=new_ward,
         district=None,
         province=new_province
     )
+
+
+def convert_addresses_batch(addresses: Iterable[Address]) -> BatchResult:
+    """Convert many addresses, resolving each distinct (province, district, ward) once.
+
+    Real datasets repeat the same few thousand ward keys over and over, so
+    each distinct key is normalized and looked up a single time and its result
+    is reused for every row that has it. Unlike ``convert_to_new_address``
+    this never raises for a bad row; the outcome of each row is reported in
+    ``BatchResult.status``.
+
+    Args:
+        addresses: Addresses in the old format
+
+    Returns:
+        BatchResult: Converted columns and a status per input row
+    """
+    addresses = list(addresses)
+    # Resolve each distinct key once, counted once per row in the statistics
+    keys = Counter((address.province, address.district, address.ward) for address in addresses)
+    resolved = {key: _convert_outcome(*key, count) for key, count in keys.items()}
+    result = BatchResult()
+
+    for address in addresses:
+        status, ward, district, province = resolved[address.province, address.district, address.ward]
+        result.street_address.append(address.street_address)
+        result.ward.append(ward)
+        result.district.append(district)
+        result.province.append(province)
+        result.status.append(status)
+
+    return result
+
+
+def find_old_address(new_ward: str, new_province: Optional[str] = None) -> list[Address]:
+    """List the old wards that were merged into a new ward.
+
+    The new ward name is matched without accents or its "Phường"/"Xã"
+    prefix through the reverse index compiled with the forward one, so a
+    lookup does not depend on the size of the mapping. The mapping has no
+    administrative codes, so lookups are by name only.
+
+    Args:
+        new_ward: New ward name
+        new_province: New province name or alias, to tell apart new wards
+            of the same name in different provinces
+
+    Returns:
+        list[Address]: Old (ward, district, province) addresses, grouped by
+        new province; empty if no old ward maps to the name
+    """
+    index = _get_index()
+    rows = index.old_wards(new_ward)
+    if new_province is not None:
+        wanted = _accent_fold(normalize_alias(new_province, AddressLevel.PROVINCE))
+        province_id = _find(index, AddressLevel.PROVINCE, new_province)
+        alias_of = index.province_name(province_id) if province_id is not None else None
+        rows = [
+            row for row in rows
+            if row[1] == alias_of or _accent_fold(normalize_alias(row[1], AddressLevel.PROVINCE)) == wanted
+        ]
+
+    addresses = []
+    for _, _, ward_id in rows:
+        district_id = index.ward_district(ward_id)
+        addresses.append(Address(
+            ward=index.ward_name(ward_id),
+            district=index.district_name(district_id),
+            province=index.province_name(index.district_province(district_id)),
+        ))
+    return addresses
+
+
+def parse_and_convert(address_string: str, with_tiers: bool = False) -> ConversionResult:
+    """Parse an address string and convert it in one pass, without raising.
+
+    Gives the same address as ``convert_to_new_address(parse_address(s))``,
+    but the parsed components go straight from the parse cache to the convert
+    cache and the index, whose normalized and accent-folded lookup forms are
+    computed once per distinct component name.
+
+    Args:
+        address_string: Old address string, in any format ``parse_address`` accepts
+        with_tiers: Also set ``tiers`` on the result to the ``MatchTier`` of
+            each level looked up (empty when no lookup was needed)
+
+    Returns:
+        ConversionResult: The parsed components, the new address and the status;
+        bad input is reported in ``status`` instead of being raised
+    """
+    components = _parse_cached(address_string)
+    converted = _convert_key(components[3], components[2], components[1]) if components and components[2] else None
+    return _conversion_result(address_string, components, converted, with_tiers)
+
+
+def _parse_cached(address_string: str) -> Optional[tuple]:
+    """Return the parsed components of an address string, or None if it does not parse."""
+    components = PARSE_CACHE.get(address_string)
+    if components is None:
+        try:
+            components = _parse_components(address_string)
+        except ValueError:
+            return None
+        PARSE_CACHE.put(address_string, components)
+    return components
+
+
+def _conversion_result(address_string: str, components: Optional[tuple], converted: Optional[tuple],
+                       with_tiers: bool = False) -> ConversionResult:
+    """Build the result of ``parse_and_convert`` from the parsed components and their ``_convert_key``."""
+    if components is None:
+        return ConversionResult(address_string, None, None, ConversionStatus.PARSE_ERROR,
+                                {} if with_tiers else None)
+    street_address, ward, district, province = components
+    parsed = Address(street_address, ward, district, province)
+
+    # If district is missing, this could be a new address format then return as is
+    if not district:
+        return ConversionResult(address_string, parsed, Address(street_address, ward, district, province),
+                                ConversionStatus.UNCHANGED, {} if with_tiers else None)
+
+    status, new_ward, new_province, tier_codes = converted
+    tiers = {_STATS_LEVELS[i]: _TIERS[tier] for i, tier in enumerate(tier_codes)} if with_tiers else None
+    if status != ConversionStatus.OK:
+        return ConversionResult(address_string, parsed, None, status, tiers)
+    return ConversionResult(address_string, parsed, Address(street_address, new_ward, None, new_province), status,
+                            tiers)
+
+
+def _parse_and_convert_chunk(address_strings: list[str]) -> list[ConversionResult]:
+    """Parse and convert a list of address strings, without raising.
+
+    Like ``convert_addresses_batch``, each distinct string is parsed once and
+    each distinct (province, district, ward) is resolved once, counted once per
+    row in the statistics.
+    """
+    parsed = {address_string: _parse_cached(address_string) for address_string in dict.fromkeys(address_strings)}
+    keys = Counter((components[3], components[2], components[1])
+                   for components in map(parsed.__getitem__, address_strings) if components and components[2])
+    resolved = {key: _convert_key(*key, count) for key, count in keys.items()}
+    results = []
+    for address_string in address_strings:
+        components = parsed[address_string]
+        converted = resolved[components[3], components[2], components[1]] if components and components[2] else None
+        results.append(_conversion_result(address_string, components, converted))
+    return results
+
+
+def iter_parse_and_convert(address_strings: Iterable[str], chunk_size: int = 1024) -> Iterator[ConversionResult]:
+    """Lazily parse and convert a stream of address strings, in input order.
+
+    The input is consumed ``chunk_size`` strings at a time and each chunk is
+    converted as a batch: every distinct (province, district, ward) of the
+    chunk is resolved once, and only one chunk is held in memory however long
+    the stream is. Bad rows never raise; see ``ConversionResult.status``.
+
+    Args:
+        address_strings: Any iterable of address strings (a file, a cursor, a generator)
+        chunk_size: Number of strings parsed and converted together
+
+    Yields:
+        ConversionResult: One result per input string
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    iterator = iter(address_strings)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield from _parse_and_convert_chunk(chunk)
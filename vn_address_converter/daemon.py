@@ -0,0 +1,154 @@
+"""Long-lived conversion worker speaking a newline-delimited protocol.
+
+Each request is one line holding a raw address string (UTF-8). Each response
+is one line, in request order: ``<status>\\t<new address>`` in the ``tsv``
+format (the address is empty when the conversion failed) or a JSON object in
+the ``json`` format. Clients may pipeline any number of requests without
+waiting for responses; all complete lines received in one read are converted
+as a single batch and answered with a single write.
+
+A line longer than ``MAX_LINE_BYTES`` is not converted. It is answered with
+``error\t<message>`` (``{"status": "error", "error": "<message>"}`` in the
+``json`` format), and the rest of it is skipped without being buffered.
+
+Run it over stdin/stdout (``vn-address-converter daemon``) or on a Unix
+domain socket (``vn-address-converter daemon --socket /run/vnaddr.sock``).
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+from typing import Callable, Optional
+
+from .converter import _parse_and_convert_chunk, warmup
+
+READ_SIZE = 65536
+MAX_LINE_BYTES = 65536
+FORMATS = ('tsv', 'json')
+
+_LINE_TOO_LONG = f'Line longer than {MAX_LINE_BYTES} bytes'
+
+
+def _respond(lines: list[Optional[bytes]], fmt: str) -> bytes:
+    """Convert request lines into the response lines, as one block of bytes.
+
+    ``None`` stands for a line that was too long; it is answered with an error.
+    """
+    accepted = [line for line in lines if line is not None]
+    results = iter(_parse_and_convert_chunk([line.decode('utf-8', 'replace').rstrip('\r') for line in accepted]))
+    out = []
+    for line in lines:
+        if line is None:
+            if fmt == 'json':
+                out.append(json.dumps({'status': 'error', 'error': _LINE_TOO_LONG}))
+            else:
+                out.append(f'error\t{_LINE_TOO_LONG}')
+            continue
+        result = next(results)
+        if fmt == 'json':
+            out.append(json.dumps(result.to_dict(), ensure_ascii=False))
+        else:
+            address = result.address.format().replace('\t', ' ') if result.address else ''
+            out.append(f'{result.status.value}\t{address}')
+    out.append('')
+    return '\n'.join(out).encode('utf-8')
+
+
+def serve_stream(read: Callable[[int], bytes], write: Callable[[bytes], None], fmt: str = 'tsv') -> int:
+    """Answer requests from ``read`` on ``write`` until end of input.
+
+    Args:
+        read: Returns up to the given number of bytes, or ``b''`` at end of input
+        write: Writes (and flushes) one block of response bytes
+        fmt: Response format, ``tsv`` or ``json``
+
+    Returns:
+        int: Number of requests answered
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    answered = 0
+    buffer = b''
+    # Skipping the rest of a line that was already answered as too long
+    skipping = False
+    while True:
+        data = read(READ_SIZE)
+        if not data:
+            break
+        if skipping:
+            newline = data.find(b'\n')
+            if newline == -1:
+                continue
+            data = data[newline + 1:]
+            skipping = False
+        buffer += data
+        *complete, buffer = buffer.split(b'\n')
+        lines: list[Optional[bytes]] = [None if len(line) > MAX_LINE_BYTES else line for line in complete]
+        if len(buffer) > MAX_LINE_BYTES:
+            lines.append(None)
+            buffer = b''
+            skipping = True
+        if lines:
+            write(_respond(lines, fmt))
+            answered += len(lines)
+    # A final request without a trailing newline
+    if buffer:
+        write(_respond([buffer], fmt))
+        answered += 1
+    return answered
+
+
+def serve_stdio(fmt: str = 'tsv') -> int:
+    """Serve requests from stdin, answering on stdout."""
+    warmup()
+    stdout = sys.stdout.buffer
+
+    def write(data: bytes) -> None:
+        stdout.write(data)
+        stdout.flush()
+
+    return serve_stream(lambda size: os.read(sys.stdin.fileno(), size), write, fmt)
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, fmt: str):
+        self.fmt = fmt
+        super().__init__(path, _StreamHandler)
+
+
+class _StreamHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        sock: socket.socket = self.request
+        try:
+            serve_stream(sock.recv, sock.sendall, self.server.fmt)
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+
+
+def make_unix_server(path: str, fmt: str = 'tsv') -> socketserver.ThreadingUnixStreamServer:
+    """Create a server on the Unix domain socket ``path``, one thread per connection.
+
+    A stale socket file left at ``path`` is replaced.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    warmup()
+    if os.path.exists(path):
+        os.unlink(path)
+    return _UnixServer(path, fmt)
+
+
+def serve_unix(path: str, fmt: str = 'tsv') -> None:
+    """Serve requests on the Unix domain socket ``path`` until interrupted."""
+    server = make_unix_server(path, fmt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
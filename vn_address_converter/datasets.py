@@ -0,0 +1,185 @@
+"""User-supplied mapping and alias files, compiled once and cached on disk.
+
+Mapping files have the layout of ``ward_mapping.json`` and alias files the
+layout of ``manual_aliases.json``. Several files are merged in order: a later
+mapping file adds provinces, districts and wards or replaces the conversion
+of a ward, and a later alias file adds aliases.
+
+The merged data is compiled into the same sharded index the package ships
+and written under the cache directory, in a directory named after a digest
+of the library version, the index format version and the content of every
+input file. Later loads of the same files memory-map it directly. Changing a
+file or upgrading the library changes the digest, so a stale index is never
+used; old directories can be deleted at any time.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional, Sequence
+
+from .index import FORMAT_VERSION, CompiledIndex, write_index
+
+CACHE_DIR_ENV_VAR = 'VN_ADDRESS_CONVERTER_CACHE_DIR'
+
+_WARD_FIELDS = ('new_ward_name', 'new_provine_name')
+
+
+def default_cache_dir() -> str:
+    """Return ``$VN_ADDRESS_CONVERTER_CACHE_DIR``, or ``vn-address-converter`` in the user cache directory."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir:
+        return cache_dir
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'vn-address-converter')
+
+
+def _empty_aliases() -> dict:
+    return {"provinces": {}, "districts": {}, "wards": {}}
+
+
+def _require_dict(value, path: str, what: str) -> dict:
+    if not isinstance(value, dict):
+        raise ValueError(f'{path}: {what} must be an object, not {type(value).__name__}')
+    return value
+
+
+def _merge_mapping(merged: dict, mapping: dict, path: str) -> None:
+    for province, districts in _require_dict(mapping, path, 'the mapping').items():
+        for district, wards in _require_dict(districts, path, province).items():
+            _require_dict(wards, path, f'{district}, {province}')
+            target = merged.setdefault(province, {}).setdefault(district, {})
+            for ward, conversion in wards.items():
+                if not isinstance(conversion, dict) or any(field not in conversion for field in _WARD_FIELDS):
+                    raise ValueError(f'{path}: {ward}, {district}, {province} needs '
+                                     f'{" and ".join(_WARD_FIELDS)}')
+                target[ward] = conversion
+
+
+def _extend(merged: dict, key: str, aliases: list[str]) -> None:
+    existing = merged.setdefault(key, [])
+    existing.extend(alias for alias in aliases if alias not in existing)
+
+
+def _require_names(names, path: str, what: str) -> list[str]:
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError(f'{path}: the aliases of {what} must be a list of strings')
+    return names
+
+
+def _merge_aliases(merged: dict, aliases: dict, path: str) -> None:
+    _require_dict(aliases, path, 'the aliases')
+    for province, names in _require_dict(aliases.get('provinces', {}), path, 'provinces').items():
+        _extend(merged['provinces'], province, _require_names(names, path, province))
+    for province, districts in _require_dict(aliases.get('districts', {}), path, 'districts').items():
+        for district, names in _require_dict(districts, path, province).items():
+            _extend(merged['districts'].setdefault(province, {}), district,
+                    _require_names(names, path, f'{district}, {province}'))
+    for province, districts in _require_dict(aliases.get('wards', {}), path, 'wards').items():
+        for district, wards in _require_dict(districts, path, province).items():
+            for ward, names in _require_dict(wards, path, f'{district}, {province}').items():
+                _require_names(names, path, f'{ward}, {district}, {province}')
+                _extend(merged['wards'].setdefault(province, {}).setdefault(district, {}), ward, names)
+
+
+def _read(paths: Sequence[str]) -> list[tuple[str, bytes]]:
+    documents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            documents.append((path, f.read()))
+    return documents
+
+
+def _digest(mapping_files: list[tuple[str, bytes]], alias_files: list[tuple[str, bytes]]) -> bytes:
+    """Identify the content of the files together with the library and index format versions."""
+    from . import __version__
+
+    digest = hashlib.sha256(f'vn-address-converter {__version__} index {FORMAT_VERSION}\n'.encode())
+    for files in (mapping_files, alias_files):
+        digest.update(len(files).to_bytes(8, 'little'))
+        for _, data in files:
+            digest.update(len(data).to_bytes(8, 'little'))
+            digest.update(data)
+    return digest.digest()
+
+
+def _merge(mapping_files: list[tuple[str, bytes]], alias_files: list[tuple[str, bytes]]) -> tuple[dict, dict]:
+    mapping: dict = {}
+    for path, data in mapping_files:
+        _merge_mapping(mapping, json.loads(data), path)
+    aliases = _empty_aliases()
+    for path, data in alias_files:
+        _merge_aliases(aliases, json.loads(data), path)
+    return mapping, aliases
+
+
+def load_aliases(alias_paths: Sequence[str]) -> dict:
+    """Return the merged content of the given alias files."""
+    aliases = _empty_aliases()
+    for path in alias_paths:
+        with open(path, encoding='utf-8') as f:
+            _merge_aliases(aliases, json.load(f), path)
+    return aliases
+
+
+def _open_cached(directory: str, digest: bytes) -> Optional[CompiledIndex]:
+    try:
+        index = CompiledIndex.open(directory)
+    except (OSError, ValueError):
+        return None
+    if index.digest != digest:
+        index.close()
+        return None
+    return index
+
+
+def open_index(mapping_paths: Sequence[str], alias_paths: Sequence[str],
+               cache_dir: Optional[str] = None) -> CompiledIndex:
+    """Return the index of the given files, compiling it into the cache on the first load.
+
+    If the cache directory cannot be written, the index is compiled in memory
+    instead.
+
+    Args:
+        mapping_paths: Mapping files, merged in order
+        alias_paths: Alias files, merged in order
+        cache_dir: Cache directory (defaults to ``default_cache_dir()``)
+
+    Raises:
+        ValueError: If a file is not valid JSON, does not have the layout of its
+            kind or a ward has no conversion
+    """
+    mapping_files, alias_files = _read(mapping_paths), _read(alias_paths)
+    digest = _digest(mapping_files, alias_files)
+    cache_dir = cache_dir or default_cache_dir()
+    directory = os.path.join(cache_dir, digest.hex())
+    index = _open_cached(directory, digest)
+    if index is not None:
+        return index
+    import shutil
+    import tempfile
+
+    # An entry that exists but does not open was left broken
+    broken = os.path.isdir(directory)
+    mapping, aliases = _merge(mapping_files, alias_files)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Compile next to the final directory and rename it into place, so
+        # that concurrent loads never see a partial index
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=cache_dir)
+    except OSError:
+        return CompiledIndex.from_mapping(mapping, aliases, digest)
+    try:
+        write_index(mapping, aliases, digest, tmp_dir)
+        if broken:
+            shutil.rmtree(directory, ignore_errors=True)
+        os.rename(tmp_dir, directory)
+    except OSError:
+        # Another process renamed its copy first, or the cache is full
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    index = _open_cached(directory, digest)
+    if index is None:
+        index = CompiledIndex.from_mapping(mapping, aliases, digest)
+    return index
+
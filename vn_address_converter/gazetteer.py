@@ -0,0 +1,300 @@
+"""Find administrative unit names in free text with one Aho-Corasick automaton.
+
+The automaton holds every province, district and ward name of the mapping,
+their prefix-less forms, common abbreviations (``P.``, ``Q.``, ``TP.``) and the
+manual aliases, all accent-folded. The text is folded character by character
+so that match offsets map back to the original string, and it is scanned once
+whatever its length. Matches must start and end on word boundaries.
+
+``find_mentions`` returns every match; ``extract_addresses`` keeps the ward
+mentions followed by a district (and optionally a province) of the same
+hierarchy and converts them.
+"""
+
+import bisect
+import re
+import threading
+from collections import defaultdict
+from typing import Iterator, Optional
+
+from .converter import _get_index, _load_manual_aliases
+from .index import CompiledIndex
+from .models import Address, AddressLevel, ExtractedAddress, Mention
+from .normalize import _accent_fold
+
+# Largest number of characters allowed between a ward and its district, and
+# between a district and its province
+DEFAULT_MAX_GAP = 40
+
+_LEVELS = (AddressLevel.PROVINCE, AddressLevel.DISTRICT, AddressLevel.WARD)
+# Prefixes of official names (folded) and the abbreviations they are written as
+_ABBREVIATIONS = {
+    'thanh pho ': ('tp. ', 'tp.', 'tp '),
+    'tinh ': ('t. ',),
+    'quan ': ('q. ', 'q.', 'q '),
+    'huyen ': ('h. ', 'h.'),
+    'thi xa ': ('tx. ', 'tx.', 'tx '),
+    'phuong ': ('p. ', 'p.', 'p '),
+    'thi tran ': ('tt. ', 'tt.', 'tt '),
+}
+_COMPACT = {'quan ': 'q', 'phuong ': 'p'}
+_MIN_BARE_LENGTH = 4
+
+_AUTOMATON: Optional['_Automaton'] = None
+_AUTOMATON_OWNER: Optional[CompiledIndex] = None
+_AUTOMATON_LOCK = threading.Lock()
+
+
+_FOLDED_CHARS: dict[str, str] = {}
+
+
+def _fold_char(c: str) -> str:
+    folded = _FOLDED_CHARS.get(c)
+    if folded is None:
+        folded = _FOLDED_CHARS[c] = _accent_fold(c).replace('đ', 'd')
+    return folded
+
+
+def _fold(text: str) -> str:
+    return re.sub(r'\s+', ' ', _accent_fold(text).replace('đ', 'd')).strip()
+
+
+def _fold_with_offsets(text: str) -> tuple[str, list[int]]:
+    """Fold ``text`` keeping, for each folded character, the offset of its source character."""
+    chars: list[str] = []
+    offsets: list[int] = []
+    for i, c in enumerate(text):
+        for x in _fold_char(c):
+            chars.append(x)
+            offsets.append(i)
+    return ''.join(chars), offsets
+
+
+def _patterns(name: str) -> set[str]:
+    """Return the folded forms a name may be written as."""
+    folded = _fold(name)
+    patterns = {folded}
+    for prefix, abbreviations in _ABBREVIATIONS.items():
+        if folded.startswith(prefix):
+            rest = folded[len(prefix):]
+            patterns.update(abbreviation + rest for abbreviation in abbreviations)
+            if prefix in _COMPACT and rest.isdigit():
+                patterns.add(_COMPACT[prefix] + rest)
+            # Bare names like "ben nghe"; short or numeric ones are too ambiguous
+            if len(rest) >= _MIN_BARE_LENGTH and not rest.isdigit():
+                patterns.add(rest)
+            break
+    return patterns
+
+
+class _Automaton:
+    """Aho-Corasick automaton; each pattern carries ``(level, id)`` payloads."""
+
+    def __init__(self) -> None:
+        self.goto: dict[tuple[int, str], int] = {}
+        self.children: list[list[str]] = [[]]
+        self.fail: list[int] = [0]
+        self.depth: list[int] = [0]
+        self.out: list[Optional[tuple]] = [None]
+        self.link: list[int] = [0]
+
+    def build(self, patterns: dict[str, list[tuple[AddressLevel, int]]]) -> None:
+        for pattern, payload in patterns.items():
+            state = 0
+            for c in pattern:
+                child = self.goto.get((state, c))
+                if child is None:
+                    child = len(self.fail)
+                    self.goto[(state, c)] = child
+                    self.children[state].append(c)
+                    self.children.append([])
+                    self.fail.append(0)
+                    self.depth.append(self.depth[state] + 1)
+                    self.out.append(None)
+                    self.link.append(0)
+                state = child
+            self.out[state] = tuple(payload)
+
+        # Breadth-first: fail links, and output links to the nearest suffix state with payloads
+        queue = [self.goto[(0, c)] for c in self.children[0]]
+        for state in queue:
+            for c in self.children[state]:
+                child = self.goto[(state, c)]
+                fallback = self.fail[state]
+                while fallback and (fallback, c) not in self.goto:
+                    fallback = self.fail[fallback]
+                target = self.goto.get((fallback, c), 0)
+                self.fail[child] = target if target != child else 0
+                self.link[child] = target if self.out[target] is not None else self.link[target]
+                queue.append(child)
+
+    def iter(self, text: str) -> Iterator[tuple[int, int, tuple]]:
+        """Yield ``(start, end, payload)`` for every occurrence of every pattern."""
+        goto, fail, out, link, depth = self.goto, self.fail, self.out, self.link, self.depth
+        state = 0
+        for i, c in enumerate(text):
+            while state and (state, c) not in goto:
+                state = fail[state]
+            state = goto.get((state, c), 0)
+            node = state if out[state] is not None else link[state]
+            while node:
+                yield i + 1 - depth[node], i + 1, out[node]
+                node = link[node]
+
+
+def _build(index: CompiledIndex) -> _Automaton:
+    patterns: dict[str, list[tuple[AddressLevel, int]]] = defaultdict(list)
+    manual = _load_manual_aliases()
+
+    def add(level: AddressLevel, entity_id: int, names: list[str]) -> None:
+        for name in names:
+            for pattern in _patterns(name):
+                if pattern:
+                    patterns[pattern].append((level, entity_id))
+
+    for province_id in range(index.num_provinces):
+        province = index.province_name(province_id)
+        add(AddressLevel.PROVINCE, province_id, [province, *manual['provinces'].get(province, [])])
+        manual_districts = manual['districts'].get(province, {})
+        manual_wards = manual['wards'].get(province, {})
+        for district_id in index.districts(province_id):
+            district = index.district_name(district_id)
+            add(AddressLevel.DISTRICT, district_id, [district, *manual_districts.get(district, [])])
+            manual_district_wards = manual_wards.get(district, {})
+            for ward_id in index.wards(district_id):
+                ward = index.ward_name(ward_id)
+                add(AddressLevel.WARD, ward_id, [ward, *manual_district_wards.get(ward, [])])
+
+    automaton = _Automaton()
+    automaton.build(patterns)
+    return automaton
+
+
+def _get_automaton() -> tuple[CompiledIndex, _Automaton]:
+    """Return the automaton of the current index, building it on first use (it loads every shard)."""
+    global _AUTOMATON, _AUTOMATON_OWNER
+    index = _get_index()
+    with _AUTOMATON_LOCK:
+        if _AUTOMATON_OWNER is not index:
+            _AUTOMATON = _build(index)
+            _AUTOMATON_OWNER = index
+        return index, _AUTOMATON
+
+
+def _matches(text: str) -> list[tuple[int, int, AddressLevel, tuple[int, ...]]]:
+    """Return ``(start, end, level, ids)`` for every match on word boundaries, by position."""
+    _, automaton = _get_automaton()
+    folded, offsets = _fold_with_offsets(text)
+    found = []
+    for start, end, payload in automaton.iter(folded):
+        if start > 0 and folded[start - 1].isalnum():
+            continue
+        if end < len(folded) and folded[end].isalnum() and folded[end - 1].isalnum():
+            continue
+        by_level = defaultdict(list)
+        for level, entity_id in payload:
+            by_level[level].append(entity_id)
+        for level, ids in by_level.items():
+            found.append((offsets[start], offsets[end - 1] + 1, level, tuple(ids)))
+    found.sort(key=lambda match: (match[0], -match[1]))
+    return found
+
+
+def _name(index: CompiledIndex, level: AddressLevel, entity_id: int) -> str:
+    if level == AddressLevel.PROVINCE:
+        return index.province_name(entity_id)
+    if level == AddressLevel.DISTRICT:
+        return index.district_name(entity_id)
+    return index.ward_name(entity_id)
+
+
+def _mention(index: CompiledIndex, text: str, match: tuple) -> Mention:
+    start, end, level, ids = match
+    names = tuple(dict.fromkeys(_name(index, level, entity_id) for entity_id in ids))
+    return Mention(start, end, level, text[start:end], names)
+
+
+def find_mentions(text: str) -> list[Mention]:
+    """Find every province, district and ward name or alias in ``text``.
+
+    Overlapping mentions are all returned (e.g. "Quận Bình Thạnh" is a district
+    mention and contains the ward-level name "Bình Thạnh" of other places),
+    ordered by start offset, longest first.
+
+    The automaton is built from the whole mapping on the first call.
+    """
+    index, _ = _get_automaton()
+    return [_mention(index, text, match) for match in _matches(text)]
+
+
+def extract_addresses(text: str, max_gap: int = DEFAULT_MAX_GAP) -> list[ExtractedAddress]:
+    """Find old addresses in free text and convert them.
+
+    A ward mention is kept when a mention of its district follows it within
+    ``max_gap`` characters; a mention of its province following the district
+    is attached when there is one. When several wards or districts could be
+    meant, the one whose province is also mentioned wins. Extracted addresses
+    do not overlap.
+
+    Args:
+        text: Any text, e.g. a delivery note
+        max_gap: Largest number of characters between a ward and its district,
+            and between a district and its province
+
+    Returns:
+        list[ExtractedAddress]: In order of appearance
+    """
+    index, _ = _get_automaton()
+    matches = _matches(text)
+    # Matches are sorted by start, so the ones starting in a window are a slice
+    districts = [m for m in matches if m[2] == AddressLevel.DISTRICT]
+    provinces = [m for m in matches if m[2] == AddressLevel.PROVINCE]
+    district_starts = [m[0] for m in districts]
+    province_starts = [m[0] for m in provinces]
+
+    def window(found: list, starts: list[int], end: int) -> list:
+        return found[bisect.bisect_left(starts, end):bisect.bisect_right(starts, end + max_gap)]
+
+    extracted = []
+    last_end = 0
+    for ward in matches:
+        if ward[2] != AddressLevel.WARD or ward[0] < last_end:
+            continue
+        best = None
+        for district in window(districts, district_starts, ward[1]):
+            district_ids = set(district[3])
+            for ward_id in ward[3]:
+                district_id = index.ward_district(ward_id)
+                if district_id not in district_ids:
+                    continue
+                province_id = index.district_province(district_id)
+                province = next((p for p in window(provinces, province_starts, district[1])
+                                 if province_id in p[3]), None)
+                # Prefer a mentioned province, then the nearest and longest district
+                rank = (province is not None, -district[0], district[1])
+                if best is None or rank > best[0]:
+                    best = (rank, ward_id, district, province)
+        if best is None:
+            continue
+
+        _, ward_id, district, province = best
+        if province is None and len({index.district_province(index.ward_district(w)) for w in ward[3]
+                                     if index.ward_district(w) in district[3]}) > 1:
+            # Without a province the district name is ambiguous
+            continue
+        district_id = index.ward_district(ward_id)
+        new_ward, new_province = index.ward_target(ward_id)
+        end = (province or district)[1]
+        extracted.append(ExtractedAddress(
+            start=ward[0],
+            end=end,
+            ward=_mention(index, text, (*ward[:3], (ward_id,))),
+            district=_mention(index, text, (*district[:3], (district_id,))),
+            province=None if province is None else _mention(
+                index, text, (*province[:3], (index.district_province(district_id),))),
+            address=Address(None, index.ward_name(ward_id), index.district_name(district_id),
+                            index.province_name(index.district_province(district_id))),
+            new_address=Address(None, new_ward, None, new_province),
+        ))
+        last_end = end
+    return extracted
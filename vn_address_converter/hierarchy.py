@@ -0,0 +1,200 @@
+"""Sorted listings of the administrative hierarchy and prefix autocomplete.
+
+Listings and completion tables are built once per scope from the compiled
+index and kept sorted by accent-folded name, so a listing is a copy of a
+cached list and a completion is a binary search for the prefix followed by a
+short scan. Completion keys are the folded full names and the folded names
+without their administrative prefix, so "ben" completes "Phường Bến Nghé".
+"""
+
+import bisect
+import re
+import threading
+from typing import Optional
+
+from .converter import _find, _get_index
+from .index import CompiledIndex
+from .models import AddressLevel, Completion, MappingMissingError
+from .normalize import _accent_fold
+
+_PREFIX = re.compile(r'^(?:thanh pho|tinh|quan|huyen|thi xa|thi tran|phuong|xa) ')
+_NUMBER = re.compile(r'\d+')
+_LEVEL_ORDER = {AddressLevel.PROVINCE: 0, AddressLevel.DISTRICT: 1, AddressLevel.WARD: 2}
+
+_TABLES: dict[tuple, object] = {}
+_TABLES_OWNER: Optional[CompiledIndex] = None
+_TABLES_LOCK = threading.Lock()
+
+
+def _fold(name: str) -> str:
+    return _accent_fold(name).replace('đ', 'd')
+
+
+def _sort_key(name: str) -> tuple[str, str, str]:
+    """Sort by the folded name without its administrative prefix ("Tỉnh An Giang" under A),
+    with numbers in numeric order ("Phường 2" before "Phường 10")."""
+    folded = _NUMBER.sub(lambda m: m.group().zfill(8), _fold(name))
+    return _PREFIX.sub('', folded), folded, name
+
+
+def _cached(key: tuple, build):
+    """Return the table cached under ``key`` for the current index, building it on first use."""
+    global _TABLES_OWNER
+    index = _get_index()
+    with _TABLES_LOCK:
+        if _TABLES_OWNER is not index:
+            _TABLES.clear()
+            _TABLES_OWNER = index
+        table = _TABLES.get(key)
+    if table is None:
+        table = build(index)
+        with _TABLES_LOCK:
+            if _TABLES_OWNER is index:
+                table = _TABLES.setdefault(key, table)
+    return table
+
+
+def _province_id(index: CompiledIndex, province: str) -> int:
+    province_id = _find(index, AddressLevel.PROVINCE, province)
+    if province_id is None:
+        raise MappingMissingError(AddressLevel.PROVINCE, province)
+    return province_id
+
+
+def _district_id(index: CompiledIndex, province: str, district: str) -> int:
+    district_id = _find(index, AddressLevel.DISTRICT, district, _province_id(index, province))
+    if district_id is None:
+        raise MappingMissingError(AddressLevel.DISTRICT, district)
+    return district_id
+
+
+def list_provinces() -> list[str]:
+    """Return the old province names, sorted alphabetically ignoring accents and prefixes."""
+    return list(_cached(('provinces',), lambda index: sorted(
+        (index.province_name(i) for i in range(index.num_provinces)), key=_sort_key)))
+
+
+def list_districts_by_province(province: str) -> list[str]:
+    """Return the old district names of a province, sorted alphabetically ignoring accents and prefixes.
+
+    Args:
+        province: Old province name or alias
+
+    Raises:
+        MappingMissingError: If the province is not in the mapping
+    """
+    province_id = _province_id(_get_index(), province)
+    return list(_cached(('districts', province_id), lambda index: sorted(
+        (index.district_name(i) for i in index.districts(province_id)), key=_sort_key)))
+
+
+def list_wards_by_district(province: str, district: str) -> list[str]:
+    """Return the old ward names of a district, sorted alphabetically ignoring accents and prefixes.
+
+    Args:
+        province: Old province name or alias
+        district: Old district name or alias within the province
+
+    Raises:
+        MappingMissingError: If the province or the district is not in the mapping
+    """
+    district_id = _district_id(_get_index(), province, district)
+    return list(_cached(('wards', district_id), lambda index: sorted(
+        (index.ward_name(i) for i in index.wards(district_id)), key=_sort_key)))
+
+
+def _completion_table(index: CompiledIndex, province_ids: range, district_ids: Optional[range],
+                      include_provinces: bool) -> dict[Optional[AddressLevel], tuple[list[str], list[Completion]]]:
+    """Return the sorted keys and completions of a scope, for every level together (``None``) and
+    for each level alone, so that a completion restricted to a level never scans the other levels."""
+    completions: list[Completion] = []
+    new_wards: dict[tuple[str, str], Completion] = {}
+    new_provinces: dict[str, Completion] = {}
+    for province_id in province_ids:
+        province = index.province_name(province_id)
+        if include_provinces:
+            completions.append(Completion(province, AddressLevel.PROVINCE, False))
+        for district_id in district_ids if district_ids is not None else index.districts(province_id):
+            district = index.district_name(district_id)
+            if district_ids is None:
+                completions.append(Completion(district, AddressLevel.DISTRICT, False, province))
+            for ward_id in index.wards(district_id):
+                completions.append(Completion(index.ward_name(ward_id), AddressLevel.WARD, False, province, district))
+                new_ward, new_province = index.ward_target(ward_id)
+                if (new_ward, new_province) not in new_wards:
+                    new_wards[new_ward, new_province] = Completion(new_ward, AddressLevel.WARD, True, new_province)
+                if include_provinces and new_province not in new_provinces:
+                    new_provinces[new_province] = Completion(new_province, AddressLevel.PROVINCE, True)
+    completions += new_wards.values()
+    completions += new_provinces.values()
+
+    rows = []
+    for i, completion in enumerate(completions):
+        folded = _fold(completion.name)
+        order = (_LEVEL_ORDER[completion.level], completion.name)
+        rows.append((folded, order, i))
+        bare = _PREFIX.sub('', folded)
+        if bare != folded:
+            rows.append((bare, order, i))
+    rows.sort()
+    tables = {None: ([key for key, _, _ in rows], [completions[i] for _, _, i in rows])}
+    for level in _LEVEL_ORDER:
+        level_rows = [row for row in rows if completions[row[2]].level == level]
+        tables[level] = ([key for key, _, _ in level_rows], [completions[i] for _, _, i in level_rows])
+    return tables
+
+
+def autocomplete(prefix: str, level: Optional[AddressLevel] = None, province: Optional[str] = None,
+                 district: Optional[str] = None, limit: int = 10) -> list[Completion]:
+    """Complete a typed prefix to old and new province, district and ward names.
+
+    Matching ignores case and accents, and a prefix may skip the
+    administrative prefix of a name ("ben" completes "Phường Bến Nghé").
+
+    Args:
+        prefix: The text typed so far
+        level: Only complete names of this level
+        province: Only complete the districts and wards of this old province
+            (and the new wards they were merged into)
+        district: With ``province``, only complete the wards of this district
+        limit: Maximum number of completions
+
+    Returns:
+        list[Completion]: Ordered by folded name, provinces before districts
+        before wards for equal names
+
+    Raises:
+        MappingMissingError: If ``province`` or ``district`` is not in the mapping
+    """
+    index = _get_index()
+    if district is not None:
+        if province is None:
+            raise ValueError('district requires province')
+        district_id = _district_id(index, province, district)
+        province_id = index.district_province(district_id)
+        scope = ('complete', province_id, district_id)
+        build = lambda index: _completion_table(  # noqa: E731
+            index, range(province_id, province_id + 1), range(district_id, district_id + 1), False)
+    elif province is not None:
+        province_id = _province_id(index, province)
+        scope = ('complete', province_id)
+        build = lambda index: _completion_table(  # noqa: E731
+            index, range(province_id, province_id + 1), None, False)
+    else:
+        scope = ('complete',)
+        build = lambda index: _completion_table(index, range(index.num_provinces), None, True)  # noqa: E731
+    keys, completions = _cached(scope, build)[level]
+
+    key = ' '.join(_fold(prefix).split())
+    found: list[Completion] = []
+    seen: set[int] = set()
+    for i in range(bisect.bisect_left(keys, key), len(keys)):
+        if not keys[i].startswith(key):
+            break
+        completion = completions[i]
+        if id(completion) not in seen:
+            seen.add(id(completion))
+            found.append(completion)
+            if len(found) >= limit:
+                break
+    return found
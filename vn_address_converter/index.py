@@ -0,0 +1,569 @@
+"""Compiled, memory-mappable index of the ward mapping and its aliases.
+
+The index is compiled from ``ward_mapping.json`` and ``manual_aliases.json``
+into flat binary files that ship in the wheel.  At runtime the files are
+memory-mapped and queried in place: opening them costs one ``mmap`` call
+instead of a JSON parse plus the alias expansion, and every process on a host
+shares the same physical pages.
+
+The index is sharded by old province.  ``root.bin`` holds the province names
+and aliases and the reverse index from new wards to old wards, and is loaded
+eagerly; ``<province id>.bin`` holds the districts,
+wards and their aliases of one province and is only loaded the first time an
+address in that province resolves.  Every file is (little-endian)::
+
+    header    magic, format version, kind, source digest, province count or id
+    segment   record tables, an open-addressing hash table of
+              ``(scope, key) -> id`` entries and a string pool
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+import zlib
+from array import array
+from typing import Callable, Optional
+
+from .models import AddressLevel
+from .normalize import _accent_fold, _normalize_apostrophes, get_aliases
+
+MAGIC = b'VNAI'
+FORMAT_VERSION = 4
+ROOT_FILENAME = 'root.bin'
+
+_ROOT = 0
+_SHARD = 1
+
+_FILE_HEADER = struct.Struct('<4sHH32sI')
+_SEGMENT_HEADER = struct.Struct('<IIII')
+_PROVINCE = struct.Struct('<III')   # name, first district, first ward
+_DISTRICT = struct.Struct('<III')   # name, first ward (local), ward count
+_WARD = struct.Struct('<IIII')      # name, district (local), new ward, new province
+_REVERSE = struct.Struct('<IIII')   # new ward, new province, old ward, end of the key's rows
+_SLOT = struct.Struct('<IIII')      # hash, scope, key, value
+_SPAN = struct.Struct('<II')
+
+_EMPTY = 0xFFFFFFFF
+# Set on alias values that only a manual alias provides
+_MANUAL = 0x80000000
+_ID_MASK = _MANUAL - 1
+
+# Key scopes.  Exact names are kept apart from the lowercased aliases so that
+# the converter can try them first, like the ``name in mapping`` checks did.
+_ALIAS = 0
+_EXACT = 1
+_WARD_SCOPE = 2
+# Root only: folded new ward name -> first row of its reverse entries
+_REVERSE_SCOPE = 2
+_NEW_WARD_PREFIX = re.compile(r'^(?:phuong|xa|thi tran|dac khu) ')
+_NEW_WARD_PREFIX_ACCENTED = re.compile(r'^(?:phường|xã|thị trấn|đặc khu) ')
+
+
+def _scope(kind: int, parent: int = 0) -> int:
+    return parent * 4 + kind
+
+
+def reverse_key(new_ward: str) -> str:
+    """Return the accent- and prefix-insensitive key new ward names are looked up by."""
+    folded = ' '.join(_accent_fold(_normalize_apostrophes(new_ward)).replace('đ', 'd').split())
+    return _NEW_WARD_PREFIX.sub('', folded)
+
+
+def source_digest(*paths: str) -> bytes:
+    """Return the SHA-256 digest of the given source files (missing files are skipped)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            continue
+    return digest.digest()
+
+
+class _SegmentBuilder:
+    """Collects the strings, records and keys of one segment."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.tables: tuple[list, list] = ([], [])
+        # Later insertions win, matching the overwrite order of the alias dicts
+        self.keys: dict[tuple[int, str], int] = {}
+
+    def string(self, value: str) -> int:
+        return self.strings.setdefault(value, len(self.strings))
+
+    def add_key(self, scope: int, key: str, value: int, manual: bool = False) -> None:
+        if manual:
+            if self.keys.get((scope, key)) == value:
+                # Also a generated alias of the same entity
+                return
+            value |= _MANUAL
+        self.keys[(scope, key)] = value
+
+    def to_bytes(self, record_structs: tuple[struct.Struct, struct.Struct]) -> bytes:
+        n_slots = 8
+        while n_slots < 2 * len(self.keys):
+            n_slots *= 2
+        mask = n_slots - 1
+
+        slots = [None] * n_slots
+        for (scope, key), value in self.keys.items():
+            key_id = self.string(key)
+            h = zlib.crc32(key.encode('utf-8'), scope)
+            i = h & mask
+            while slots[i] is not None:
+                i = (i + 1) & mask
+            slots[i] = (h, scope, key_id, value)
+
+        encoded = [s.encode('utf-8') for s in self.strings]
+        spans = []
+        offset = 0
+        for data in encoded:
+            spans.append((offset, offset + len(data)))
+            offset += len(data)
+
+        parts = [_SEGMENT_HEADER.pack(len(self.tables[0]), len(self.tables[1]), n_slots, len(encoded))]
+        for record_struct, rows in zip(record_structs, self.tables):
+            parts.extend(record_struct.pack(*row) for row in rows)
+        parts.extend(_SLOT.pack(*(slot or (0, 0, _EMPTY, 0))) for slot in slots)
+        parts.extend(_SPAN.pack(*span) for span in spans)
+        parts.extend(encoded)
+        return b''.join(parts)
+
+
+def _pack_file(kind: int, digest: bytes, number: int, segment: bytes) -> bytes:
+    header = _FILE_HEADER.pack(MAGIC, FORMAT_VERSION, kind, digest.ljust(32, b'\0')[:32], number)
+    return header + segment
+
+
+def shard_filename(province_id: int) -> str:
+    return f'{province_id:02d}.bin'
+
+
+def compile_root(mapping: dict, manual_aliases: dict, digest: bytes = b'') -> bytes:
+    """Compile the root file: province names, aliases, id offsets and the reverse index.
+
+    Args:
+        mapping: Parsed ``ward_mapping.json`` (province -> district -> ward)
+        manual_aliases: Parsed ``manual_aliases.json``
+        digest: Digest of the source files, stored for staleness checks
+
+    Returns:
+        bytes: The compiled root, loadable with ``CompiledIndex``
+    """
+    root = _SegmentBuilder()
+    provinces, reverse = root.tables
+    first_district = first_ward = 0
+    old_wards: dict[str, list[tuple[str, str, int]]] = {}
+
+    for province_id, (prov_name, prov_val) in enumerate(mapping.items()):
+        provinces.append((root.string(prov_name), first_district, first_ward))
+        root.add_key(_scope(_EXACT), prov_name, province_id)
+        for alias in get_aliases(prov_name, AddressLevel.PROVINCE):
+            root.add_key(_scope(_ALIAS), alias, province_id)
+        for alias in manual_aliases['provinces'].get(prov_name, []):
+            root.add_key(_scope(_ALIAS), alias.lower(), province_id, manual=True)
+
+        ward_id = first_ward
+        for dist_val in prov_val.values():
+            for ward_val in dist_val.values():
+                new_ward, new_province = ward_val['new_ward_name'], ward_val['new_provine_name']
+                old_wards.setdefault(reverse_key(new_ward), []).append((new_ward, new_province, ward_id))
+                ward_id += 1
+
+        first_district += len(prov_val)
+        first_ward += sum(len(wards) for wards in prov_val.values())
+
+    # Sentinel row so that counts can be derived from the next row's offsets
+    provinces.append((root.string(''), first_district, first_ward))
+
+    for key, rows in old_wards.items():
+        root.add_key(_scope(_REVERSE_SCOPE), key, len(reverse))
+        end = len(reverse) + len(rows)
+        for new_ward, new_province, ward_id in sorted(rows, key=lambda row: (row[1], row[2])):
+            reverse.append((root.string(new_ward), root.string(new_province), ward_id, end))
+    return _pack_file(_ROOT, digest, len(mapping), root.to_bytes((_PROVINCE, _REVERSE)))
+
+
+def compile_shard(province_id: int, prov_name: str, prov_val: dict, manual_aliases: dict,
+                  digest: bytes = b'') -> bytes:
+    """Compile the shard holding the districts and wards of one province."""
+    segment = _SegmentBuilder()
+    districts, wards = segment.tables
+    manual_districts = manual_aliases['districts'].get(prov_name, {})
+    manual_wards = manual_aliases['wards'].get(prov_name, {})
+
+    for dist_name, dist_val in prov_val.items():
+        district_id = len(districts)
+        districts.append((segment.string(dist_name), len(wards), len(dist_val)))
+        segment.add_key(_scope(_EXACT), dist_name, district_id)
+        for alias in get_aliases(dist_name, AddressLevel.DISTRICT):
+            segment.add_key(_scope(_ALIAS), alias, district_id)
+        for alias in manual_districts.get(dist_name, []):
+            segment.add_key(_scope(_ALIAS), alias.lower(), district_id, manual=True)
+
+        ward_scope = _scope(_WARD_SCOPE + _ALIAS, district_id)
+        exact_scope = _scope(_WARD_SCOPE + _EXACT, district_id)
+        manual = manual_wards.get(dist_name, {})
+        for ward_name, ward_val in dist_val.items():
+            ward_id = len(wards)
+            wards.append((
+                segment.string(ward_name),
+                district_id,
+                segment.string(ward_val['new_ward_name']),
+                segment.string(ward_val['new_provine_name']),
+            ))
+            segment.add_key(exact_scope, ward_name, ward_id)
+            for alias in get_aliases(ward_name, AddressLevel.WARD):
+                segment.add_key(ward_scope, alias, ward_id)
+            for alias in manual.get(ward_name, []):
+                segment.add_key(ward_scope, alias.lower(), ward_id, manual=True)
+
+    return _pack_file(_SHARD, digest, province_id, segment.to_bytes((_DISTRICT, _WARD)))
+
+
+def _write_file(path: str, data: bytes) -> None:
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_index(mapping_path: str, manual_aliases_path: str, output_dir: str) -> None:
+    """Compile the given source files and write the sharded index to ``output_dir``."""
+    with open(mapping_path, encoding='utf-8') as f:
+        mapping = json.load(f)
+    try:
+        with open(manual_aliases_path, encoding='utf-8') as f:
+            manual_aliases = json.load(f)
+    except FileNotFoundError:
+        manual_aliases = {"provinces": {}, "districts": {}, "wards": {}}
+
+    write_index(mapping, manual_aliases, source_digest(mapping_path, manual_aliases_path), output_dir)
+
+
+def write_index(mapping: dict, manual_aliases: dict, digest: bytes, output_dir: str) -> None:
+    """Compile a mapping and its manual aliases and write the sharded index to ``output_dir``."""
+    os.makedirs(output_dir, exist_ok=True)
+    for province_id, (prov_name, prov_val) in enumerate(mapping.items()):
+        data = compile_shard(province_id, prov_name, prov_val, manual_aliases, digest)
+        _write_file(os.path.join(output_dir, shard_filename(province_id)), data)
+    # The root goes last so that a complete root always has its shards next to it
+    _write_file(os.path.join(output_dir, ROOT_FILENAME), compile_root(mapping, manual_aliases, digest))
+
+
+def _read_header(buf, kind: int) -> tuple[bytes, int]:
+    if len(buf) < _FILE_HEADER.size:
+        raise ValueError('Buffer is too small to be a compiled index')
+    magic, version, file_kind, digest, number = _FILE_HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a compiled address index')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported index format version: {version}')
+    if file_kind != kind:
+        raise ValueError('Unexpected index file kind')
+    return digest, number
+
+
+def _map_file(path: str) -> mmap.mmap:
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Segment:
+    """Read-only view over one segment of a compiled index buffer."""
+
+    __slots__ = ('buf', 'counts', 'record_structs', 'tables', 'slots', 'mask', 'spans', 'data', 'names')
+
+    def __init__(self, buf, offset: int, record_structs: tuple[struct.Struct, struct.Struct]):
+        n_a, n_b, n_slots, n_strings = _SEGMENT_HEADER.unpack_from(buf, offset)
+        self.buf = buf
+        self.counts = (n_a, n_b)
+        self.record_structs = record_structs
+        self.tables = (offset + _SEGMENT_HEADER.size, offset + _SEGMENT_HEADER.size + n_a * record_structs[0].size)
+        self.slots = self.tables[1] + n_b * record_structs[1].size
+        self.mask = n_slots - 1
+        self.spans = self.slots + n_slots * _SLOT.size
+        self.data = self.spans + n_strings * _SPAN.size
+        # Decoded names, interned so that every result shares one string object
+        self.names: dict[int, str] = {}
+
+    def record(self, table: int, i: int) -> tuple:
+        record_struct = self.record_structs[table]
+        return record_struct.unpack_from(self.buf, self.tables[table] + i * record_struct.size)
+
+    def string_bytes(self, string_id: int) -> bytes:
+        start, end = _SPAN.unpack_from(self.buf, self.spans + string_id * _SPAN.size)
+        return self.buf[self.data + start:self.data + end]
+
+    def string(self, string_id: int) -> str:
+        name = self.names.get(string_id)
+        if name is None:
+            name = self.names[string_id] = sys.intern(str(self.string_bytes(string_id), 'utf-8'))
+        return name
+
+    def find(self, scope: int, key: str) -> Optional[int]:
+        data = key.encode('utf-8', 'surrogatepass')
+        h = zlib.crc32(data, scope)
+        i = h & self.mask
+        buf = self.buf
+        while True:
+            slot_hash, slot_scope, key_id, value = _SLOT.unpack_from(buf, self.slots + i * _SLOT.size)
+            if key_id == _EMPTY:
+                return None
+            if slot_hash == h and slot_scope == scope and self.string_bytes(key_id) == data:
+                return value
+            i = (i + 1) & self.mask
+
+
+class CompiledIndex:
+    """Query interface over a compiled root and its lazily loaded province shards.
+
+    Provinces, districts and wards are identified by dense integer ids;
+    district and ward ids are global across provinces.
+
+    Args:
+        root: Buffer holding the compiled root
+        load_shard: Callable returning the buffer of a province shard, called
+            at most once per province the first time it is needed
+    """
+
+    def __init__(self, root, load_shard: Callable[[int], object]):
+        self.digest, n_provinces = _read_header(root, _ROOT)
+        self._root_buf = root
+        self._load_shard = load_shard
+        self._shard_bufs: list = [None] * n_provinces
+        self._shards: list[Optional[_Segment]] = [None] * n_provinces
+        self._shard_lock = threading.Lock()
+        self._root = _Segment(root, _FILE_HEADER.size, (_PROVINCE, _REVERSE))
+
+        rows = [self._root.record(0, i) for i in range(self._root.counts[0])]
+        self._first_districts = array('I', [row[1] for row in rows])
+        self._first_wards = array('I', [row[2] for row in rows])
+
+    @classmethod
+    def open(cls, directory: str) -> 'CompiledIndex':
+        """Memory-map a compiled index directory; shards are mapped on first use."""
+        root = _map_file(os.path.join(directory, ROOT_FILENAME))
+        try:
+            digest, _ = _read_header(root, _ROOT)
+        except ValueError:
+            root.close()
+            raise
+
+        def load_shard(province_id: int) -> mmap.mmap:
+            buf = _map_file(os.path.join(directory, shard_filename(province_id)))
+            if _read_header(buf, _SHARD) != (digest, province_id):
+                buf.close()
+                raise ValueError(f'Index shard {province_id} does not match the root')
+            return buf
+
+        return cls(root, load_shard)
+
+    @classmethod
+    def from_mapping(cls, mapping: dict, manual_aliases: dict, digest: bytes = b'') -> 'CompiledIndex':
+        """Compile an index in memory; each province is compiled on first use.
+
+        The source tree of a province is released as soon as its shard is built.
+        """
+        pending = list(mapping.items())
+
+        def load_shard(province_id: int) -> bytes:
+            prov_name, prov_val = pending[province_id]
+            pending[province_id] = None
+            return compile_shard(province_id, prov_name, prov_val, manual_aliases, digest)
+
+        return cls(compile_root(mapping, manual_aliases, digest), load_shard)
+
+    def close(self) -> None:
+        for buf in [self._root_buf, *self._shard_bufs]:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    @property
+    def num_provinces(self) -> int:
+        return len(self._first_districts) - 1
+
+    @property
+    def num_districts(self) -> int:
+        return self._first_districts[-1]
+
+    @property
+    def num_wards(self) -> int:
+        return self._first_wards[-1]
+
+    def memory_usage(self) -> dict[str, int]:
+        """Report the memory held by the index, in bytes.
+
+        ``index_bytes`` is the size of the root and the shards loaded so far.
+        When they are memory-mapped (``mapped`` is 1) those pages belong to the
+        page cache and are shared by every process on the host, so only
+        ``heap_bytes`` is private to this process.
+        """
+        segments = [segment for segment in self._shards if segment is not None]
+        segments.append(self._root)
+        buffers = [buf for buf in self._shard_bufs if buf is not None]
+        buffers.append(self._root_buf)
+        # Interned names are shared between segments, count each object once
+        names = {id(name): name for segment in segments for name in segment.names.values()}
+        mapped = isinstance(self._root_buf, mmap.mmap)
+
+        heap_bytes = sum(sys.getsizeof(obj) for obj in (
+            self, self._shard_bufs, self._shards, self._first_districts, self._first_wards,
+        ))
+        heap_bytes += sum(sys.getsizeof(segment) + sys.getsizeof(segment.names) for segment in segments)
+        heap_bytes += sum(sys.getsizeof(name) for name in names.values())
+        if not mapped:
+            heap_bytes += sum(len(buf) for buf in buffers)
+
+        return {
+            'index_bytes': sum(len(buf) for buf in buffers),
+            'mapped': int(mapped),
+            'provinces_loaded': len(segments) - 1,
+            'names_decoded': len(names),
+            'heap_bytes': heap_bytes,
+        }
+
+    def preload(self, province_ids: Optional[list[int]] = None) -> None:
+        """Load the shards of the given provinces (all by default) instead of on first use."""
+        if province_ids is None:
+            province_ids = range(self.num_provinces)
+        for province_id in province_ids:
+            self._segment(province_id)
+
+    def _segment(self, province_id: int) -> _Segment:
+        segment = self._shards[province_id]
+        if segment is None:
+            with self._shard_lock:
+                segment = self._shards[province_id]
+                if segment is None:
+                    buf = self._shard_bufs[province_id] = self._load_shard(province_id)
+                    segment = self._shards[province_id] = _Segment(buf, _FILE_HEADER.size, (_DISTRICT, _WARD))
+        return segment
+
+    def _locate_district(self, district_id: int) -> tuple[int, int]:
+        province_id = bisect.bisect_right(self._first_districts, district_id) - 1
+        return province_id, district_id - self._first_districts[province_id]
+
+    def _locate_ward(self, ward_id: int) -> tuple[int, int]:
+        province_id = bisect.bisect_right(self._first_wards, ward_id) - 1
+        return province_id, ward_id - self._first_wards[province_id]
+
+    def _find_value(self, level: AddressLevel, key: str, parent: int, kind: int) -> Optional[int]:
+        """Return the global id stored for ``key``, with its manual flag."""
+        if level == AddressLevel.PROVINCE:
+            return self._root.find(_scope(kind), key)
+        if level == AddressLevel.DISTRICT:
+            value = self._segment(parent).find(_scope(kind), key)
+            first = self._first_districts[parent]
+        else:
+            province_id, local_district = self._locate_district(parent)
+            value = self._segment(province_id).find(_scope(_WARD_SCOPE + kind, local_district), key)
+            first = self._first_wards[province_id]
+        return None if value is None else (value & _MANUAL) | (first + (value & _ID_MASK))
+
+    def find(self, level: AddressLevel, key: str, parent: int = 0, exact: bool = False) -> Optional[int]:
+        """Return the id of the entity at ``level`` whose alias (or exact name) is ``key``.
+
+        ``parent`` is the province id for districts and the district id for wards.
+        """
+        value = self._find_value(level, key, parent, _EXACT if exact else _ALIAS)
+        return None if value is None else value & _ID_MASK
+
+    def find_alias(self, level: AddressLevel, key: str, parent: int = 0) -> Optional[tuple[int, bool]]:
+        """Like ``find`` for aliases, but return ``(id, manual)``.
+
+        ``manual`` is True when ``key`` is only an alias of the entity because
+        ``manual_aliases.json`` lists it.
+        """
+        value = self._find_value(level, key, parent, _ALIAS)
+        return None if value is None else (value & _ID_MASK, bool(value & _MANUAL))
+
+    def province_name(self, province_id: int) -> str:
+        return self._root.string(self._root.record(0, province_id)[0])
+
+    def district_name(self, district_id: int) -> str:
+        province_id, local_id = self._locate_district(district_id)
+        segment = self._segment(province_id)
+        return segment.string(segment.record(0, local_id)[0])
+
+    def ward_name(self, ward_id: int) -> str:
+        province_id, local_id = self._locate_ward(ward_id)
+        segment = self._segment(province_id)
+        return segment.string(segment.record(1, local_id)[0])
+
+    def ward_target(self, ward_id: int) -> tuple[str, str]:
+        """Return the ``(new_ward, new_province)`` names an old ward maps to."""
+        province_id, local_id = self._locate_ward(ward_id)
+        segment = self._segment(province_id)
+        _, _, new_ward, new_province = segment.record(1, local_id)
+        return segment.string(new_ward), segment.string(new_province)
+
+    def old_wards(self, new_ward: str) -> list[tuple[str, str, int]]:
+        """Return ``(new_ward, new_province, old_ward_id)`` for every old ward merged into a new
+        ward of this name (in any new province).
+
+        Names match without accents. A name without its "Phường"/"Xã" prefix
+        matches either; a name with one prefers the new wards with that prefix.
+        Likewise, new wards whose name has the same accents are preferred, so
+        "Tân Thạnh" does not also return "Tân Thành".
+        """
+        key = reverse_key(new_ward)
+        first = self._root.find(_scope(_REVERSE_SCOPE), key)
+        if first is None:
+            return []
+        end = self._root.record(1, first)[3]
+        result = []
+        for i in range(first, end):
+            ward, province, ward_id, _ = self._root.record(1, i)
+            result.append((self._root.string(ward), self._root.string(province), ward_id))
+
+        folded = ' '.join(_accent_fold(_normalize_apostrophes(new_ward)).replace('đ', 'd').split())
+        if folded != key:
+            same_prefix = [row for row in result if _accent_fold(row[0]).replace('đ', 'd') == folded]
+            result = same_prefix or result
+
+        exact = ' '.join(unicodedata.normalize('NFC', _normalize_apostrophes(new_ward)).lower().split())
+        same_name = []
+        for row in result:
+            name = ' '.join(unicodedata.normalize('NFC', row[0]).lower().split())
+            if exact in (name, _NEW_WARD_PREFIX_ACCENTED.sub('', name)):
+                same_name.append(row)
+        return same_name or result
+
+    def district_province(self, district_id: int) -> int:
+        return self._locate_district(district_id)[0]
+
+    def ward_district(self, ward_id: int) -> int:
+        province_id, local_id = self._locate_ward(ward_id)
+        local_district = self._segment(province_id).record(1, local_id)[1]
+        return self._first_districts[province_id] + local_district
+
+    def districts(self, province_id: int) -> range:
+        """Return the range of district ids belonging to a province."""
+        return range(self._first_districts[province_id], self._first_districts[province_id + 1])
+
+    def wards(self, district_id: int) -> range:
+        """Return the range of ward ids belonging to a district."""
+        province_id, local_id = self._locate_district(district_id)
+        _, first_ward, n_wards = self._segment(province_id).record(0, local_id)
+        start = self._first_wards[province_id] + first_ward
+        return range(start, start + n_wards)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Compile the packaged mapping into ``data/ward_index/`` (or the given directory)."""
+    from . import converter
+
+    argv = sys.argv[1:] if argv is None else argv
+    output_dir = argv[0] if argv else converter.WARD_INDEX_PATH
+    build_index(converter.WARD_MAPPING_PATH, converter.MANUAL_ALIASES_PATH, output_dir)
+    print(f'Wrote {output_dir}')
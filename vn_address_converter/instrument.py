@@ -0,0 +1,186 @@
+"""Opt-in per-stage latency instrumentation of parsing and conversion.
+
+``set_stage_hook(hook)`` calls ``hook(stage, seconds)`` after every stage of
+``parse_address``, ``convert_to_new_address`` and ``parse_and_convert``
+(and of the batch, streaming and server paths built on them). Stages nest:
+
+- ``parse``: splitting an address string into components (cache misses only)
+- ``parse.classify``: detecting the type of one component
+- ``convert``: resolving one (province, district, ward), including the convert cache
+- ``convert.normalize``: the normalized and accent-folded forms of one name
+- ``convert.lookup.province`` / ``.district`` / ``.ward``: one index lookup
+
+The stage functions are wrapped only while a hook is installed, so there is
+no overhead at all when instrumentation is off. ``StageHistogram`` is a
+ready-made hook that keeps a latency histogram per stage.
+"""
+
+import bisect
+import contextlib
+import functools
+import threading
+import time
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from . import converter, parser
+from .models import AddressLevel
+
+StageHook = Callable[[str, float], None]
+
+# Upper bounds of the histogram buckets, in seconds
+STAGE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 0.1)
+
+_LOOKUP_STAGES = {level: f'convert.lookup.{level.name.lower()}' for level in AddressLevel}
+
+_lock = threading.Lock()
+_hook: Optional[StageHook] = None
+# (module, function name) -> uninstrumented function
+_originals: dict[tuple, Callable] = {}
+
+# Functions wrapped while a hook is installed, with their stage; lookups are
+# named after their level.  parse_and_convert calls the parser through converter.
+_STAGES = (
+    (parser, '_parse_components', 'parse'),
+    (converter, '_parse_components', 'parse'),
+    (parser, '_component_kind', 'parse.classify'),
+    (converter, '_convert_key', 'convert'),
+    (converter, '_lookup_forms', 'convert.normalize'),
+    (converter, '_find_tier', None),
+)
+
+
+def _report(stage: str, seconds: float) -> None:
+    hook = _hook
+    # The hook may have been removed while the stage was running
+    if hook is not None:
+        hook(stage, seconds)
+
+
+def _timed(stage: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _report(stage, time.perf_counter() - started)
+    return wrapper
+
+
+def _timed_lookup(func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(index, level, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(index, level, *args, **kwargs)
+        finally:
+            _report(_LOOKUP_STAGES[level], time.perf_counter() - started)
+    return wrapper
+
+
+def set_stage_hook(hook: Optional[StageHook]) -> None:
+    """Install ``hook(stage, seconds)`` to receive stage timings, or None to turn them off.
+
+    Only one hook is installed at a time; use a ``StageHistogram`` or your own
+    callable that fans out. The hook is called on the thread doing the work
+    and must be thread-safe.
+    """
+    global _hook
+    with _lock:
+        if hook is None:
+            for (module, name), func in _originals.items():
+                setattr(module, name, func)
+            _originals.clear()
+        elif not _originals:
+            for module, name, stage in _STAGES:
+                func = _originals[(module, name)] = getattr(module, name)
+                setattr(module, name, _timed(stage, func) if stage else _timed_lookup(func))
+        _hook = hook
+
+
+def get_stage_hook() -> Optional[StageHook]:
+    """Return the installed stage hook, or None."""
+    return _hook
+
+
+@contextlib.contextmanager
+def stage_hook(hook: StageHook) -> Iterator[StageHook]:
+    """Install ``hook`` for the duration of a ``with`` block, then restore the previous one."""
+    previous = get_stage_hook()
+    set_stage_hook(hook)
+    try:
+        yield hook
+    finally:
+        set_stage_hook(previous)
+
+
+class StageStats(NamedTuple):
+    """Latency histogram of one stage."""
+    count: int
+    seconds: float                       # Total time spent in the stage
+    buckets: tuple[int, ...]             # Calls per bucket of STAGE_BUCKETS, then above the last bound
+
+    @property
+    def mean(self) -> float:
+        return self.seconds / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (inf past the last bound)."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(STAGE_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return float('inf')
+
+
+class StageHistogram:
+    """Stage hook that aggregates timings into a fixed-bucket histogram per stage.
+
+    Pass an instance to ``set_stage_hook``; read it with ``snapshot()`` or
+    export it with ``render()`` in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[str, list[int]] = {}
+        self._seconds: dict[str, float] = {}
+
+    def __call__(self, stage: str, seconds: float) -> None:
+        bucket = bisect.bisect_left(STAGE_BUCKETS, seconds)
+        with self._lock:
+            counts = self._counts.get(stage)
+            if counts is None:
+                counts = self._counts[stage] = [0] * (len(STAGE_BUCKETS) + 1)
+                self._seconds[stage] = 0.0
+            counts[bucket] += 1
+            self._seconds[stage] += seconds
+
+    def snapshot(self) -> dict[str, StageStats]:
+        """Return the histogram of every stage seen so far."""
+        with self._lock:
+            return {
+                stage: StageStats(sum(counts), self._seconds[stage], tuple(counts))
+                for stage, counts in sorted(self._counts.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._seconds.clear()
+
+    def render(self, name: str = 'vn_address_stage_duration_seconds') -> str:
+        """Return the histograms in the Prometheus text exposition format."""
+        lines = [
+            f'# HELP {name} Time spent in each stage of parsing and conversion.',
+            f'# TYPE {name} histogram',
+        ]
+        for stage, stats in self.snapshot().items():
+            total = 0
+            for bound, count in zip(STAGE_BUCKETS + ('+Inf',), stats.buckets):
+                total += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {total}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats.seconds}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats.count}')
+        return '\n'.join(lines) + '\n'
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 from enum import Enum
 
@@ -10,6 +10,26 @@ class AddressLevel(Enum):
     STREET = 'street'
 
 
+class ConversionStatus(Enum):
+    """Outcome of converting one address."""
+    OK = 'ok'                                   # Converted to the new format
+    UNCHANGED = 'unchanged'                     # No district, returned as is
+    MISSING_COMPONENT = 'missing_component'     # Province or ward missing
+    PROVINCE_NOT_FOUND = 'province_not_found'
+    DISTRICT_NOT_FOUND = 'district_not_found'
+    WARD_NOT_FOUND = 'ward_not_found'
+    PARSE_ERROR = 'parse_error'                 # Address string could not be parsed
+
+
+class MatchTier(Enum):
+    """How a component name was found in the mapping."""
+    EXACT = 'exact'                             # The name exactly as in the mapping
+    NORMALIZED = 'normalized'                   # Its normalized alias (no prefix, lowercase)
+    FOLDED = 'folded'                           # Its normalized alias without accents
+    MANUAL = 'manual'                           # An alias from manual_aliases.json
+    MISS = 'miss'                               # Not found
+
+
 class MappingMissingError(Exception):
     """Exception raised when address mapping is missing for a given level and value."""
     
@@ -50,4 +70,129 @@ class Address:
         if self.province:
             components.append(self.province)
         
-        return ', '.join(components)
\ No newline at end of file
+        return ', '.join(components)
+
+    def freeze(self) -> 'FrozenAddress':
+        """Return an immutable, hashable copy of this address."""
+        return FrozenAddress(self.street_address, self.ward, self.district, self.province)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenAddress:
+    """Immutable, slotted and hashable variant of ``Address``.
+
+    It has no per-instance ``__dict__`` and can be used in sets and as a dict
+    key. ``convert_to_new_address`` returns a ``FrozenAddress`` when given one,
+    and its new ward and province strings are shared with the index.
+    """
+    street_address: Optional[str] = None
+    ward: Optional[str] = None
+    district: Optional[str] = None
+    province: Optional[str] = None
+
+    format = Address.format
+
+    def thaw(self) -> Address:
+        """Return a mutable ``Address`` copy of this address."""
+        return Address(self.street_address, self.ward, self.district, self.province)
+
+
+@dataclass
+class BatchResult:
+    """Column-oriented result of a batch conversion, one entry per input row.
+
+    Rows that could not be converted have ``None`` in the ward, district and
+    province columns; ``status`` tells why.
+    """
+    street_address: list[Optional[str]] = field(default_factory=list)
+    ward: list[Optional[str]] = field(default_factory=list)
+    district: list[Optional[str]] = field(default_factory=list)
+    province: list[Optional[str]] = field(default_factory=list)
+    status: list[ConversionStatus] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def address(self, i: int, frozen: bool = False) -> Optional[Address | FrozenAddress]:
+        """Return the converted address of row ``i``, or None if it failed.
+
+        Args:
+            i: Row number
+            frozen: Return a ``FrozenAddress`` instead of an ``Address``
+        """
+        if self.status[i] not in (ConversionStatus.OK, ConversionStatus.UNCHANGED):
+            return None
+        cls = FrozenAddress if frozen else Address
+        return cls(self.street_address[i], self.ward[i], self.district[i], self.province[i])
+
+    def addresses(self, frozen: bool = False) -> list[Optional[Address | FrozenAddress]]:
+        """Return the converted addresses row by row (None for failed rows)."""
+        return [self.address(i, frozen) for i in range(len(self))]
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of parsing and converting one address string."""
+    input: str
+    parsed: Optional[Address]            # None if the string could not be parsed
+    address: Optional[Address]           # None if the conversion failed
+    status: ConversionStatus
+    # Tier that matched each level looked up, when requested
+    tiers: Optional[dict[AddressLevel, MatchTier]] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (ConversionStatus.OK, ConversionStatus.UNCHANGED)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable dict with the formatted new address and its components."""
+        result = {
+            'input': self.input,
+            'status': self.status.value,
+            'address': self.address.format() if self.address else None,
+            'components': asdict(self.address) if self.address else None,
+            'parsed': asdict(self.parsed) if self.parsed else None,
+        }
+        if self.tiers is not None:
+            result['tiers'] = {level.value: tier.value for level, tier in self.tiers.items()}
+        return result
+
+
+@dataclass
+class Suggestion:
+    """An old address close to one that failed to convert, with its conversion."""
+    address: Address                     # Old address spelled as in the mapping
+    new_address: Address                 # Its conversion to the new format
+    score: float                         # Similarity in [0, 1]; 1 when every component matched
+
+
+@dataclass
+class Mention:
+    """An administrative unit name found in free text."""
+    start: int                           # Offset of the first character in the text
+    end: int                             # Offset past the last character
+    level: AddressLevel
+    text: str                            # The matched text as written
+    names: tuple[str, ...]               # Old names in the mapping it may refer to
+
+
+@dataclass
+class ExtractedAddress:
+    """An old address found in free text and its conversion."""
+    start: int
+    end: int
+    ward: Mention
+    district: Mention
+    province: Optional[Mention]          # None when the district alone identified it
+    address: Address                     # The old address, spelled as in the mapping
+    new_address: Address
+
+
+@dataclass
+class Completion:
+    """A name completing a typed prefix."""
+    name: str
+    level: AddressLevel
+    new: bool                            # True for a name of the new administrative format
+    province: Optional[str] = None       # Province the district or ward belongs to
+    district: Optional[str] = None       # District an old ward belongs to
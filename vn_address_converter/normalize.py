@@ -0,0 +1,97 @@
+"""Name normalization helpers shared by the converter and the index compiler."""
+
+import re
+import unicodedata
+
+from .models import AddressLevel
+
+_APOSTROPHE_CHARS = '\u2019\u2018\u02bc\u0060\u00b4\uff07'
+_APOSTROPHES = re.compile('[%s]' % _APOSTROPHE_CHARS)
+
+
+def _normalize_apostrophes(name: str) -> str:
+    return _APOSTROPHES.sub("'", name)
+
+
+# The Combining Diacritical Marks block holds every Vietnamese accent and tone
+# mark once decomposed; any other nonspacing mark is removed one by one
+_COMBINING_MARKS = re.compile('[\u0300-\u036f]+')
+_NOT_ASCII_OR_COMBINING = re.compile('[^\x00-\x7f\u0300-\u036f]')
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _drop_nonspacing_mark(m: re.Match) -> str:
+    c = m.group()
+    return '' if unicodedata.category(c) == 'Mn' else c
+
+
+def _accent_fold(s: str) -> str:
+    nfd = unicodedata.normalize("NFD", s)
+    if _NOT_ASCII_OR_COMBINING.search(nfd) is None:
+        # Only ASCII letters and marks: dropping the non-ASCII characters drops the marks
+        return nfd.encode('ascii', 'ignore').decode('ascii').lower()
+    folded = _COMBINING_MARKS.sub('', nfd)
+    if not folded.isascii():
+        folded = _NON_ASCII.sub(_drop_nonspacing_mark, folded)
+    return folded.lower()
+
+
+_PREFIX_PATTERNS = {
+    level: re.compile(r"^(%s)\s*" % "|".join(re.escape(w) for w in words), re.IGNORECASE)
+    for level, words in (
+        (AddressLevel.PROVINCE, ['thành phố', 'tỉnh']),
+        (AddressLevel.DISTRICT, ['thành phố', 'quận', 'huyện']),
+        (AddressLevel.WARD, ['phường', 'xã']),
+    )
+}
+
+
+def normalize_alias(name: str, level: 'AddressLevel') -> str:
+    name = unicodedata.normalize("NFC", name)
+    name = _normalize_apostrophes(name)
+    pattern = _PREFIX_PATTERNS.get(level)
+    if pattern is not None:
+        name = pattern.sub('', name, count=1)
+    name = name.strip()
+
+    # Handle leading zeros for numeric wards (e.g., "01" -> "1")
+    if level == AddressLevel.WARD and name.isdigit() and len(name) > 1 and name.startswith('0'):
+        name = str(int(name))
+
+    return name.lower()
+
+def get_aliases(name: str, level: 'AddressLevel') -> list[str]:
+    """Return list of aliases for given input name and level.
+
+    Args:
+        name: The name to generate aliases for
+        level: The administrative level (province, district, ward)
+
+    Returns:
+        List of aliases including normalized alias, lowercased original name, and accent folded version
+    """
+    aliases = []
+
+    # Add normalized alias (if not empty)
+    normalized = normalize_alias(name, level)
+    if normalized:
+        aliases.append(normalized)
+
+    # Add lowercased original name
+    aliases.append(name.lower())
+
+    # Add accent folded version (after NFC normalization)
+    nfc_normalized = unicodedata.normalize("NFC", name.lower())
+    accent_folded = unicodedata.normalize("NFD", nfc_normalized)
+    accent_folded = ''.join(c for c in accent_folded if unicodedata.category(c) != 'Mn')
+    accent_folded = accent_folded.lower()
+    if accent_folded and accent_folded not in aliases:
+        aliases.append(accent_folded)
+
+    # Add accent-folded version of normalized alias (without prefix)
+    if normalized:
+        normalized_folded = _accent_fold(normalized)
+        if normalized_folded and normalized_folded not in aliases:
+            aliases.append(normalized_folded)
+
+    return aliases
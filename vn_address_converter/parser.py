@@ -1,9 +1,14 @@
 """Address parsing functionality for Vietnamese addresses."""
 
+import itertools
 import re
 import unicodedata
+from .cache import PARSE_CACHE
 from .models import Address, AddressLevel
 
+# Component separators in order of preference
+_SEPARATORS = (',', ';', '|', '-')
+
 # Province-level cities (trực thuộc Trung ương).
 # These 6 cities are the only ones whose "Thành phố" prefix means PROVINCE
 # rather than a district-level city (thành phố thuộc tỉnh).
@@ -19,24 +24,44 @@ _PROVINCE_LEVEL_CITIES = {
 }
 
 
+# Prefixes stripped before the province-level city check, tried in this order;
+# the last alternative handles concatenated forms like tphcm, tphn, tpcantho
+_CITY_PREFIX = re.compile(r'thành phố |tỉnh |tp |tp\. |tp\.|thanh pho |tp(?=[\s\S])')
+
+
 def _is_province_level_city(part_lower: str) -> bool:
     """Check whether a 'Thành phố' / 'TP' component is a province-level city."""
-    cleaned = part_lower
-    for prefix in ('thành phố ', 'tỉnh ', 'tp ', 'tp. ', 'tp.', 'thanh pho '):
-        if cleaned.startswith(prefix):
-            cleaned = cleaned[len(prefix):].strip()
-            break
-    else:
-        # Handle concatenated forms like tphcm, tphn, tpcantho
-        if cleaned.startswith('tp') and len(cleaned) > 2:
-            cleaned = cleaned[2:].strip()
+    m = _CITY_PREFIX.match(part_lower)
+    cleaned = part_lower[m.end():].strip() if m else part_lower
 
-    # Accent-fold
+    # Accent-fold; ASCII strings have nothing to fold
+    if cleaned.isascii():
+        return cleaned in _PROVINCE_LEVEL_CITIES
     nfd = unicodedata.normalize('NFD', cleaned)
     folded = ''.join(c for c in nfd if unicodedata.category(c) != 'Mn')
     return folded in _PROVINCE_LEVEL_CITIES
 
 
+_VIETNAMESE_VOWELS = frozenset(
+    'aeiouy'
+    'àáảãạâầấẩẫậăằắẳẵặ'
+    'èéẻẽẹêềếểễệ'
+    'ìíỉĩị'
+    'òóỏõọôồốổỗộơờớởỡợ'
+    'ùúủũụưừứửữự'
+    'ỳýỷỹỵ'
+)
+# Ward abbreviations embedded at the end of a street component
+_STREET_WARD_NUMBER = re.compile(r'\s+P\.(\d{1,3})\s*$')
+_STREET_WARD_NAME = re.compile(r'\s+P\.([A-ZÀ-Ỹa-zà-ỹ0-9\s\-]{1,40})\s*$')
+_STREET_COMMUNE = re.compile(r'\s+(Xã)\s+([A-ZÀ-Ỹa-zà-ỹ0-9\s\-]{1,40})\s*$', re.IGNORECASE)
+_STREET_TOWNSHIP = re.compile(r'\s+(Thị trấn)\s+([A-ZÀ-Ỹa-zà-ỹ0-9\s\-]{1,40})\s*$', re.IGNORECASE)
+
+
+def _has_vietnamese(text: str) -> bool:
+    return any(ch.lower() in _VIETNAMESE_VOWELS for ch in text)
+
+
 def _extract_ward_from_street(street_address: str) -> tuple[str | None, str | None]:
     """Try to extract a ward name from the end of a street address string.
 
@@ -52,21 +77,8 @@ def _extract_ward_from_street(street_address: str) -> tuple[str | None, str | No
     if not street_address:
         return street_address, None
 
-    _VIETNAMESE_VOWELS = (
-        'aeiouy'
-        'àáảãạâầấẩẫậăằắẳẵặ'
-        'èéẻẽẹêềếểễệ'
-        'ìíỉĩị'
-        'òóỏõọôồốổỗộơờớởỡợ'
-        'ùúủũụưừứửữự'
-        'ỳýỷỹỵ'
-    )
-
-    def _has_vietnamese(text: str) -> bool:
-        return any(ch.lower() in _VIETNAMESE_VOWELS for ch in text)
-
     # Pattern 1: P.06, P.13, P.02  →  Phường {number} (strip leading zeros)
-    m = re.search(r'\s+P\.(\d{1,3})\s*$', street_address)
+    m = _STREET_WARD_NUMBER.search(street_address)
     if m:
         ward_num = str(int(m.group(1)))
         new_street = street_address[: m.start()].strip()
@@ -74,47 +86,74 @@ def _extract_ward_from_street(street_address: str) -> tuple[str | None, str | No
             return new_street, f'Phường {ward_num}'
 
     # Pattern 2: P.Linh Chiểu, P.Bình Trị Đông B, P.Tân Định  →  Phường {name}
-    m = re.search(
-        r'\s+P\.([A-ZÀ-Ỹa-zà-ỹ0-9\s\-]{1,40})\s*$',
-        street_address,
-    )
+    m = _STREET_WARD_NAME.search(street_address)
     if m:
         ward_name = m.group(1).strip()
         # Sanity check: must look like a Vietnamese place name
-        if ward_name and _has_vietnamese(ward_name) and len(ward_name) >= 1:
+        if ward_name and _has_vietnamese(ward_name):
             new_street = street_address[: m.start()].strip()
             if new_street:
                 return new_street, f'Phường {ward_name}'
 
     # Pattern 3: Xã Vĩnh Lộc A  →  Xã {name}
-    m = re.search(
-        r'\s+(Xã)\s+([A-ZÀ-Ỹa-zà-ỹ0-9\s\-]{1,40})\s*$',
-        street_address,
-        re.IGNORECASE,
-    )
-    if m:
-        ward_name = m.group(2).strip()
-        if ward_name and _has_vietnamese(ward_name) and len(ward_name) >= 1:
-            new_street = street_address[: m.start()].strip()
-            if new_street:
-                return new_street, m.group(1) + ' ' + ward_name
-
     # Pattern 4: Thị trấn something  →  Thị trấn {name}
-    m = re.search(
-        r'\s+(Thị trấn)\s+([A-ZÀ-Ỹa-zà-ỹ0-9\s\-]{1,40})\s*$',
-        street_address,
-        re.IGNORECASE,
-    )
-    if m:
-        ward_name = m.group(2).strip()
-        if ward_name and _has_vietnamese(ward_name) and len(ward_name) >= 1:
-            new_street = street_address[: m.start()].strip()
-            if new_street:
-                return new_street, m.group(1) + ' ' + ward_name
+    for pattern in (_STREET_COMMUNE, _STREET_TOWNSHIP):
+        m = pattern.search(street_address)
+        if m:
+            ward_name = m.group(2).strip()
+            if ward_name and _has_vietnamese(ward_name):
+                new_street = street_address[: m.start()].strip()
+                if new_street:
+                    return new_street, m.group(1) + ' ' + ward_name
 
     return street_address, None
 
 
+# Keyword classifier, one group per outcome in priority order: ward keywords,
+# province keywords, "thành phố" / "TP" (province- or district-level city)
+# and district keywords.  Keywords only need to start the lowercased part.
+_COMPONENT_KEYWORDS = re.compile(
+    r'(phường|phuong|xã|xa|thị trấn|thi tran)'
+    r'|(tỉnh|tinh)'
+    r'|(thành phố|thanh pho|tp(?=[\s\S]))'
+    r'|(quận|quan|huyện|huyen|tp|thị xã|thi xa)'
+)
+_CITY_GROUP = 3
+
+# Component kinds used internally; plain ints hash and compare faster than enum members
+_STREET, _WARD, _DISTRICT, _PROVINCE = range(4)
+_KIND_LEVELS = (AddressLevel.STREET, AddressLevel.WARD, AddressLevel.DISTRICT, AddressLevel.PROVINCE)
+_GROUP_KINDS = (_STREET, _WARD, _PROVINCE, None, _DISTRICT)
+
+# Kind of each component seen so far; the same province and district names recur
+# across addresses, so most lookups hit.  Cleared when full to bound memory.
+_KIND_MEMO: dict[str, int] = {}
+_KIND_MEMO_SIZE = 65536
+
+
+def _component_kind(part: str) -> int:
+    kind = _KIND_MEMO.get(part)
+    if kind is not None:
+        return kind
+
+    part_lower = part.lower().strip()
+    m = _COMPONENT_KEYWORDS.match(part_lower)
+    if m is None:
+        # If no keyword matches, assume it's a street address
+        kind = _STREET
+    elif m.lastindex == _CITY_GROUP:
+        # For "thành phố" / "TP" — distinguish province-level cities from district-level
+        # by checking against a known list (HCM, Hà Nội, Đà Nẵng, Hải Phòng, Cần Thơ, Huế).
+        kind = _PROVINCE if _is_province_level_city(part_lower) else _DISTRICT
+    else:
+        kind = _GROUP_KINDS[m.lastindex]
+
+    if len(_KIND_MEMO) >= _KIND_MEMO_SIZE:
+        _KIND_MEMO.clear()
+    _KIND_MEMO[part] = kind
+    return kind
+
+
 def _detect_component_type(part: str) -> AddressLevel:
     """Detect the type of address component based on keywords.
     
@@ -124,42 +163,56 @@ def _detect_component_type(part: str) -> AddressLevel:
     Returns:
         AddressLevel: Component type - WARD, DISTRICT, PROVINCE, or STREET
     """
-    part_lower = part.lower().strip()
-    
-    # Ward keywords
-    ward_keywords = ['phường', 'phuong', 'xã', 'xa', 'thị trấn', 'thi tran']
-    for keyword in ward_keywords:
-        if part_lower.startswith(keyword):
-            return AddressLevel.WARD
-    
-    # Province keywords (check first to prioritize over district keywords)
-    province_keywords = ['tỉnh', 'tinh']
-    for keyword in province_keywords:
-        if part_lower.startswith(keyword):
-            return AddressLevel.PROVINCE
-    
-    # For "thành phố" / "TP" — distinguish province-level cities from district-level
-    # by checking against a known list (HCM, Hà Nội, Đà Nẵng, Hải Phòng, Cần Thơ, Huế).
-    if part_lower.startswith('thành phố') or part_lower.startswith('thanh pho') \
-        or part_lower.startswith('tp ') or part_lower.startswith('tp.') \
-        or (part_lower.startswith('tp') and len(part_lower) > 2):
-        if _is_province_level_city(part_lower):
-            return AddressLevel.PROVINCE
-        else:
-            return AddressLevel.DISTRICT
-    
-    # District keywords
-    district_keywords = ['quận', 'quan', 'huyện', 'huyen', 'tp', 'thị xã', 'thi xa']
-    for keyword in district_keywords:
-        if part_lower.startswith(keyword):
-            return AddressLevel.DISTRICT
-    
-    # If no keyword matches, assume it's a street address
-    return AddressLevel.STREET
+    return _KIND_LEVELS[_component_kind(part)]
+
+
+def _three_part_plan(types: tuple) -> tuple:
+    """Return which of three parts is ``(street_address, ward, district, province)``.
+
+    Each entry is a part index or None.  The heuristics only depend on the
+    detected kinds, so the plan of every combination is computed once below.
+    """
+    def first(level):
+        return types.index(level)
+
+    def other(*levels):
+        # The remaining part
+        return next((i for i, t in enumerate(types) if t not in levels), None)
+
+    street, ward, district, province = _STREET, _WARD, _DISTRICT, _PROVINCE
+    if ward in types and district in types and province in types:
+        # All three components detected: ward, district, province
+        return None, first(ward), first(district), first(province)
+    if street in types and district in types and province in types:
+        # street, district, province (missing ward)
+        return first(street), None, first(district), first(province)
+    if street in types and ward in types and province in types:
+        # street, ward, province (missing district)
+        return first(street), first(ward), None, first(province)
+    if street in types and ward in types and district in types:
+        # street, ward, district (missing province)
+        return first(street), first(ward), first(district), None
+    if ward in types and district in types:
+        # ward, district, unknown (assume unknown is province)
+        return None, first(ward), first(district), other(ward, district)
+    if ward in types and province in types:
+        # ward, province, unknown (assume unknown is street)
+        return other(ward, province), first(ward), None, first(province)
+    if district in types and province in types:
+        # district, province, unknown (assume unknown is street)
+        return other(district, province), None, first(district), first(province)
+    # Default: assume ward, district, province format
+    return None, 0, 1, 2
+
+
+_THREE_PART_PLANS = {types: _three_part_plan(types) for types in itertools.product(range(4), repeat=3)}
 
 
 def parse_address(address_string: str) -> Address:
     """Parse an address string into components.
+
+    Results are kept in a bounded LRU cache keyed by the raw string (see
+    ``configure_cache``); every call still returns a new ``Address``.
     
     Args:
         address_string: Address string separated by comma, semicolon, pipe, or hyphen in formats:
@@ -173,6 +226,21 @@ def parse_address(address_string: str) -> Address:
     Raises:
         ValueError: If address string format is invalid
     """
+    cached = PARSE_CACHE.get(address_string)
+    if cached is None:
+        cached = _parse_components(address_string)
+        PARSE_CACHE.put(address_string, cached)
+    street_address, ward, district, province = cached
+    return Address(
+        street_address=street_address,
+        ward=ward,
+        district=district,
+        province=province
+    )
+
+
+def _parse_components(address_string: str) -> tuple:
+    """Split an address string into ``(street_address, ward, district, province)``."""
     if not address_string or not address_string.strip():
         raise ValueError("Address string cannot be empty")
 
@@ -181,101 +249,41 @@ def parse_address(address_string: str) -> Address:
     address_string = unicodedata.normalize("NFC", address_string)
 
     # Normalize newlines to commas so copy-pasted multi-line addresses parse correctly
-    address_string = address_string.replace('\r\n', ', ').replace('\r', ', ').replace('\n', ', ')
+    if '\n' in address_string or '\r' in address_string:
+        address_string = address_string.replace('\r\n', ', ').replace('\r', ', ').replace('\n', ', ')
 
     # Try different separators in order of preference
-    separators = [',', ';', '|', '-']
-    parts = None
-    has_empty_slot = False
-    
-    for separator in separators:
+    for separator in _SEPARATORS:
         if separator in address_string:
             raw_parts = [part.strip() for part in address_string.split(separator)]
-            has_empty_slot = any(p == '' for p in raw_parts)
-            parts = [p for p in raw_parts if p]
+            has_empty_slot = '' in raw_parts
+            parts = [p for p in raw_parts if p] if has_empty_slot else raw_parts
             break
-    
-    if parts is None:
+    else:
         # No separator found, treat as single component
         parts = [address_string.strip()]
         has_empty_slot = False
 
+    if not parts:
+        # Nothing but separators
+        raise ValueError("Address must have at least district and province")
+
     if parts[-1] in ("Việt Nam", "Vienam"):
         # Remove "Việt Nam" if it's the last part
         parts = parts[:-1]
-    
-    if len(parts) < 2:
+
+    street_address = ward = district = province = None
+    n_parts = len(parts)
+    if n_parts < 2:
         raise ValueError("Address must have at least district and province")
-    elif len(parts) == 2:
+    elif n_parts == 2:
         # Format: "district, province" (e.g., "Quận 10, TP Hồ Chí Minh")
         district, province = parts
-        ward = None
-        street_address = None
-    elif len(parts) == 3:
+    elif n_parts == 3:
         # Use heuristics to determine which components are present
-        types = [_detect_component_type(part) for part in parts]
-        
-        # Initialize all variables
-        street_address = None
-        ward = None
-        district = None
-        province = None
-        
-        # Apply heuristics based on detected types
-        # Handle all possible combinations explicitly
-        if AddressLevel.WARD in types and AddressLevel.DISTRICT in types and AddressLevel.PROVINCE in types:
-            # All three components detected: ward, district, province
-            ward = parts[types.index(AddressLevel.WARD)]
-            district = parts[types.index(AddressLevel.DISTRICT)]
-            province = parts[types.index(AddressLevel.PROVINCE)]
-        elif AddressLevel.STREET in types and AddressLevel.DISTRICT in types and AddressLevel.PROVINCE in types:
-            # street, district, province (missing ward)
-            street_address = parts[types.index(AddressLevel.STREET)]
-            district = parts[types.index(AddressLevel.DISTRICT)]
-            province = parts[types.index(AddressLevel.PROVINCE)]
-        elif AddressLevel.STREET in types and AddressLevel.WARD in types and AddressLevel.PROVINCE in types:
-            # street, ward, province (missing district)
-            street_address = parts[types.index(AddressLevel.STREET)]
-            ward = parts[types.index(AddressLevel.WARD)]
-            province = parts[types.index(AddressLevel.PROVINCE)]
-        elif AddressLevel.STREET in types and AddressLevel.WARD in types and AddressLevel.DISTRICT in types:
-            # street, ward, district (missing province)
-            street_address = parts[types.index(AddressLevel.STREET)]
-            ward = parts[types.index(AddressLevel.WARD)]
-            district = parts[types.index(AddressLevel.DISTRICT)]
-        elif AddressLevel.WARD in types and AddressLevel.DISTRICT in types:
-            # ward, district, unknown (assume unknown is province)
-            ward = parts[types.index(AddressLevel.WARD)]
-            district = parts[types.index(AddressLevel.DISTRICT)]
-            # Find the remaining part
-            for i, part in enumerate(parts):
-                if types[i] not in [AddressLevel.WARD, AddressLevel.DISTRICT]:
-                    province = part
-                    break
-        elif AddressLevel.WARD in types and AddressLevel.PROVINCE in types:
-            # ward, province, unknown (assume unknown is street)
-            ward = parts[types.index(AddressLevel.WARD)]
-            province = parts[types.index(AddressLevel.PROVINCE)]
-            # Find the remaining part
-            for i, part in enumerate(parts):
-                if types[i] not in [AddressLevel.WARD, AddressLevel.PROVINCE]:
-                    street_address = part
-                    break
-        elif AddressLevel.DISTRICT in types and AddressLevel.PROVINCE in types:
-            # district, province, unknown (assume unknown is street)
-            district = parts[types.index(AddressLevel.DISTRICT)]
-            province = parts[types.index(AddressLevel.PROVINCE)]
-            # Find the remaining part
-            for i, part in enumerate(parts):
-                if types[i] not in [AddressLevel.DISTRICT, AddressLevel.PROVINCE]:
-                    street_address = part
-                    break
-        else:
-            # Default: assume ward, district, province format
-            ward = parts[0]
-            district = parts[1]
-            province = parts[2]
-    elif len(parts) == 4:
+        plan = _THREE_PART_PLANS[_component_kind(parts[0]), _component_kind(parts[1]), _component_kind(parts[2])]
+        street_address, ward, district, province = (None if i is None else parts[i] for i in plan)
+    elif n_parts == 4:
         # Format: "street_address, ward, district, province"
         street_address, ward, district, province = parts
     else:
@@ -284,7 +292,7 @@ def parse_address(address_string: str) -> Address:
         # Combine the rest as street_address
         ward, district, province = parts[-3:]
         street_address = ", ".join(parts[:-3])
-    
+
     # If ward is missing and the original address had an empty structural slot
     # (e.g. "street, , district, province"), try to recover a ward abbreviation
     # that was embedded in the street component, such as P.06 or P.Linh Chiểu.
@@ -294,9 +302,9 @@ def parse_address(address_string: str) -> Address:
             street_address = extracted_street
             ward = extracted_ward
 
-    return Address(
-        street_address=street_address if street_address else None,
-        ward=ward if ward else None,
-        district=district if district else None,
-        province=province if province else None
-    )
\ No newline at end of file
+    return (
+        street_address if street_address else None,
+        ward if ward else None,
+        district if district else None,
+        province if province else None,
+    )
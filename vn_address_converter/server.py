@@ -0,0 +1,365 @@
+"""HTTP conversion server built on the standard library.
+
+``python -m vn_address_converter serve`` loads the index once, binds the
+listening socket and forks worker processes that accept on it, so every worker
+starts warm and shares the memory-mapped index pages. Endpoints:
+
+- ``GET /convert?address=...`` or ``POST /convert`` with a JSON string (or
+  ``{"address": "..."}``): one result object
+- ``POST /convert/batch`` with a JSON array of strings: an array of results
+- ``GET /metrics``: request counts, latency histograms and cache hit rates in
+  the Prometheus text format, aggregated over all workers
+"""
+
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .cache import cache_info
+from .converter import _parse_and_convert_chunk, parse_and_convert, prepare_for_fork, warmup
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_SIZE = 10000
+# A worker that exits within FAST_FAILURE_SECONDS of starting is restarted after
+# a delay that doubles from RESTART_DELAY up to MAX_RESTART_DELAY; after
+# MAX_FAST_FAILURES such exits in a row the server gives up
+FAST_FAILURE_SECONDS = 1.0
+RESTART_DELAY = 0.1
+MAX_RESTART_DELAY = 5.0
+MAX_FAST_FAILURES = 5
+
+_ENDPOINTS = ('convert', 'batch', 'metrics', 'other')
+_ROUTES = {'/convert': 'convert', '/convert/batch': 'batch', '/metrics': 'metrics'}
+_METHODS = {'convert': ('GET', 'POST'), 'batch': ('POST',), 'metrics': ('GET',)}
+_CODE_CLASSES = ('2xx', '4xx', '5xx')
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_CACHE_FIELDS = ('parse_hits', 'parse_misses', 'convert_hits', 'convert_misses')
+
+
+class Metrics:
+    """Request metrics kept in shared memory so that forked workers aggregate into one view.
+
+    Create it before forking. Cache statistics are per process, so each worker
+    publishes its own into a separate slot.
+    """
+
+    def __init__(self, workers: int = 1):
+        n_endpoints = len(_ENDPOINTS)
+        self._lock = multiprocessing.Lock()
+        self._requests = multiprocessing.RawArray('Q', n_endpoints * len(_CODE_CLASSES))
+        self._buckets = multiprocessing.RawArray('Q', n_endpoints * (len(LATENCY_BUCKETS) + 1))
+        self._seconds = multiprocessing.RawArray('d', n_endpoints)
+        self._addresses = multiprocessing.RawArray('Q', 1)
+        self._cache = multiprocessing.RawArray('Q', workers * len(_CACHE_FIELDS))
+        self.workers = workers
+
+    def observe(self, endpoint: str, code: int, seconds: float, addresses: int = 0, slot: int = 0) -> None:
+        e = _ENDPOINTS.index(endpoint)
+        c = 0 if code < 400 else 1 if code < 500 else 2
+        b = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        info = cache_info()
+        cache = (info['parse'].hits, info['parse'].misses, info['convert'].hits, info['convert'].misses)
+        with self._lock:
+            self._requests[e * len(_CODE_CLASSES) + c] += 1
+            self._buckets[e * (len(LATENCY_BUCKETS) + 1) + b] += 1
+            self._seconds[e] += seconds
+            self._addresses[0] += addresses
+            self._cache[slot * len(_CACHE_FIELDS):(slot + 1) * len(_CACHE_FIELDS)] = cache
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            requests = list(self._requests)
+            buckets = list(self._buckets)
+            seconds = list(self._seconds)
+            addresses = self._addresses[0]
+            cache = list(self._cache)
+
+        lines = [
+            '# HELP vn_address_requests_total HTTP requests by endpoint and status class.',
+            '# TYPE vn_address_requests_total counter',
+        ]
+        for e, endpoint in enumerate(_ENDPOINTS):
+            for c, code in enumerate(_CODE_CLASSES):
+                lines.append(f'vn_address_requests_total{{endpoint="{endpoint}",code="{code}"}} '
+                             f'{requests[e * len(_CODE_CLASSES) + c]}')
+
+        lines += [
+            '# HELP vn_address_request_duration_seconds Time spent handling HTTP requests.',
+            '# TYPE vn_address_request_duration_seconds histogram',
+        ]
+        for e, endpoint in enumerate(_ENDPOINTS):
+            row = buckets[e * (len(LATENCY_BUCKETS) + 1):(e + 1) * (len(LATENCY_BUCKETS) + 1)]
+            total = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), row):
+                total += count
+                lines.append(f'vn_address_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {total}')
+            lines.append(f'vn_address_request_duration_seconds_sum{{endpoint="{endpoint}"}} {seconds[e]}')
+            lines.append(f'vn_address_request_duration_seconds_count{{endpoint="{endpoint}"}} {total}')
+
+        lines += [
+            '# HELP vn_address_addresses_total Addresses parsed and converted.',
+            '# TYPE vn_address_addresses_total counter',
+            f'vn_address_addresses_total {addresses}',
+        ]
+
+        totals = [sum(cache[i::len(_CACHE_FIELDS)]) for i in range(len(_CACHE_FIELDS))]
+        lines += ['# HELP vn_address_cache_hits_total Cache hits summed over workers.',
+                  '# TYPE vn_address_cache_hits_total counter']
+        lines += [f'vn_address_cache_hits_total{{cache="{name}"}} {totals[i * 2]}'
+                  for i, name in enumerate(('parse', 'convert'))]
+        lines += ['# HELP vn_address_cache_misses_total Cache misses summed over workers.',
+                  '# TYPE vn_address_cache_misses_total counter']
+        lines += [f'vn_address_cache_misses_total{{cache="{name}"}} {totals[i * 2 + 1]}'
+                  for i, name in enumerate(('parse', 'convert'))]
+        lines += ['# HELP vn_address_cache_hit_ratio Cache hit rate summed over workers.',
+                  '# TYPE vn_address_cache_hit_ratio gauge']
+        for i, name in enumerate(('parse', 'convert')):
+            hits, misses = totals[i * 2], totals[i * 2 + 1]
+            lines.append(f'vn_address_cache_hit_ratio{{cache="{name}"}} {hits / (hits + misses) if hits + misses else 0.0}')
+
+        lines += ['# HELP vn_address_workers Worker processes.', '# TYPE vn_address_workers gauge',
+                  f'vn_address_workers {self.workers}']
+        return '\n'.join(lines) + '\n'
+
+
+class _HTTPError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'vn-address-converter'
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+    def _read_json(self) -> Any:
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.close_connection = True
+            raise _HTTPError(411, 'Content-Length required')
+        if length < 0:
+            # read(-1) would wait for the client to close the connection
+            self.close_connection = True
+            raise _HTTPError(400, 'Invalid Content-Length')
+        if length > MAX_BODY_BYTES:
+            # The unread body would be taken for the next request
+            self.close_connection = True
+            raise _HTTPError(413, 'Request body too large')
+        self._body_read = True
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise _HTTPError(400, 'Request body is not valid JSON')
+
+    def _convert(self, method: str, query: str) -> tuple[Any, int]:
+        if method == 'GET':
+            values = parse_qs(query).get('address')
+            if not values:
+                raise _HTTPError(400, 'Missing address parameter')
+            address = values[0]
+        else:
+            address = self._read_json()
+            if isinstance(address, dict):
+                address = address.get('address')
+        if not isinstance(address, str):
+            raise _HTTPError(400, 'Expected an address string')
+        return parse_and_convert(address).to_dict(), 1
+
+    def _batch(self) -> tuple[Any, int]:
+        addresses = self._read_json()
+        if not isinstance(addresses, list) or not all(isinstance(a, str) for a in addresses):
+            raise _HTTPError(400, 'Expected a JSON array of address strings')
+        if len(addresses) > MAX_BATCH_SIZE:
+            raise _HTTPError(413, f'At most {MAX_BATCH_SIZE} addresses per batch')
+        return [result.to_dict() for result in _parse_and_convert_chunk(addresses)], len(addresses)
+
+    def _dispatch(self, method: str) -> None:
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        endpoint = _ROUTES.get(url.path, 'other')
+        addresses = 0
+        content_type = 'application/json; charset=utf-8'
+        self._body_read = False
+        try:
+            if endpoint == 'other':
+                raise _HTTPError(404, 'Not found')
+            if method not in _METHODS[endpoint]:
+                raise _HTTPError(405, 'Method not allowed')
+            if endpoint == 'metrics':
+                code = 200
+                body = self.server.metrics.render().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            else:
+                payload, addresses = self._convert(method, url.query) if endpoint == 'convert' else self._batch()
+                code = 200
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        except _HTTPError as e:
+            code = e.code
+            body = json.dumps({'error': str(e)}).encode('utf-8')
+        except Exception as e:
+            code = 500
+            body = json.dumps({'error': f'{type(e).__name__}: {e}'}).encode('utf-8')
+            self.close_connection = True
+        if not self._body_read and (self.headers.get('Content-Length', '0') != '0'
+                                    or 'Transfer-Encoding' in self.headers):
+            # A body that was never read would be taken for the next request
+            self.close_connection = True
+
+        # Recorded before responding, so a client sees its own request in /metrics
+        self.server.metrics.observe(endpoint, code, time.perf_counter() - started, addresses, self.server.slot)
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, sock: socket.socket, metrics: Metrics, slot: int = 0, access_log: bool = False):
+        super().__init__(sock.getsockname()[:2], _Handler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        self.metrics = metrics
+        self.slot = slot
+        self.access_log = access_log
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8000, access_log: bool = False) -> ThreadingHTTPServer:
+    """Create a single-process server bound to ``host:port``; call ``serve_forever()`` on it."""
+    warmup()
+    sock = socket.create_server((host, port))
+    return _Server(sock, Metrics(1), access_log=access_log)
+
+
+def _run_worker(sock: socket.socket, metrics: Metrics, slot: int, access_log: bool) -> None:
+    server = _Server(sock, metrics, slot, access_log)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def serve(host: str = '127.0.0.1', port: int = 8000, workers: Optional[int] = None,
+          access_log: bool = False) -> None:
+    """Run the conversion server until SIGTERM or SIGINT.
+
+    The index is loaded (see ``prepare_for_fork``) and the socket is bound
+    before forking, so workers start warm, share the index pages and accept
+    from the same socket. Workers that die are restarted, with a growing delay
+    when they die right after starting. Without ``os.fork`` (or with
+    ``workers=1``) the server runs in this process.
+
+    Args:
+        host: Address to bind
+        port: Port to bind (0 picks a free port)
+        workers: Number of worker processes (defaults to the number of CPUs)
+        access_log: Log every request to stderr
+
+    Raises:
+        RuntimeError: If a worker exits right after starting
+            ``MAX_FAST_FAILURES`` times in a row
+    """
+    workers = workers or os.cpu_count() or 1
+    forking = workers > 1 and hasattr(os, 'fork')
+    if forking:
+        prepare_for_fork()
+    else:
+        warmup()
+    metrics = Metrics(workers)
+    sock = socket.create_server((host, port), backlog=1024)
+    sys.stderr.write(f'Listening on http://{host}:{sock.getsockname()[1]} with {workers} worker(s)\n')
+    sys.stderr.flush()
+
+    if not forking:
+        try:
+            _run_worker(sock, metrics, 0, access_log)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    children: dict[int, int] = {}
+    started: dict[int, float] = {}
+    fast_failures = [0] * workers
+    stopping = False
+    failed = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            code = 0
+            try:
+                _run_worker(sock, metrics, slot, access_log)
+            except KeyboardInterrupt:
+                pass
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = slot
+        started[slot] = time.monotonic()
+
+    def stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for slot in range(workers):
+        spawn(slot)
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        if time.monotonic() - started[slot] >= FAST_FAILURE_SECONDS:
+            fast_failures[slot] = 0
+        else:
+            fast_failures[slot] += 1
+            if fast_failures[slot] >= MAX_FAST_FAILURES:
+                sys.stderr.write(f'Worker {slot} exited at startup {MAX_FAST_FAILURES} times in a row; stopping\n')
+                failed = True
+                stop(signal.SIGTERM, None)
+                continue
+            # A worker that dies at startup would otherwise be forked in a tight loop
+            time.sleep(min(RESTART_DELAY * 2 ** (fast_failures[slot] - 1), MAX_RESTART_DELAY))
+            if stopping:
+                continue
+        spawn(slot)
+    sock.close()
+    if failed:
+        raise RuntimeError('Workers exit right after starting')
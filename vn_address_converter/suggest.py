@@ -0,0 +1,156 @@
+"""Fuzzy suggestions for addresses whose components are not in the mapping.
+
+Candidates are ranked by the Dice coefficient of their character trigrams,
+computed over accent-folded names with the administrative prefix removed.
+A trigram index (trigram -> candidates) is built lazily for each scope that is
+searched: the provinces, the districts of one province or the wards of one
+district, so a query only touches the candidates sharing a trigram with it.
+"""
+
+import heapq
+import re
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from .converter import _find, _get_index
+from .index import CompiledIndex
+from .models import Address, AddressLevel, FrozenAddress, Suggestion
+from .normalize import _accent_fold, _normalize_apostrophes
+
+DEFAULT_MIN_SCORE = 0.3
+
+_PREFIXES = {
+    AddressLevel.PROVINCE: re.compile(r'^(?:thanh pho|tinh|tp\.?)(?:\s+|(?<=\.))'),
+    AddressLevel.DISTRICT: re.compile(r'^(?:thanh pho|thi xa|quan|huyen|tp\.?|q\.)(?:\s+|(?<=\.))'),
+    AddressLevel.WARD: re.compile(r'^(?:thi tran|phuong|xa|p\.)(?:\s+|(?<=\.))'),
+}
+_SPACES = re.compile(r'\s+')
+
+_INDEXES: dict[tuple[AddressLevel, int], '_TrigramIndex'] = {}
+_INDEXES_OWNER: Optional[CompiledIndex] = None
+_INDEXES_LOCK = threading.Lock()
+
+
+def _suggestion_key(name: str, level: AddressLevel) -> str:
+    key = _accent_fold(_normalize_apostrophes(name)).replace('đ', 'd')
+    key = _SPACES.sub(' ', key).strip()
+    return _PREFIXES[level].sub('', key).lstrip('0') or key
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrigramIndex:
+    """Inverted trigram index over the candidates of one scope."""
+
+    __slots__ = ('ids', 'sizes', 'postings')
+
+    def __init__(self, names: list[tuple[int, str]], level: AddressLevel):
+        self.ids: list[int] = []
+        self.sizes: list[int] = []
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for candidate_id, name in names:
+            grams = _trigrams(_suggestion_key(name, level))
+            position = len(self.ids)
+            self.ids.append(candidate_id)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(position)
+
+    def search(self, key: str, limit: int, min_score: float) -> list[tuple[int, float]]:
+        grams = _trigrams(key)
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                shared[position] += 1
+        scored = (
+            (2 * count / (len(grams) + self.sizes[position]), self.ids[position])
+            for position, count in shared.items()
+        )
+        best = heapq.nlargest(limit, (item for item in scored if item[0] >= min_score))
+        return [(candidate_id, score) for score, candidate_id in best]
+
+
+def _scope_index(index: CompiledIndex, level: AddressLevel, parent: int) -> _TrigramIndex:
+    global _INDEXES_OWNER
+    key = (level, parent)
+    with _INDEXES_LOCK:
+        if _INDEXES_OWNER is not index:
+            # The mapping was reloaded; ids may have changed
+            _INDEXES.clear()
+            _INDEXES_OWNER = index
+        trigram_index = _INDEXES.get(key)
+    if trigram_index is not None:
+        return trigram_index
+
+    if level == AddressLevel.PROVINCE:
+        names = [(i, index.province_name(i)) for i in range(index.num_provinces)]
+    elif level == AddressLevel.DISTRICT:
+        names = [(i, index.district_name(i)) for i in index.districts(parent)]
+    else:
+        names = [(i, index.ward_name(i)) for i in index.wards(parent)]
+    trigram_index = _TrigramIndex(names, level)
+    with _INDEXES_LOCK:
+        if _INDEXES_OWNER is index:
+            _INDEXES.setdefault(key, trigram_index)
+    return trigram_index
+
+
+def _candidates(index: CompiledIndex, level: AddressLevel, name: str, parent: int,
+                limit: int, min_score: float) -> list[tuple[int, float]]:
+    found = _find(index, level, name, parent)
+    if found is not None:
+        return [(found, 1.0)]
+    return _scope_index(index, level, parent).search(_suggestion_key(name, level), limit, min_score)
+
+
+def get_address_suggestions(address: Address | FrozenAddress, limit: int = 5,
+                            min_score: float = DEFAULT_MIN_SCORE) -> list[Suggestion]:
+    """Suggest old addresses close to one whose components are not in the mapping.
+
+    Each component that does not resolve is matched against the names in its
+    scope (the provinces, the districts of a candidate province, the wards of
+    a candidate district), and the score of a suggestion is the product of its
+    component scores. An address that converts as is gives one suggestion
+    with score 1.
+
+    Args:
+        address: Address in the old format
+        limit: Maximum number of suggestions (and of candidates per component)
+        min_score: Smallest trigram similarity a component candidate may have
+
+    Returns:
+        list[Suggestion]: Best suggestions first; empty when the address has no
+        province, district or ward, or nothing is similar enough
+    """
+    if not address.province or not address.district or not address.ward:
+        return []
+
+    index = _get_index()
+    suggestions = []
+    for province_id, province_score in _candidates(
+            index, AddressLevel.PROVINCE, address.province, 0, limit, min_score):
+        for district_id, district_score in _candidates(
+                index, AddressLevel.DISTRICT, address.district, province_id, limit, min_score):
+            for ward_id, ward_score in _candidates(
+                    index, AddressLevel.WARD, address.ward, district_id, limit, min_score):
+                suggestions.append((province_score * district_score * ward_score, ward_id))
+
+    result = []
+    for score, ward_id in heapq.nlargest(limit, suggestions):
+        district_id = index.ward_district(ward_id)
+        new_ward, new_province = index.ward_target(ward_id)
+        result.append(Suggestion(
+            address=Address(
+                address.street_address,
+                index.ward_name(ward_id),
+                index.district_name(district_id),
+                index.province_name(index.district_province(district_id)),
+            ),
+            new_address=Address(address.street_address, new_ward, None, new_province),
+            score=score,
+        ))
+    return result